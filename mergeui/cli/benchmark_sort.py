@@ -0,0 +1,61 @@
+import time
+import gqlalchemy as gq
+from loguru import logger
+from mergeui.core.dependencies import get_db_connection, get_model_repository, get_model_service
+from mergeui.core.db import execute_template
+from mergeui.core.schema import SortByOptionType, SORT_KEYS
+from mergeui.services import ModelService
+from mergeui.utils.types import get_literal_type_options
+
+
+def benchmark(limit: int, runs: int) -> dict[str, tuple[float, float, str]]:
+    """p50 and p95 latencies (ms) of the top-K list_models query of each sort option, with its scan operator."""
+    db_conn, model_repository, model_service = get_db_connection(), get_model_repository(), get_model_service()
+    results = {}
+    for sort_by in get_literal_type_options(SortByOptionType):
+        # first query of list_models (models without the sort key are only read if the top-K is not filled)
+        # noinspection PyProtectedMember
+        cypher, params = model_repository.get_list_models_query(**{
+            **ModelService._get_list_models_params(sort_by=sort_by, limit=limit), "sort_exclude_null_on_key": True})
+        with db_conn.acquire() as db:
+            plan = [row["QUERY PLAN"] for row in execute_template(db, f"EXPLAIN {cypher}", params)]
+        scan = next((operator.strip(" *") for operator in plan if "ScanAll" in operator), "?")
+        model_service.list_models(sort_by=sort_by, limit=limit)  # warm up
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            model_service.list_models(sort_by=sort_by, limit=limit)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        results[sort_by] = (timings[len(timings) // 2], timings[min(int(len(timings) * 0.95), len(timings) - 1)], scan)
+    return results
+
+
+def main(limit: int = 20, runs: int = 20, compare_without_indexes: bool = False):
+    """Benchmark the leaderboard views (top-K by each sort option), optionally against the same queries without the
+    sort key indexes (dropped then recreated, do not run on a serving database).
+    """
+    db_conn = get_db_connection()
+    indexed = benchmark(limit, runs)
+    not_indexed = {}
+    if compare_without_indexes:
+        indexes = [gq.MemgraphIndex(label, property=sort_key) for sort_key in SORT_KEYS
+                   for label in ("Model", "MergedModel")]
+        for index in indexes:
+            db_conn.db.drop_index(index)
+        try:
+            not_indexed = benchmark(limit, runs)
+        finally:
+            for index in indexes:
+                db_conn.db.create_index(index)
+    logger.info(f"Top {limit} models by sort option ({runs} runs, p50/p95 in ms):")
+    for sort_by, (p50, p95, scan) in indexed.items():
+        line = f"{sort_by:>18}: {p50:8.2f} / {p95:8.2f}  {scan}"
+        if sort_by in not_indexed:
+            p50_, p95_, scan_ = not_indexed[sort_by]
+            line += f"  | without index: {p50_:8.2f} / {p95_:8.2f}  {scan_}  (x{p50_ / p50:.1f})"
+        logger.info(line)
+
+
+if __name__ == '__main__':
+    main()
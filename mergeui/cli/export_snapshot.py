@@ -0,0 +1,18 @@
+import typing as t
+import datetime as dt
+from pathlib import Path
+from mergeui.core.dependencies import get_settings, get_db_connection
+from mergeui.utils.profiling import profilable
+
+
+@profilable("export_snapshot")
+def main(snapshot_path: t.Optional[str] = None):
+    settings = get_settings()
+    db_conn = get_db_connection()
+    snapshot_path = Path(snapshot_path) if snapshot_path else \
+        settings.project_dir / "media" / f"snapshot_{dt.datetime.utcnow().isoformat()}.snapshot"
+    db_conn.export_snapshot(snapshot_path)
+
+
+if __name__ == '__main__':
+    main()
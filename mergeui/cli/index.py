@@ -1,99 +1,200 @@
 import typing as t
+import collections
 import datetime as dt
 import json
-import os
 from loguru import logger
 import time
-import rq
-import huggingface_hub as hf
-from huggingface_hub import hf_api
 import gqlalchemy as gq
 from mergeui.core.dependencies import get_settings, get_db_connection, get_graph_repository
-from mergeui.utils import filter_none, custom_serializer, log_progress, format_duration
-from mergeui.utils.index.data_extraction import list_model_infos, hf_whoami
-from mergeui.utils.index.jobs import index_model_by_id, create_redis_connection
+from mergeui.repositories import GraphRepository
+from mergeui.utils import filter_none, custom_serializer, log_progress, format_duration, batched, is_valid_repo_id
+from mergeui.utils.index.data_extraction import iter_model_infos, hf_whoami, resolve_model_id, \
+    download_results_dataset
+from mergeui.utils.index.jobs import index_model_by_id, fetch_model_artifacts, extract_model_data, \
+    build_placeholder_node
+from mergeui.utils.index.retry import RetryPolicy, RetryTracker
+from mergeui.utils.index.executors import ExecutorType, create_index_executor
+from mergeui.utils.index.author_cache import get_author_listing_cache
+from mergeui.utils.profiling import profilable, MemoryTracker
+from mergeui.utils.logging import log_throttled
 
 
-def wait_for_jobs(jobs: list[rq.job.Job], q: rq.Queue, auto_reschedule: bool = True) -> None:
-    """Wait for all jobs to finish with re-scheduling failed jobs."""
-    while True:
-        # keep waiting if any job is keep running (not finished and not failed)
-        if any(not job.is_finished and not job.is_failed for job in jobs):
-            logger.debug(f"Waiting for {len(jobs)} jobs execution...")
-            time.sleep(min(5, max(len(jobs) // 10, 1)))  # sleep 1 second at least and 5 seconds at most
-            continue
-        if auto_reschedule:
-            # auto requeue failed jobs
-            failed_registry = q.failed_job_registry
-            failed_job_ids = failed_registry.get_job_ids()
-            for failed_job_id in failed_job_ids:
-                failed_job = q.fetch_job(failed_job_id)
-                logger.warning(f"Requeuing failed job {failed_job.id}...\n"
-                               f"{failed_job.func_name}(args={failed_job.args}, kwargs={failed_job.kwargs})\n"
-                               f"exc_string: {failed_job.latest_result().exc_string}")
-                failed_registry.requeue(failed_job.id)
-            # stop when all jobs are finished and no failed jobs requeued
-            if not failed_job_ids:
-                break
-        else:
-            break  # stop when all jobs are finished
+def finalize_worker_db_writes(
+        repository: GraphRepository,
+        nodes_map: dict[str, dict],
+        rels_count: int,
+        placeholders: list[dict],
+        merge_map: dict[str, str],
+        retry_tracker: RetryTracker,
+        dead_letters: dict[str, str],
+) -> dict:
+    """Final pass when workers write to the database: remaining local models then rename/merge pass."""
+    if placeholders:
+        repository.upsert_nodes(label="Model", nodes=placeholders)
+    merge_map = _resolve_merge_map(merge_map)
+    logger.debug(f"Merging {len(merge_map)} moved or duplicated models...")
+    for ind, (src_id, dst_id) in enumerate(merge_map.items()):
+        if src_id in nodes_map and nodes_map[src_id].get("new_id") == dst_id:
+            logger.warning(f"Model {src_id} has been moved to {dst_id}")
+        repository.merge_nodes(label="Model", src_id=src_id, dst_id=dst_id)
+        log_progress(ind, len(merge_map), step=5)
+    # logging
+    retry_tracker.report()
+    logger.success(f"=> {len(nodes_map)} models written by workers ({len(merge_map)} merged), "
+                   f"{rels_count} relationships ({len(dead_letters)} dead-lettered)")
+    # nodes and relationships are already in the database
+    return {
+        "directed": True,
+        "multigraph": True,
+        "nodes_count": 0,
+        "relationships_count": 0,
+        "nodes": [],
+        "relationships": [],
+        "dead_letters": dead_letters,
+    }
+
 
+def _extend_frontier(frontier: collections.deque[str], scheduled_ids: set[str], model_ids: list[str]) -> None:
+    """Add models to the frontier, each model ID is scheduled only once."""
+    for model_id in model_ids:
+        if model_id not in scheduled_ids:
+            scheduled_ids.add(model_id)
+            frontier.append(model_id)
 
-def index_models(limit: t.Optional[int], local_files_only: bool = False) -> dict:
+
+def _register_hub_id(known_ids: dict[str, str], merge_map: dict[str, str], hub_id: str) -> None:
+    """The ID of a model on the Hub replaces the known case variant of its ID, which is merged into it."""
+    known_id = known_ids.get(hub_id.casefold())
+    known_ids[hub_id.casefold()] = hub_id
+    if known_id is not None and known_id != hub_id:
+        merge_map[known_id] = hub_id
+
+
+def _resolve_merge_map(merge_map: dict[str, str]) -> dict[str, str]:
+    """Final ID of each merged model (a case variant can be merged into an ID merged later on)."""
+    resolved = {}
+    for src_id, dst_id in merge_map.items():
+        seen = {src_id}
+        while dst_id in merge_map and dst_id not in seen:
+            seen.add(dst_id)
+            dst_id = merge_map[dst_id]
+        if dst_id != src_id:
+            resolved[src_id] = dst_id
+    return resolved
+
+
+def index_models(
+        limit: t.Optional[int],
+        local_files_only: bool = False,
+        executor: t.Optional[ExecutorType] = None,
+        memory_tracker: t.Optional[MemoryTracker] = None,
+) -> dict:
     """Index All models from the HuggingFace Hub"""
     nodes_map, rels_list = {}, []
     settings = get_settings()
-    r = create_redis_connection(settings)
-    q = rq.Queue(connection=r)
+    memory_tracker = memory_tracker or MemoryTracker("index", enabled=False)
+    retry_tracker = RetryTracker(RetryPolicy.from_settings(settings))
+    dead_letters: dict[str, str] = {}  # model_id -> reason
+    # worker-side writes: the coordinator only keeps IDs for the frontier and the final rename/merge pass
+    write_to_db = settings.index_worker_db_writes
+    repository = get_graph_repository() if write_to_db else None
+    merge_map: dict[str, str] = {}  # src_id -> dst_id (moved models and case variants of base models)
+    placeholders: list[dict] = []  # local base models waiting to be written
+    rels_count = 0
     # logging whoami
     hf_whoami()
     # download dataset
-    logger.debug(f"Downloading dataset: HF_HUB_ENABLE_HF_TRANSFER={os.environ.get('HF_HUB_ENABLE_HF_TRANSFER')}"
-                 f" and local_files_only={local_files_only}...")
-    results_dataset_folder: str = hf.snapshot_download(
-        repo_id='open-llm-leaderboard/results',
-        repo_type='dataset',
-        allow_patterns="*.json",
-        local_files_only=local_files_only,
-    )
-    logger.debug(f"Dataset downloaded to: {results_dataset_folder}")
-    # list models from the hub
+    results_dataset_folder = download_results_dataset(local_files_only=local_files_only)
+    memory_tracker.checkpoint("indexing started")
+    # list models from the hub, jobs are scheduled page by page while listing
     model_info_list_params = dict(
         tags="merge", sort="createdAt", direction=-1,
         limit=limit,
         fetch_config=False, card_data=False, full=False
     )
-    model_info_list: list[hf_api.ModelInfo] = list_model_infos(**model_info_list_params)
-    model_ids: set[str] = set([mi.id for mi in model_info_list])
-    while model_ids:
-        logger.debug(f"Indexing {len(model_ids)} models...")
-        start_time = time.time()
-        # # schedule jobs
-        jobs = q.enqueue_many([
-            q.prepare_data(
-                index_model_by_id,
-                [model_id, results_dataset_folder],
-                timeout=60 * 2,  # 2 minutes
-                result_ttl=60 * 60 * 2,  # 2 hours
-                failure_ttl=60 * 60 * 2,  # 2 hours
-                job_id=f"index_model_by_id__{model_id.replace('/', '__')}"
-            ) for model_id in model_ids
-        ])
-        # wait for jobs
-        wait_for_jobs(jobs, q)
-        # get results
-        for job in jobs:
-            _got: tuple[dict, list] = job.return_value()
-            new_node, new_rels = _got
-            assert new_node.get("id") not in nodes_map, f"Model {new_node.get('id')} already indexed"
-            nodes_map[new_node.get("id")] = new_node
-            rels_list.extend(new_rels)
-        # logging
-        end_time = time.time()
-        logger.debug(f"Iteration completed in {format_duration(start_time, end_time)}")
-        # prepare next iteration
-        model_ids = set(rel["target"] for rel in rels_list) - set(nodes_map.keys())
-    # handling all renamed models
+    model_info_pages = batched(iter_model_infos(**model_info_list_params), settings.index_listing_page_size)
+    listing_done = False
+    # sliding window: at most max_in_flight tasks are queued or running, refilled from the frontier
+    index_executor = create_index_executor(settings, retry_tracker, executor)
+    max_in_flight = index_executor.get_max_in_flight()
+    logger.debug(f"Indexing models with at most {max_in_flight} tasks in flight...")
+    frontier: collections.deque[str] = collections.deque()
+    scheduled_ids: set[str] = set()  # listed or discovered model IDs (each one is scheduled once)
+    known_ids: dict[str, str] = {}  # casefold(model_id) -> model_id (the Hub ID once known, else the first ID seen)
+    memory_checkpoints_count = 0
+    with index_executor:
+        while True:
+            # refill the frontier from the hub listing when running low
+            while not listing_done and len(frontier) < max_in_flight:
+                model_info_page = next(model_info_pages, None)
+                if model_info_page is None:
+                    listing_done = True
+                    logger.debug(f"Listing completed: {len(scheduled_ids)} models found so far")
+                    break
+                for mi in model_info_page:
+                    _register_hub_id(known_ids, merge_map, mi.id)
+                _extend_frontier(frontier, scheduled_ids, [mi.id for mi in model_info_page])
+            # refill the window
+            in_flight_count = index_executor.in_flight_count
+            if frontier and in_flight_count < max_in_flight:
+                model_ids = [frontier.popleft() for _ in range(min(len(frontier), max_in_flight - in_flight_count))]
+                if settings.index_split_stages:
+                    index_executor.submit(fetch_model_artifacts, [[model_id] for model_id in model_ids], "fetch")
+                else:
+                    index_executor.submit(index_model_by_id, [[model_id, results_dataset_folder, write_to_db]
+                                                              for model_id in model_ids])
+            if not index_executor.in_flight_count:  # nothing left to list or to index
+                break
+            # get results
+            finished_tasks, dead_tasks = index_executor.poll()
+            for task in dead_tasks:
+                dead_letters[task.model_id] = retry_tracker.dead_letters[task.task_id]
+            for task in finished_tasks:
+                if task.stage == "fetch":  # fetch stage done => schedule parse stage
+                    index_executor.submit(extract_model_data, [
+                        [task.model_id, results_dataset_folder, task.value, write_to_db]
+                    ], "parse")
+                    continue
+                _got: tuple[dict, list] = task.value
+                new_node, new_rels = _got
+                assert new_node.get("id") not in nodes_map, f"Model {new_node.get('id')} already indexed"
+                nodes_map[new_node.get("id")] = new_node
+                canonical_id = new_node.get("new_id") or new_node.get("id")  # Hub ID
+                _register_hub_id(known_ids, merge_map, canonical_id)
+                if write_to_db and canonical_id != new_node.get("id"):
+                    merge_map[new_node.get("id")] = canonical_id
+                # discovered base models: normalized and validated before scheduling any job
+                for rel in new_rels:
+                    target = resolve_model_id(rel["target"], known_ids)
+                    if write_to_db and target != rel["target"]:  # already written by the worker
+                        merge_map[rel["target"]] = target
+                    rel["target"] = target
+                    if not is_valid_repo_id(rel["target"]) and rel["target"] not in scheduled_ids:
+                        scheduled_ids.add(rel["target"])
+                        nodes_map[rel["target"]] = build_placeholder_node(rel["target"])  # local model
+                        placeholders.append(nodes_map[rel["target"]])
+                if write_to_db:
+                    rels_count += len(new_rels)
+                    if len(placeholders) >= settings.index_db_write_batch_size:
+                        repository.upsert_nodes(label="Model", nodes=placeholders)
+                        placeholders = []
+                else:
+                    rels_list.extend(new_rels)
+                _extend_frontier(frontier, scheduled_ids, [rel["target"] for rel in new_rels])
+            if len(nodes_map) // settings.index_memory_checkpoint_every > memory_checkpoints_count:
+                memory_checkpoints_count += 1
+                memory_tracker.checkpoint(f"wave {memory_checkpoints_count}: {len(nodes_map)} models indexed")
+            if not finished_tasks:
+                log_throttled("DEBUG", "{} models indexed, {} tasks in flight ({} retries scheduled), "
+                              "{} models in frontier...", len(nodes_map), index_executor.in_flight_count,
+                              retry_tracker.pending, len(frontier))
+                index_executor.wait(1)
+    memory_tracker.checkpoint(f"indexing completed: {len(nodes_map)} models indexed")
+    if write_to_db:
+        return finalize_worker_db_writes(repository, nodes_map, rels_count, placeholders, merge_map,
+                                         retry_tracker, dead_letters)
+    # handling all renamed models (case variants of the base models resolved before their Hub ID was known included)
+    merged_ids = _resolve_merge_map(merge_map)
     rename_map = {}  # old_id -> new_id
     final_nodes_map = {}
     for node in nodes_map.values():
@@ -126,8 +227,8 @@ def index_models(limit: t.Optional[int], local_files_only: bool = False) -> dict
     existing_rels = set()
     final_rels_list = []
     for rel in rels_list:
-        source = rename_map.get(rel["source"], rel["source"])
-        target = rename_map.get(rel["target"], rel["target"])
+        source = rename_map.get(rel["source"], merged_ids.get(rel["source"], rel["source"]))
+        target = rename_map.get(rel["target"], merged_ids.get(rel["target"], rel["target"]))
         rel_unique_key = source, target, rel["method"], rel["origin"]
         if rel_unique_key in existing_rels:
             continue
@@ -137,8 +238,11 @@ def index_models(limit: t.Optional[int], local_files_only: bool = False) -> dict
             "target": target,
         }))
         existing_rels.add(rel_unique_key)
+    memory_tracker.checkpoint("moved models merged")
     # logging
-    logger.success(f"=> {len(final_nodes_map)} models ({len(rename_map)} moved), {len(final_rels_list)} relationships")
+    retry_tracker.report()
+    logger.success(f"=> {len(final_nodes_map)} models ({len(rename_map)} moved), {len(final_rels_list)} relationships"
+                   f" ({len(dead_letters)} dead-lettered)")
     # return index graph
     return {
         "directed": True,
@@ -147,18 +251,23 @@ def index_models(limit: t.Optional[int], local_files_only: bool = False) -> dict
         "relationships_count": len(final_rels_list),
         "nodes": list(final_nodes_map.values()),
         "relationships": final_rels_list,
+        "dead_letters": dead_letters,
     }
 
 
+@profilable("index")
 def main(
         limit: t.Optional[int] = None,
         reset_db: bool = True,
         save_json: bool = True,
         local_files_only: bool = False,
+        executor: t.Optional[ExecutorType] = None,
+        memory_profile: bool = False,
 ) -> None:
     """Entry point for the index CLI command."""
     start_time = time.time()
     settings = get_settings()
+    memory_tracker = MemoryTracker("index", enabled=memory_profile or settings.index_memory_profile)
     db_conn = get_db_connection()
     repository = get_graph_repository()
     # setup
@@ -168,8 +277,13 @@ def main(
     logger.debug(f"Creating extra indexes...")
     db_conn.db.create_index(gq.MemgraphIndex("Model", property="indexed"))
     logger.debug(f"Extra indexes created")
+    get_author_listing_cache().clear()  # listings are shared by the jobs of one run
     # indexing models
-    index_graph: dict = index_models(limit, local_files_only=local_files_only)
+    index_graph: dict = index_models(limit, local_files_only=local_files_only, executor=executor,
+                                     memory_tracker=memory_tracker)
+    if settings.index_worker_db_writes:
+        logger.debug(f"Nodes and relationships written by workers, skipping json file")
+        save_json = False
     # save to json
     if save_json:
         index_graph_path = settings.project_dir / "media" / f"index_{dt.datetime.utcnow().isoformat()}.json"
@@ -178,28 +292,32 @@ def main(
         with open(index_graph_path, "w") as f:
             json.dump(index_graph, f, indent=4, default=custom_serializer)
         logger.success(f"Index saved to file: {index_graph_path}")
-    # import to Database
-    logger.debug(f"Importing {index_graph.get('nodes_count')} nodes to database...")
-    for ind, node in enumerate(index_graph["nodes"]):
-        repository.set_properties(
-            label="Model",
-            filters=dict(id=node["id"]),
-            new_values={k: v for k, v in node.items() if k not in {"id", "labels"}},
-            new_labels=node["labels"],
-            create=True,
-        )
-        log_progress(ind, index_graph["nodes_count"], step=5)
-    logger.debug(f"Importing {index_graph.get('relationships_count')} relationships to database...")
-    for ind, rel in enumerate(index_graph["relationships"]):
-        repository.create_relationship(
-            label="Model",
-            from_id=rel["source"],
-            to_id=rel["target"],
-            relationship_type=rel["type"],
-            properties={k: v for k, v in rel.items() if k not in {"source", "target", "type"}},
-        )
-        log_progress(ind, index_graph["relationships_count"], step=5)
-    logger.success(f"Imported {index_graph['nodes_count']} nodes and {index_graph['relationships_count']} rels")
+        memory_tracker.checkpoint("index saved to json")
+    # import to Database (unless already written by workers)
+    if not settings.index_worker_db_writes:
+        memory_tracker.checkpoint("import started")
+        logger.debug(f"Importing {index_graph.get('nodes_count')} nodes to database...")
+        for ind, node in enumerate(index_graph["nodes"]):
+            repository.set_properties(
+                label="Model",
+                filters=dict(id=node["id"]),
+                new_values={k: v for k, v in node.items() if k not in {"id", "labels"}},
+                new_labels=node["labels"],
+                create=True,
+            )
+            log_progress(ind, index_graph["nodes_count"], step=5)
+        logger.debug(f"Importing {index_graph.get('relationships_count')} relationships to database...")
+        for ind, rel in enumerate(index_graph["relationships"]):
+            repository.create_relationship(
+                label="Model",
+                from_id=rel["source"],
+                to_id=rel["target"],
+                relationship_type=rel["type"],
+                properties={k: v for k, v in rel.items() if k not in {"source", "target", "type"}},
+            )
+            log_progress(ind, index_graph["relationships_count"], step=5)
+        logger.success(f"Imported {index_graph['nodes_count']} nodes and {index_graph['relationships_count']} rels")
+        memory_tracker.checkpoint("import completed")
     # teardown
     logger.debug(f"Removing extra properties...")
     repository.remove_properties(label="Model", keys={"indexed", "new_id"})
@@ -209,6 +327,7 @@ def main(
     logger.debug(f"Extra indexes dropped")
     if reset_db:
         db_conn.setup_post_populate()
+    memory_tracker.close()
     # logging
     end_time = time.time()
     logger.success(f"completed in {format_duration(start_time, end_time)}")
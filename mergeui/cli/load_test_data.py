@@ -1,13 +1,19 @@
+import typing as t
+from pathlib import Path
 from loguru import logger
 from mergeui.core.dependencies import get_settings, get_db_connection
+from mergeui.utils.profiling import profilable
 
 
-def main():
+@profilable("load_test_data")
+def main(json_path: t.Optional[str] = None):
+    """Load the test graph, or a graph JSON file (e.g. an index snapshot saved in media/)."""
     settings = get_settings()
     db_conn = get_db_connection()
     db_conn.reset()
     db_conn.setup_pre_populate()
-    db_conn.populate_from_json_file(settings.project_dir / "tests/test_data/graph.json")
+    json_path = Path(json_path) if json_path else settings.project_dir / "tests/test_data/graph.json"
+    db_conn.populate_from_json_file(json_path)
     db_conn.setup_post_populate()
     logger.success("Test data loaded")
 
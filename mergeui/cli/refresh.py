@@ -0,0 +1,67 @@
+import typing as t
+import datetime as dt
+import time
+from loguru import logger
+from mergeui.core.dependencies import get_settings, get_graph_repository
+from mergeui.utils import format_duration
+from mergeui.utils.index.data_extraction import hf_whoami, download_results_dataset
+from mergeui.utils.index.executors import ExecutorType, create_index_executor
+from mergeui.utils.index.feed import ChangeFeed, HubChangeFeed, LocalChangeFeed, HighWaterMark, poll_changes
+from mergeui.utils.index.incremental import reindex_models
+from mergeui.utils.index.retry import RetryPolicy, RetryTracker
+
+
+def refresh_once(
+        feed: ChangeFeed,
+        hwm: HighWaterMark,
+        executor: t.Optional[ExecutorType] = None,
+        local_files_only: bool = False,
+) -> t.Optional[dict]:
+    """Reindex models changed since the high-water mark (and the models failed at the previous refresh), then advance
+    it (only once the changes are applied, failed models are kept to be retried).
+    """
+    settings = get_settings()
+    entries = poll_changes(feed, hwm)
+    model_ids = list(dict.fromkeys([entry.model_id for entry in entries] + sorted(hwm.retry_model_ids)))
+    if not model_ids:
+        return None
+    results_dataset_folder = download_results_dataset(local_files_only=local_files_only)
+    retry_tracker = RetryTracker(RetryPolicy.from_settings(settings))
+    with create_index_executor(settings, retry_tracker, executor) as index_executor:
+        results = reindex_models(
+            index_executor,
+            get_graph_repository(),
+            model_ids,
+            results_dataset_folder,
+        )
+    hwm.advance(entries, failed_model_ids=results["dead_letters"])
+    if hwm.retry_model_ids:
+        logger.warning(f"{len(hwm.retry_model_ids)} models dead-lettered, retried at the next refresh")
+    return results
+
+
+def main(
+        *,
+        once: bool = False,
+        feed_path: t.Optional[str] = None,
+        executor: t.Optional[ExecutorType] = None,
+        local_files_only: bool = False,
+) -> None:
+    """Entry point for the refresh CLI command: poll the change feed and apply changes to the live database."""
+    settings = get_settings()
+    feed = LocalChangeFeed(feed_path) if feed_path else HubChangeFeed(sort=settings.refresh_feed_sort)
+    state_path = settings.project_dir / "media" / "refresh_state.json"
+    hwm = HighWaterMark.load(state_path)
+    if hwm.updated_at is None:
+        hwm.updated_at = dt.datetime.now(dt.timezone.utc) - dt.timedelta(hours=settings.refresh_initial_lookback_hours)
+    logger.info(f"Refreshing models changed since {hwm.updated_at} every {settings.refresh_interval}s...")
+    hf_whoami()
+    while True:
+        start_time = time.time()
+        if refresh_once(feed, hwm, executor=executor, local_files_only=local_files_only) is not None:
+            hwm.save(state_path)
+            logger.success(f"Refreshed in {format_duration(start_time, time.time())}, high-water mark: "
+                           f"{hwm.updated_at}")
+        if once:
+            break
+        time.sleep(max(0.0, settings.refresh_interval - (time.time() - start_time)))
@@ -0,0 +1,17 @@
+import time
+from loguru import logger
+from mergeui.core.dependencies import get_redis_connection
+from mergeui.utils.index.incremental import enqueue_lineage_refresh, get_lineage_refresh_status
+
+
+def main(*, model_id: str, max_hops: int = 2, wait: bool = True) -> None:
+    """Entry point for the refresh_lineage CLI command: reindex a model and its ancestors up to max_hops."""
+    connection = get_redis_connection()
+    job = enqueue_lineage_refresh(connection, model_id=model_id, max_hops=max_hops)
+    logger.info(f"Lineage refresh of {model_id} scheduled: job_id={job.id}")
+    while wait:
+        status = get_lineage_refresh_status(connection, job.id)
+        if status is None or status["status"] not in {"queued", "started", "deferred", "scheduled"}:
+            logger.info(f"Lineage refresh of {model_id}: {status}")
+            break
+        time.sleep(2)
@@ -0,0 +1,13 @@
+from pathlib import Path
+from mergeui.core.dependencies import get_db_connection
+from mergeui.utils.profiling import profilable
+
+
+@profilable("restore_snapshot")
+def main(snapshot_path: str):
+    db_conn = get_db_connection()
+    db_conn.restore_snapshot(Path(snapshot_path))
+
+
+if __name__ == '__main__':
+    main()
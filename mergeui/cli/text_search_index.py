@@ -1,6 +1,8 @@
 from mergeui.core.dependencies import get_model_repository
+from mergeui.utils.profiling import profilable
 
 
+@profilable("text_search_index")
 def main(force: bool = True):
     model_repository = get_model_repository()
     model_repository.create_text_search_index(reset_if_not_empty=force)
@@ -1,7 +1,7 @@
 from loguru import logger
 from rq import Worker
 from mergeui.core.dependencies import get_settings, get_graph_repository
-from mergeui.utils.index.jobs import create_redis_connection
+from mergeui.core.db import create_redis_connection
 # preloading modules...
 # noinspection PyUnresolvedReferences
 import mergeui.utils.index.jobs
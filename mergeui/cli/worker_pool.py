@@ -1,16 +1,26 @@
+import typing as t
 from loguru import logger
 from rq.worker_pool import WorkerPool
 from mergeui.core.dependencies import get_settings, get_graph_repository
-from mergeui.utils.index.jobs import create_redis_connection
+from mergeui.core.db import create_redis_connection
+from mergeui.utils.index.autoscaling import AutoscalingWorkerPool, RecyclingWorker, ScalingPolicy
 # preloading modules...
 # noinspection PyUnresolvedReferences
 import mergeui.utils.index.jobs
 
 
-def main(*, queues: str = "default", num_workers: int = 1, burst: bool = False):
+def main(*, queues: str = "default", num_workers: int = 1, max_workers: t.Optional[int] = None, burst: bool = False):
+    """Start a fixed pool of num_workers, or an autoscaling pool between num_workers and max_workers if set."""
     settings = get_settings()
     repository: get_graph_repository()
     r = create_redis_connection(settings)
-    pool = WorkerPool(queues=[qu.strip() for qu in queues.split()], connection=r, num_workers=num_workers)
-    logger.info(f"Starting {num_workers} workers...")
+    queues = [qu.strip() for qu in queues.split()]
+    if max_workers and max_workers > num_workers:
+        policy = ScalingPolicy.from_settings(settings, min_workers=num_workers, max_workers=max_workers)
+        pool = AutoscalingWorkerPool(queues=queues, connection=r, policy=policy,
+                                     scale_interval=settings.worker_pool_scale_interval)
+        logger.info(f"Starting autoscaling pool of {num_workers} to {max_workers} workers...")
+    else:
+        pool = WorkerPool(queues=queues, connection=r, num_workers=num_workers, worker_class=RecyclingWorker)
+        logger.info(f"Starting {num_workers} workers...")
     pool.start(burst=burst, logging_level=str(settings.rq_logging_level or settings.logging_level))
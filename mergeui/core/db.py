@@ -1,32 +1,48 @@
 import random
 import typing as t
+import asyncio
+import collections
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
+import functools as fts
+import os
+import queue
+import threading
 from loguru import logger
-import datetime as dt
 from pathlib import Path
 from urllib.parse import unquote
+import pydantic_core as pdc
 import gqlalchemy as gq
 from gqlalchemy.vendors.database_client import DatabaseClient
-import networkx as nx
+from gqlalchemy.utilities import CypherVariable
 import time
+import redis
 from mergeui.core.settings import Settings
-from mergeui.core.schema import Model
+from mergeui.core.schema import Model, SORT_KEYS
 from mergeui.core.base import BaseDatabaseConnection
-from mergeui.utils import parse_iso_dt, aware_to_naive_dt
-from mergeui.utils.types import get_fields_from_class
-from mergeui.utils.nx import load_nx_graph_from_json_file, import_nx_graph_to_db
+from mergeui.core.retry import query_retrier, auto_retry_query, is_connection_error, QueryRetrier, CircuitBreaker
+from mergeui.core.slow_query_log import slow_query_log
+from mergeui.utils import parse_iso_dt, aware_to_naive_dt, filter_none, batched
+from mergeui.utils.graph_json import iter_graph_json_items
+from mergeui.utils.snapshot import SnapshotWriter, iter_snapshot, validate_snapshot
+from mergeui.utils.logging import log_throttled
 
+T = t.TypeVar("T")
 
-def create_db_connection(settings: Settings) -> DatabaseClient:
-    logger.info(f"Creating database connection to {settings.database_url.host}:{settings.database_url.port} ...")
+
+def create_db_connection(settings: Settings, url: t.Optional[pdc.Url] = None) -> DatabaseClient:
+    """Connection to the main instance (database_url) or to another url (read replica)."""
+    url = url or settings.database_url
+    logger.info(f"Creating database connection to {url.host}:{url.port} ...")
     args = dict(
-        host=settings.database_url.host,
-        port=settings.database_url.port,
-        username=unquote(settings.database_url.username or ""),
-        password=unquote(settings.database_url.password or ""),
-        encrypted=settings.database_url.scheme.endswith("+s"),
+        host=url.host,
+        port=url.port,
+        username=unquote(url.username or ""),
+        password=unquote(url.password or ""),
+        encrypted=url.scheme.endswith("+s"),
         client_name=f"{settings.project_name}_{random.randint(0, 500)}",
     )
-    if settings.database_url.scheme.startswith("neo4j"):
+    if url.scheme.startswith("neo4j"):
         return gq.Neo4j(**args)
     return gq.Memgraph(
         **args,
@@ -34,47 +50,253 @@ def create_db_connection(settings: Settings) -> DatabaseClient:
     )
 
 
-def auto_retry_query(*, max_tries: t.Optional[int] = 2, delay: t.Optional[float] = None):
-    """Decorator factory for auto-retrying query execution on DatabaseError."""
+def create_replica_connection(settings: Settings, url: pdc.Url, retrier: QueryRetrier) -> DatabaseClient:
+    """Connection to a read replica, with its own retries and circuit breaker (failures don't affect the main one)."""
+    client = create_db_connection(settings, url)
+    client.query_retrier = retrier
+    return client
+
+
+def create_redis_connection(settings: Settings) -> redis.Redis:
+    return redis.Redis(
+        host=settings.redis_dsn.host,
+        port=settings.redis_dsn.port,
+        db=settings.redis_dsn.path.replace("/", ""),
+        username=settings.redis_dsn.username,
+        password=settings.redis_dsn.password,
+        client_name=f"{settings.project_name}",
+    )
+
+
+class DatabaseClientPool:
+    """Bounded pool of database clients (one connection each), a client is used by one thread at a time.
+    Clients idle for more than health_check_interval are checked before reuse, broken ones are replaced.
+    """
+
+    def __init__(
+            self,
+            create_client: t.Callable[[], DatabaseClient],
+            size: int = 8,
+            timeout: float = 30.0,
+            health_check_interval: float = 30.0,
+            check_new_clients: bool = False,
+    ):
+        self.create_client = create_client
+        self.size = size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.check_new_clients = check_new_clients  # fail at checkout if the database is unreachable
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._idle: queue.LifoQueue[tuple[DatabaseClient, float]] = queue.LifoQueue()  # (client, returned at)
+        self._created_count = 0
+        self._pid = os.getpid()
+
+    @property
+    def in_use_count(self) -> int:
+        return self._created_count - self._idle.qsize()
+
+    def is_held(self) -> bool:
+        """Whether the current thread has checked out a client (unit of work in progress)."""
+        return self._pid == os.getpid() and getattr(self._local, "client", None) is not None
 
-    def decorator(func):
-        """Decorator for auto-retrying query execution on DatabaseError."""
+    @staticmethod
+    def is_healthy(client: DatabaseClient) -> bool:
+        try:
+            return bool(list(client.execute_and_fetch("RETURN 1 AS ok")))
+        except Exception as e:
+            logger.debug(f"Database connection health check failed: {e!r}")
+            return False
 
-        def wrapper(*args, **kwargs):
-            _max_tries = max_tries
-            _tries = 0
-            _delay = delay
-            while _tries < _max_tries:
+    def _discard(self, client: DatabaseClient) -> None:
+        with self._lock:
+            self._created_count -= 1
+        # noinspection PyProtectedMember
+        connection = getattr(getattr(client, "_cached_connection", None), "_connection", None)
+        with contextlib.suppress(Exception):
+            connection.close()
+
+    def _checkout(self) -> DatabaseClient:
+        try:
+            client, returned_at = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_create = self._created_count < self.size
+                if can_create:
+                    self._created_count += 1
+            if can_create:
                 try:
-                    return func(*args, **kwargs)
-                except Exception as e:
-                    _e_str = e.__repr__()
-                    logger.debug(f"Checking auto retry query for {_e_str}")
-                    if any(sub_str in _e_str for sub_str in
-                           ["Cannot resolve conflicting transactions", "failed to receive chunk size",
-                            "GQLAlchemyWaitForConnectionError", "failed to send chunk data"]):
-                        _tries += 1
-                        if _max_tries is None or _tries < _max_tries:
-                            logger.warning(f"Retrying query execution. Try {_tries} of {_max_tries}...")
-                            if delay is None:
-                                _delay = min(_tries / 10.0, 10.0)  # max 10s delay
-                            time.sleep(_delay)
-                    else:
-                        raise  # Re-raise if it's a different DatabaseError
-
-        return wrapper
-
-    return decorator
-
-
-@auto_retry_query(max_tries=3, delay=3)
-def execute_query(q):
-    result = q.execute()
+                    client = self.create_client()
+                except Exception:
+                    with self._lock:
+                        self._created_count -= 1
+                    raise
+                if self.check_new_clients and not self.is_healthy(client):
+                    self._discard(client)
+                    raise ConnectionError("Database unreachable, new connection health check failed")
+                return client
+            try:
+                client, returned_at = self._idle.get(timeout=self.timeout)
+            except queue.Empty:
+                raise TimeoutError(f"No database connection available after {self.timeout}s (pool size={self.size})")
+        if time.monotonic() - returned_at >= self.health_check_interval and not self.is_healthy(client):
+            self._discard(client)
+            return self._checkout()
+        return client
+
+    @contextlib.contextmanager
+    def acquire(self) -> t.Iterator[DatabaseClient]:
+        """Check out a client for a query or a unit of work (nested calls of the same thread reuse it)."""
+        if self._pid != os.getpid():  # connections are not shared with forked processes (rq work horses)
+            with self._lock:
+                self._reset()
+            self._local = threading.local()
+        client = getattr(self._local, "client", None)
+        if client is not None:
+            yield client
+            return
+        client = self._checkout()
+        self._local.client = client
+        broken = False
+        try:
+            yield client
+        except Exception as e:
+            broken = is_connection_error(e)
+            raise
+        finally:
+            self._local.client = None
+            if broken:
+                self._discard(client)
+            else:
+                self._idle.put((client, time.monotonic()))
+
+
+class ReplicaRouter:
+    """Pick the read replica pool of a read: the one already held by the thread, else the healthy pool with the fewest
+    connections in use (round robin between ties). A replica failing with a connection error is skipped for cooldown
+    seconds, reads go to the main instance while no replica is healthy.
+    """
+
+    def __init__(
+            self,
+            pools: list[DatabaseClientPool],
+            names: list[str],
+            cooldown: float = 30.0,
+            retriers: t.Optional[list[QueryRetrier]] = None,
+    ):
+        self.pools = pools
+        self.names = names
+        self.retriers = retriers or []  # stats of each replica's retries and circuit breaker
+        self.cooldown = cooldown
+        self._failed_at: dict[int, float] = {}  # pool index -> last failure time
+        self._counters: collections.Counter[str] = collections.Counter()  # reads per replica name (or main)
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def choose(self) -> t.Optional[DatabaseClientPool]:
+        for pool in self.pools:
+            if pool.is_held():
+                return pool
+        now = time.monotonic()
+        with self._lock:
+            healthy = [ind for ind in range(len(self.pools))
+                       if now - self._failed_at.get(ind, float("-inf")) >= self.cooldown]
+            if not healthy:
+                self._counters["main"] += 1
+                return None
+            self._next += 1
+            ind = min(healthy, key=lambda i: (self.pools[i].in_use_count, (i - self._next) % len(self.pools)))
+            self._counters[self.names[ind]] += 1
+        return self.pools[ind]
+
+    def mark_failed(self, pool: DatabaseClientPool, e: Exception) -> None:
+        ind = self.pools.index(pool)
+        logger.warning(f"Read replica {self.names[ind]} unavailable, skipped for {self.cooldown}s: {e!r}")
+        with self._lock:
+            self._failed_at[ind] = time.monotonic()
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "replicas": [{
+                    "name": name,
+                    "in_use": pool.in_use_count,
+                    "healthy": now - self._failed_at.get(ind, float("-inf")) >= self.cooldown,
+                    "reads": self._counters[name],
+                    **({"retries": self.retriers[ind].stats()} if ind < len(self.retriers) else {}),
+                } for ind, (name, pool) in enumerate(zip(self.names, self.pools))],
+                "reads_on_main": self._counters["main"],
+            }
+
+
+@auto_retry_query(lambda q, *args, **kwargs: q._connection)  # noqa
+def execute_query(q, parameters: t.Optional[dict[str, t.Any]] = None):
+    # noinspection PyProtectedMember
+    query, db = q._construct_query(), q._connection
+    start = time.perf_counter()
+    result = db.execute_and_fetch(query, parameters or {}) if q._fetch_results else db.execute(query, parameters or {})
     if isinstance(result, t.Iterator):
         result = list(result)
+    slow_query_log.record(db, query, parameters, time.perf_counter() - start, len(result or []))
     return result
 
 
+def param_refs(values: t.Optional[dict[str, t.Any]], prefix: str = "") \
+        -> tuple[dict[str, CypherVariable], dict[str, t.Any]]:
+    """Properties map referencing $parameters (for the query text) and the parameters to bind, None values dropped."""
+    values = filter_none(values or {})
+    return {key: CypherVariable(f"${prefix}{key}") for key in values}, {f"{prefix}{k}": v for k, v in values.items()}
+
+
+@auto_retry_query(lambda db, *args, **kwargs: db)
+def execute_template(db: DatabaseClient, query: str, parameters: t.Optional[dict[str, t.Any]] = None) -> list[dict]:
+    """Execute a query template with its bound $parameters."""
+    start = time.perf_counter()
+    result = list(db.execute_and_fetch(query, parameters or {}))
+    slow_query_log.record(db, query, parameters, time.perf_counter() - start, len(result))
+    return result
+
+
+class QueryTemplates:
+    """Cypher query texts built once per (name, options) and executed with bound $parameters.
+    The query text does not depend on the values, so Memgraph can reuse its cached plan (text reuse rates in stats).
+    """
+
+    def __init__(self):
+        self._templates: dict[tuple[str, t.Hashable], str] = {}
+        self._executions: collections.Counter[str] = collections.Counter()
+        self._lock = threading.Lock()
+
+    def get(self, name: str, options: t.Hashable, build: t.Callable[[], str]) -> str:
+        """Query text of the template, built on the first call with these options."""
+        key = (name, options)
+        query = self._templates.get(key)
+        if query is None:
+            query = build()
+            logger.trace(f"Query template {name}{options}: {query}")
+            with self._lock:
+                self._templates.setdefault(key, query)
+        with self._lock:
+            self._executions[name] += 1
+        return query
+
+    def stats(self) -> dict[str, dict[str, t.Union[int, float]]]:
+        """Executions, distinct query texts and text reuse rate (executions of an already built query text) per
+        template, an upper bound of the plan cache hit rate (Memgraph does not report it).
+        """
+        with self._lock:
+            texts_count = collections.Counter(name for name, _ in self._templates)
+            return {name: {
+                "executions": executions,
+                "query_texts": texts_count[name],
+                "text_reuse_rate": round(1 - texts_count[name] / executions, 4),
+            } for name, executions in sorted(self._executions.items())}
+
+
 class DatabaseConnection(BaseDatabaseConnection):
     # for import_from_cypher_file, export_to_cypher_file: use UI
     settings: Settings
@@ -82,7 +304,86 @@ class DatabaseConnection(BaseDatabaseConnection):
 
     def __init__(self, settings: Settings):
         self.settings = settings
-        self.db = create_db_connection(self.settings)
+        self.db = create_db_connection(self.settings)  # schema management and single-threaded commands
+        self.pool = DatabaseClientPool(
+            lambda: create_db_connection(self.settings),
+            size=settings.database_pool_size,
+            timeout=settings.database_pool_timeout,
+            health_check_interval=settings.database_pool_health_check_interval,
+        )
+        replica_retriers = [QueryRetrier(
+            max_attempts=min(settings.database_retry_max_attempts, 2),  # then the read is rerun on the main instance
+            base_delay=settings.database_retry_base_delay,
+            max_delay=settings.database_retry_max_delay,
+            breaker=CircuitBreaker(failure_threshold=settings.database_breaker_failure_threshold,
+                                   reset_timeout=settings.database_breaker_reset_timeout),
+        ) for _ in settings.database_read_urls]
+        self.replicas = ReplicaRouter(
+            [DatabaseClientPool(
+                fts.partial(create_replica_connection, self.settings, url, retrier),
+                size=settings.database_pool_size,
+                timeout=settings.database_pool_timeout,
+                health_check_interval=settings.database_pool_health_check_interval,
+                check_new_clients=True,
+            ) for url, retrier in zip(settings.database_read_urls, replica_retriers)],
+            names=[f"{url.host}:{url.port}" for url in settings.database_read_urls],
+            cooldown=settings.database_replica_cooldown,
+            retriers=replica_retriers,
+        )
+        self.executor = ThreadPoolExecutor(max_workers=settings.database_pool_size, thread_name_prefix="db")
+        self.templates = QueryTemplates()
+        query_retrier.configure(
+            max_attempts=settings.database_retry_max_attempts,
+            base_delay=settings.database_retry_base_delay,
+            max_delay=settings.database_retry_max_delay,
+            failure_threshold=settings.database_breaker_failure_threshold,
+            reset_timeout=settings.database_breaker_reset_timeout,
+        )
+        slow_query_log.configure(
+            threshold=settings.database_slow_query_threshold,
+            path=settings.database_slow_query_log_path or settings.project_dir / "media" / "slow_queries.jsonl",
+            capture_plan=settings.database_slow_query_capture_plan,
+            rotation=settings.database_slow_query_log_rotation,
+            retention=settings.database_slow_query_log_retention,
+        )
+
+    def acquire(self) -> t.ContextManager[DatabaseClient]:
+        """Check out a pooled connection of the main instance for a query or a unit of work (repositories)."""
+        return self.pool.acquire()
+
+    def read(self, func: t.Callable[[DatabaseClient], T]) -> T:
+        """Run a read unit of work func(db) on a read replica if any, unless the thread is in a unit of work on the
+        main instance (reads of its own writes). It is rerun on the main instance if the replica fails with a connection
+        error (unreachable, circuit breaker open or no connection available), the replica is skipped during cooldown.
+        """
+        pool = self.replicas.choose() if not self.pool.is_held() else None
+        if pool is not None:
+            try:
+                with pool.acquire() as db:
+                    return func(db)
+            except Exception as e:
+                if not is_connection_error(e) and not isinstance(e, (ConnectionError, TimeoutError)):
+                    raise
+                self.replicas.mark_failed(pool, e)
+        with self.pool.acquire() as db:
+            return func(db)
+
+    def stats(self) -> dict:
+        """Connection pools usage, retries and circuit breaker, query templates and slow queries stats."""
+        return {
+            "pool": {"size": self.pool.size, "in_use": self.pool.in_use_count},
+            "read_replicas": self.replicas.stats(),
+            "retries": query_retrier.stats(),
+            "query_templates": self.templates.stats(),
+            "slow_queries": slow_query_log.stats(),
+        }
+
+    async def run_async(self, func: t.Callable, *args, **kwargs) -> t.Any:
+        """Await a blocking query run by the database threads (one per pooled connection), pending calls are queued
+        without holding a thread (unlike sync endpoints blocking the server threadpool).
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, fts.partial(func, *args, **kwargs))
 
     def setup(self, reset_if_not_empty: bool = True):
         """Setup database with all constraints and indexes."""
@@ -115,6 +416,10 @@ class DatabaseConnection(BaseDatabaseConnection):
         self.db.create_index(gq.MemgraphIndex("Model", property="architecture"))
         self.db.create_index(gq.MemgraphIndex("Model", property="private"))
         self.db.create_index(gq.MemgraphIndex("Model", property="gated"))
+        # sort keys (top-K queries scan the nodes having the key by index)
+        for sort_key in SORT_KEYS:
+            self.db.create_index(gq.MemgraphIndex("Model", property=sort_key))
+            self.db.create_index(gq.MemgraphIndex("MergedModel", property=sort_key))
         # edge indexes
         self.db.execute(f"CREATE EDGE INDEX ON :DERIVED_FROM")
         # text index
@@ -144,13 +449,119 @@ class DatabaseConnection(BaseDatabaseConnection):
         """Check if database is empty."""
         return not (self.db.get_constraints() or self.db.get_indexes())
 
-    def populate_from_json_file(self, json_path: Path):
-        """Populate database with data from JSON file."""
-        graph: nx.Graph = load_nx_graph_from_json_file(json_path)
-        for node in graph.nodes:  # handling dt.datetime fields
-            for dt_field in get_fields_from_class(Model, dt.datetime, include_optionals=True):
-                if dt_field in graph.nodes[node]:
-                    value = graph.nodes[node][dt_field]
-                    if value and isinstance(value, str):
-                        graph.nodes[node][dt_field] = aware_to_naive_dt(parse_iso_dt(graph.nodes[node][dt_field]))
-        import_nx_graph_to_db(graph, self.db)
+    def _create_nodes(self, nodes: list[dict]) -> None:
+        """Create nodes (properties and labels) in UNWIND queries, one per set of labels."""
+        rows_by_labels: dict[tuple[str, ...], list[dict]] = {}
+        for node in nodes:
+            properties = {k: v for k, v in node.items() if k != "labels" and v is not None}
+            rows_by_labels.setdefault(tuple(node.get("labels") or []), []).append(properties)
+        for labels, rows in rows_by_labels.items():
+            query = self.templates.get("import.nodes", labels, lambda: (
+                f"UNWIND $rows AS row CREATE (n{''.join(f':{label}' for label in labels)}) SET n = row"))
+            execute_template(self.db, query, {"rows": rows})
+
+    def _create_relationships(self, relationships: list[dict], node_label: str = "Model") -> None:
+        """Create relationships (source id, target id, type and properties) in UNWIND queries, one per type."""
+        rows_by_type: dict[str, list[dict]] = {}
+        for rel in relationships:
+            rows_by_type.setdefault(rel.get("type") or "TO", []).append({
+                "source": rel["source"],
+                "target": rel["target"],
+                "properties": {k: v for k, v in rel.items()
+                               if k not in {"source", "target", "type"} and v is not None},
+            })
+        for rel_type, rows in rows_by_type.items():
+            query = self.templates.get("import.relationships", (node_label, rel_type), lambda: (
+                f"UNWIND $rows AS row MATCH (src:{node_label} {{id: row.source}}) "
+                f"MATCH (dst:{node_label} {{id: row.target}}) CREATE (src)-[rel:{rel_type}]->(dst) "
+                f"SET rel = row.properties"))
+            execute_template(self.db, query, {"rows": rows})
+
+    def populate_from_json_file(self, json_path: Path, node_label: str = "Model"):
+        """Populate database with data from JSON file, parsed incrementally and written in UNWIND batches
+        (nodes, then relationships between nodes matched by node_label and id).
+        """
+        logger.info(f"Importing graph from: {json_path}")
+        batch_size, dt_fields = self.settings.database_import_batch_size, Model.dt_fields()
+        nodes_count, relationships_count = 0, 0
+        for batch in batched(iter_graph_json_items(json_path, "nodes"), batch_size):
+            for node in batch:
+                for dt_field in dt_fields:
+                    if isinstance(node.get(dt_field), str):
+                        node[dt_field] = aware_to_naive_dt(parse_iso_dt(node[dt_field]))
+            self._create_nodes(batch)
+            nodes_count += len(batch)
+            log_throttled("DEBUG", "{} nodes imported", nodes_count, interval=5.0)
+        for batch in batched(iter_graph_json_items(json_path, "relationships"), batch_size):
+            self._create_relationships(batch, node_label=node_label)
+            relationships_count += len(batch)
+            log_throttled("DEBUG", "{} relationships imported", relationships_count, interval=5.0)
+        if nodes_count:
+            logger.success(f"Graph imported ({nodes_count} nodes, {relationships_count} relationships)")
+        else:
+            logger.warning(f"Nothing to import")
+
+    def export_snapshot(self, snapshot_path: Path) -> None:
+        """Export Model nodes (with their labels) and DERIVED_FROM relationships to a binary snapshot file,
+        read by pages of database_import_batch_size nodes (ordered by id).
+        """
+        logger.info(f"Exporting snapshot to: {snapshot_path}")
+        batch_size = self.settings.database_import_batch_size
+        nodes_count, relationships_count = 0, 0
+        with SnapshotWriter(snapshot_path) as writer:
+            query, after = ("MATCH (n:Model) WHERE n.id > $after WITH n ORDER BY n.id LIMIT $limit "
+                            "RETURN labels(n) AS labels, properties(n) AS properties"), ""
+            while True:
+                rows = execute_template(self.db, query, {"after": after, "limit": batch_size})
+                if not rows:
+                    break
+                writer.write(b"N", [{**row["properties"], "labels": ":".join(row["labels"])} for row in rows])
+                nodes_count += len(rows)
+                after = rows[-1]["properties"]["id"]
+            query, after = ("MATCH (src:Model) WHERE src.id > $after WITH src ORDER BY src.id LIMIT $limit "
+                            "OPTIONAL MATCH (src)-[rel:DERIVED_FROM]->(dst:Model) "
+                            "RETURN src.id AS source, dst.id AS target, properties(rel) AS properties"), ""
+            while True:
+                rows = execute_template(self.db, query, {"after": after, "limit": batch_size})
+                if not rows:
+                    break
+                relationships = [{**row["properties"], "source": row["source"], "target": row["target"]}
+                                 for row in rows if row["target"] is not None]
+                writer.write(b"R", relationships)
+                relationships_count += len(relationships)
+                after = rows[-1]["source"]
+        logger.success(f"Snapshot exported ({nodes_count} nodes, {relationships_count} relationships)")
+
+    def restore_snapshot(self, snapshot_path: Path) -> None:
+        """Replace the database content with a snapshot file, bulk loaded (in analytical storage mode on Memgraph).
+        The snapshot is validated before the database is reset, the schema is restored even if the load fails.
+        """
+        logger.info(f"Restoring snapshot from: {snapshot_path}")
+        rows_counts = validate_snapshot(snapshot_path)
+        logger.debug(f"Snapshot validated ({rows_counts.get(b'N', 0)} nodes, {rows_counts.get(b'R', 0)} relationships)")
+        self.reset()
+        self.setup_pre_populate()
+        bulk_mode = isinstance(self.db, gq.Memgraph) and self.settings.database_bulk_load_analytical_mode
+        nodes_count, relationships_count = 0, 0
+        try:
+            if bulk_mode:  # no transactions overhead, the database must not be used during the restore
+                self.db.execute("STORAGE MODE IN_MEMORY_ANALYTICAL")
+            for kind, rows in iter_snapshot(snapshot_path):
+                if kind == b"N":
+                    for row in rows:
+                        row["labels"] = row["labels"].split(":") if row.get("labels") else []
+                    self._create_nodes(rows)
+                    nodes_count += len(rows)
+                else:
+                    self._create_relationships([{**row, "type": "DERIVED_FROM"} for row in rows])
+                    relationships_count += len(rows)
+                log_throttled("DEBUG", "{} nodes and {} relationships restored", nodes_count, relationships_count,
+                              interval=5.0)
+        except Exception:
+            logger.error(f"Snapshot restore failed after {nodes_count} nodes and {relationships_count} relationships")
+            raise
+        finally:
+            if bulk_mode:
+                self.db.execute("STORAGE MODE IN_MEMORY_TRANSACTIONAL")
+            self.setup_post_populate()
+        logger.success(f"Snapshot restored ({nodes_count} nodes, {relationships_count} relationships)")
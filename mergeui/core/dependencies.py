@@ -1,6 +1,7 @@
 import functools as fts
+import redis
 from mergeui.core.settings import Settings
-from mergeui.core.db import DatabaseConnection
+from mergeui.core.db import DatabaseConnection, create_redis_connection
 from mergeui.repositories import GraphRepository, ModelRepository
 from mergeui.services import ModelService
 from mergeui.utils import set_env_var
@@ -10,7 +11,12 @@ from mergeui.utils.logging import set_logger_level
 @fts.cache
 def get_settings() -> Settings:
     settings = Settings()
-    set_logger_level(settings.logging_level)
+    set_logger_level(
+        settings.logging_level,
+        json_path=settings.logging_json_path,
+        sample_every=settings.logging_sample_every,
+        throttle_interval=settings.logging_throttle_interval,
+    )
     set_env_var('HF_HUB_ENABLE_HF_TRANSFER', settings.hf_hub_enable_hf_transfer)
     return settings
 
@@ -21,6 +27,11 @@ def get_db_connection():
     return DatabaseConnection(settings)
 
 
+@fts.cache
+def get_redis_connection() -> redis.Redis:
+    return create_redis_connection(get_settings())
+
+
 @fts.cache
 def get_graph_repository() -> GraphRepository:
     return GraphRepository(get_db_connection())
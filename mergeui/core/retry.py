@@ -0,0 +1,186 @@
+import typing as t
+import collections
+import contextlib
+import functools as fts
+import threading
+import time
+from loguru import logger
+from mergeui.utils import exponential_backoff_delay
+
+CircuitStateType = t.Literal["closed", "open", "half_open"]
+
+# the connection is broken (or the database is down), a new connection is needed
+CONNECTION_ERRORS = [
+    "failed to receive chunk size", "failed to send chunk data", "GQLAlchemyWaitForConnectionError",
+    "Connection refused", "Connection reset", "Broken pipe", "bad connection",
+]
+# the query can succeed as is on a later attempt
+TRANSIENT_ERRORS = ["Cannot resolve conflicting transactions"]
+
+
+def is_connection_error(e: Exception) -> bool:
+    return any(sub_str in repr(e) for sub_str in CONNECTION_ERRORS)
+
+
+def is_transient_error(e: Exception) -> bool:
+    return any(sub_str in repr(e) for sub_str in TRANSIENT_ERRORS)
+
+
+class DatabaseUnavailableError(ConnectionError):
+    """Raised without querying while the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Open after failure_threshold consecutive connection failures, then fail fast for reset_timeout seconds.
+    Once the timeout elapsed, one trial call is let through (half open): closed on success, open again on failure.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state: CircuitStateType = "closed"
+        self.consecutive_failures = 0
+        self.opened_count = 0
+        self.rejected_count = 0
+        self._opened_at = 0.0
+        self._trial_in_progress = False
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = "half_open"
+            if self.state == "open" or (self.state == "half_open" and self._trial_in_progress):
+                self.rejected_count += 1
+                retry_in = max(self.reset_timeout - (time.monotonic() - self._opened_at), 0)
+                raise DatabaseUnavailableError(f"Database unavailable, circuit breaker open (retry in {retry_in:.0f}s)")
+            if self.state == "half_open":
+                self._trial_in_progress = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != "closed":
+                logger.success(f"Database reachable again, circuit breaker closed")
+            self.state = "closed"
+            self.consecutive_failures = 0
+            self._trial_in_progress = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.consecutive_failures += 1
+            self._trial_in_progress = False
+            if self.state == "half_open" or (
+                    self.state == "closed" and self.consecutive_failures >= self.failure_threshold):
+                if self.state == "closed":
+                    self.opened_count += 1
+                    logger.error(f"Database unreachable after {self.consecutive_failures} failures, "
+                                 f"circuit breaker open for {self.reset_timeout}s")
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "opened": self.opened_count,
+            "rejected": self.rejected_count,
+        }
+
+
+class QueryRetrier:
+    """Retry queries failing with connection or transient errors (exponential backoff with jitter).
+    Dead connections are re-established before the next attempt, connection failures feed the circuit breaker.
+    """
+
+    def __init__(
+            self,
+            max_attempts: int = 4,
+            base_delay: float = 0.2,
+            max_delay: float = 5.0,
+            breaker: t.Optional[CircuitBreaker] = None,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker = breaker or CircuitBreaker()
+        self.counters: collections.Counter[str] = collections.Counter()  # retries, reconnects, failures
+        self._lock = threading.Lock()
+
+    def configure(self, **kwargs) -> None:
+        """Update the policy (max_attempts, base_delay, max_delay, failure_threshold, reset_timeout)."""
+        for key in ("failure_threshold", "reset_timeout"):
+            if key in kwargs:
+                setattr(self.breaker, key, kwargs.pop(key))
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.counters[key] += 1
+
+    def call(self, func: t.Callable, *args, reconnect: t.Optional[t.Callable[[], None]] = None, **kwargs) -> t.Any:
+        attempt = 0
+        while True:
+            self.breaker.before_call()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                connection_error = is_connection_error(e)
+                if connection_error:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()  # the database answered
+                    if not is_transient_error(e):
+                        raise
+                attempt += 1
+                if attempt >= self.max_attempts or self.breaker.state == "open":
+                    self._count("failures")
+                    raise
+                delay = exponential_backoff_delay(attempt - 1, base=self.base_delay, max_delay=self.max_delay)
+                logger.warning(f"Retrying query in {delay:.2f}s (attempt {attempt} of {self.max_attempts}): {e!r}")
+                self._count("retries")
+                time.sleep(delay)
+                if connection_error and reconnect is not None:
+                    reconnect()
+                    self._count("reconnects")
+            else:
+                self.breaker.record_success()
+                return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self.counters)
+        return {
+            "retries": counters.get("retries", 0),
+            "reconnects": counters.get("reconnects", 0),
+            "failures": counters.get("failures", 0),
+            "max_attempts": self.max_attempts,
+            "breaker": self.breaker.stats(),
+        }
+
+
+query_retrier = QueryRetrier()  # shared by all connections of the process (configured by DatabaseConnection)
+
+
+def auto_retry_query(get_client: t.Callable[..., t.Any]):
+    """Decorator retrying query execution with the retrier of the client (`query_retrier` attribute, set on read replica
+    clients) or the shared query_retrier (main instance), get_client(*args) returns the database client to reconnect
+    after a connection error.
+    """
+
+    def decorator(func):
+        @fts.wraps(func)
+        def wrapper(*args, **kwargs):
+            def reconnect() -> None:
+                client = get_client(*args, **kwargs)
+                connection = getattr(client, "_cached_connection", None)
+                client._cached_connection = None  # a new connection is created by the next query
+                with contextlib.suppress(Exception):  # already closed
+                    connection._connection.close()
+
+            retrier = getattr(get_client(*args, **kwargs), "query_retrier", None) or query_retrier
+            return retrier.call(func, *args, reconnect=reconnect, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -4,6 +4,7 @@ import dataclasses as dc
 import pydantic
 import datetime as dt
 import gqlalchemy as gq
+from gqlalchemy.query_builders.memgraph_query_builder import Order
 from mergeui.utils import titlify
 from mergeui.utils.types import get_fields_from_class, create_literal_type
 
@@ -44,6 +45,7 @@ class Model(gq.Node):
     # technical
     indexed: t.Optional[bool] = gq.Field(repr=False)
     indexed_at: t.Optional[dt.datetime] = gq.Field(repr=False)
+    sha: t.Optional[str] = gq.Field(repr=False)  # commit SHA of the repo when indexed
     alt_ids: t.Optional[t.List[str]] = gq.Field(default_factory=list, repr=False)
 
     @classmethod
@@ -100,6 +102,22 @@ BaseValidationError = t.Union[pydantic.ValidationError, ValueError, AssertionErr
 SortByOptionType = t.Literal[
     "default", "most likes", "most downloads", "recently created", "recently updated",
     "average score", "ARC", "HellaSwag", "MMLU", "TruthfulQA", "Winogrande", "GSM8k"]
+# sort key and order of each sort option (label-property indexes are created for the sort keys)
+SORT_BY_KEYS: dict[SortByOptionType, tuple[str, Order]] = {
+    "default": ("created_at", Order.ASC),
+    "most likes": ("likes", Order.DESC),
+    "most downloads": ("downloads", Order.DESC),
+    "recently created": ("created_at", Order.DESC),
+    "recently updated": ("updated_at", Order.DESC),
+    "average score": ("average_score", Order.DESC),
+    "ARC": ("arc_score", Order.DESC),
+    "HellaSwag": ("hella_swag_score", Order.DESC),
+    "MMLU": ("mmlu_score", Order.DESC),
+    "TruthfulQA": ("truthfulqa_score", Order.DESC),
+    "Winogrande": ("winogrande_score", Order.DESC),
+    "GSM8k": ("gsm8k_score", Order.DESC),
+}
+SORT_KEYS = sorted({sort_key for sort_key, _ in SORT_BY_KEYS.values()})
 ExcludeOptionType = t.Literal["private", "gated", "base models", "merged models"]
 MergeMethodType = t.Literal[
     "linear", "slerp", "task_arithmetic", "ties", "dare_ties", "dare_linear", "passthrough",
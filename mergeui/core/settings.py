@@ -30,7 +30,27 @@ class Settings(pds.BaseSettings):
         allowed_schemes=["bolt", "bolt+s", "neo4j", "neo4j+s"],
         default_host="localhost",
         default_port=7687,
-    )] = "bolt://localhost:7687"
+    )] = "bolt://localhost:7687"  # main instance (writes, and reads without replicas)
+    database_read_urls: list[t.Annotated[pdc.Url, pd.UrlConstraints(
+        allowed_schemes=["bolt", "bolt+s", "neo4j", "neo4j+s"],
+        default_port=7687,
+    )]] = []  # read replicas (JSON list), e.g. ["bolt://replica-1:7687", "bolt://replica-2:7687"]
+    database_replica_cooldown: float = 30.0  # seconds a failing replica is skipped (reads go to the others or main)
+    database_pool_size: int = 8  # max connections checked out at once (API threadpool, gradio handlers)
+    database_pool_timeout: float = 30.0  # seconds to wait for a free connection
+    database_pool_health_check_interval: float = 30.0  # idle connections are checked before reuse after this delay
+    database_retry_max_attempts: int = 4  # queries failing with connection or transient errors
+    database_retry_base_delay: float = 0.2  # exponential backoff with jitter (in seconds)
+    database_retry_max_delay: float = 5.0
+    database_breaker_failure_threshold: int = 5  # consecutive connection failures opening the circuit breaker
+    database_breaker_reset_timeout: float = 30.0  # seconds failing fast before trying the database again
+    database_slow_query_threshold: t.Optional[float] = 1.0  # seconds, slower queries are logged (None to disable)
+    database_slow_query_capture_plan: bool = True  # PROFILE (read queries) or EXPLAIN (write queries) of slow queries
+    database_slow_query_log_path: t.Optional[Path] = None  # defaults to media/slow_queries.jsonl
+    database_slow_query_log_rotation: str = "10 MB"
+    database_slow_query_log_retention: int = 5  # rotated files kept
+    database_import_batch_size: int = 5000  # nodes or relationships per query (JSON import, snapshots)
+    database_bulk_load_analytical_mode: bool = True  # restore snapshots in Memgraph IN_MEMORY_ANALYTICAL mode
     # text-search
     text_index_name: str = "modelDocuments"
     memgraph_text_search_disabled: bool = True
@@ -38,6 +58,41 @@ class Settings(pds.BaseSettings):
     # indexing
     redis_dsn: pd.RedisDsn = "redis://localhost:6379/0"
     hf_hub_enable_hf_transfer: bool = False
+    index_listing_page_size: int = 500  # jobs are enqueued page by page while listing models from the hub
+    index_executor: t.Literal["rq", "thread", "process"] = "rq"  # thread and process run without redis nor workers
+    index_executor_max_workers: t.Optional[int] = None  # pool size of the thread and process executors
+    index_split_stages: bool = False  # fetch (I/O-bound) and parse (CPU-bound) stages run on different queues
+    index_fetch_queue: str = "index_fetch"
+    index_parse_queue: str = "index_parse"
+    index_max_in_flight_jobs: t.Optional[int] = None  # defaults to index_in_flight_jobs_per_worker * workers count
+    index_in_flight_jobs_per_worker: int = 4
+    index_job_max_attempts: int = 5  # failed jobs are dead-lettered after max attempts
+    index_job_retry_base_delay: float = 2.0  # exponential backoff (in seconds) for transient failures
+    index_job_retry_max_delay: float = 120.0
+    index_memory_profile: bool = False  # tracemalloc reports of the coordinator checkpoints and of each job
+    index_memory_checkpoint_every: int = 1000  # coordinator checkpoint every N indexed models
+    index_negative_cache_ttl: t.Optional[float] = 60 * 60 * 24 * 7  # missing/private/invalid models skipped (seconds)
+    index_negative_cache_path: t.Optional[Path] = None  # defaults to media/negative_cache.sqlite3
+    index_author_listing_cache_ttl: int = 60 * 60 * 6  # listings of authors of gated models (seconds), reset by runs
+    index_skip_unchanged: bool = True  # reuse the data extracted from a repo if its commit SHA did not change
+    index_extraction_cache_path: t.Optional[Path] = None  # defaults to media/extraction_cache.sqlite3
+    index_worker_db_writes: bool = False  # workers upsert nodes and relationships directly into the database
+    index_db_write_batch_size: int = 100
+    # refresh (change feed)
+    refresh_interval: float = 300.0  # seconds between polls of the change feed
+    refresh_feed_sort: t.Literal["createdAt", "lastModified"] = "lastModified"
+    refresh_initial_lookback_hours: float = 24.0  # changes fetched on the first run (no high-water mark yet)
+    refresh_lineage_queue: str = "refresh"  # lineage refreshes requested from the API
+    refresh_lineage_executor: t.Literal["rq", "thread", "process"] = "thread"  # runs inside the refresh job
+    # workers
+    worker_max_jobs: t.Optional[int] = None  # pool workers are recycled after max jobs
+    worker_max_memory_mb: t.Optional[int] = None  # or above the memory threshold
+    worker_pool_scale_interval: float = 10.0  # seconds between autoscaling checks
+    worker_pool_target_drain_time: float = 60.0  # workers are added to drain the queue in this time (in seconds)
+    worker_pool_scale_down_cooldown: float = 60.0  # seconds between removing idle workers
     # logging
     logging_level: t.Literal['TRACE', 'DEBUG', 'INFO', 'SUCCESS', 'WARNING', 'ERROR', 'CRITICAL'] = "DEBUG"
     rq_logging_level: t.Optional[t.Literal['TRACE', 'DEBUG', 'INFO', 'SUCCESS', 'WARNING', 'ERROR', 'CRITICAL']] = None
+    logging_json_path: t.Optional[Path] = None  # additional JSON lines sink
+    logging_sample_every: int = 1  # hot paths log 1 out of N messages per call site
+    logging_throttle_interval: float = 0.0  # throttled hot paths log at most once per interval (in seconds)
@@ -0,0 +1,92 @@
+import typing as t
+import re
+import threading
+import datetime as dt
+from pathlib import Path
+from loguru import logger
+
+# clauses of queries changing the graph, PROFILE would run them twice (EXPLAIN is used instead)
+WRITE_CLAUSES_PATTERN = re.compile(r"\b(CREATE|MERGE|SET|DELETE|REMOVE|DROP|CALL\s+refactor\.)", flags=re.IGNORECASE)
+LITERALS_PATTERN = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|\b\d+(?:\.\d+)?\b")
+
+
+def get_query_shape(query: str) -> str:
+    """Query text with literals replaced by `?` and normalized whitespaces (same shape for all values)."""
+    return " ".join(LITERALS_PATTERN.sub("?", query).split())
+
+
+def truncated(value: t.Any, max_length: int = 300) -> str:
+    text = repr(value)
+    return text if len(text) <= max_length else f"{text[:max_length - 3]}..."
+
+
+class SlowQueryLog:
+    """Log queries slower than threshold (text, parameters, rows count and plan) to a rotating JSON lines file,
+    and aggregate them by query shape.
+    """
+
+    def __init__(self):
+        self.threshold: t.Optional[float] = None  # disabled until configured
+        self.capture_plan = True
+        self.shapes: dict[str, dict] = {}  # shape -> count, total_time, max_time, last_at
+        self._sink_id: t.Optional[int] = None
+        self._lock = threading.Lock()
+
+    def configure(
+            self,
+            threshold: t.Optional[float],
+            path: Path,
+            capture_plan: bool = True,
+            rotation: str = "10 MB",
+            retention: int = 5,
+    ) -> None:
+        self.threshold = threshold
+        self.capture_plan = capture_plan
+        if self._sink_id is not None:
+            logger.remove(self._sink_id)
+            self._sink_id = None
+        if threshold is not None:
+            self._sink_id = logger.add(path, level="WARNING", filter=lambda r: r["extra"].get("slow_query", False),
+                                       rotation=rotation, retention=retention, serialize=True, enqueue=True,
+                                       delay=True)  # created on the first slow query
+
+    @staticmethod
+    def get_plan(db, query: str, parameters: dict) -> list[str]:
+        """PROFILE of a read query (executed again) or EXPLAIN of a write query, empty if it fails."""
+        prefix = "EXPLAIN" if WRITE_CLAUSES_PATTERN.search(query) else "PROFILE"
+        try:
+            rows = list(db.execute_and_fetch(f"{prefix} {query}", parameters))
+        except Exception as e:
+            logger.debug(f"{prefix} of slow query failed: {e!r}")
+            return []
+        return [f"{prefix}:"] + [" | ".join(str(value) for value in row.values()) for row in rows]
+
+    def record(self, db, query: str, parameters: t.Optional[dict], duration: float, rows_count: int) -> None:
+        if self.threshold is None or duration < self.threshold:
+            return
+        shape = get_query_shape(query)
+        with self._lock:
+            stats = self.shapes.setdefault(shape, {"count": 0, "total_time": 0.0, "max_time": 0.0})
+            stats["count"] += 1
+            stats["total_time"] += duration
+            stats["max_time"] = max(stats["max_time"], duration)
+            stats["last_at"] = dt.datetime.utcnow().isoformat()
+        plan = self.get_plan(db, query, parameters or {}) if self.capture_plan else []
+        logger.bind(slow_query=True, query=query.strip(), shape=shape, parameters=truncated(parameters),
+                    duration=round(duration, 4), rows_count=rows_count, plan=plan).warning(
+            f"Slow query ({duration:.2f}s, {rows_count} rows): {truncated(query.strip())}")
+
+    def stats(self, top_n: int = 10) -> list[dict]:
+        """Slowest query shapes by total time."""
+        with self._lock:
+            shapes = sorted(self.shapes.items(), key=lambda item: item[1]["total_time"], reverse=True)[:top_n]
+            return [{
+                "shape": shape,
+                **stats,
+                "total_time": round(stats["total_time"], 4),
+                "mean_time": round(stats["total_time"] / stats["count"], 4),
+                "max_time": round(stats["max_time"], 4),
+            } for shape, stats in shapes]
+
+
+slow_query_log = SlowQueryLog()  # shared by all connections of the process (configured by DatabaseConnection)
@@ -1,13 +1,15 @@
 import typing as t
+import functools as fts
 import gqlalchemy as gq
 # noinspection PyProtectedMember
 from gqlalchemy.connection import _convert_memgraph_value
+from gqlalchemy.utilities import CypherVariable
 from gqlalchemy.query_builders.memgraph_query_builder import Operator
 from gqlalchemy.query_builders.memgraph_query_builder import Order
-from mergeui.core.db import DatabaseConnection, execute_query
+from mergeui.core.db import DatabaseConnection, execute_template, param_refs
 from mergeui.core.base import BaseRepository
 from mergeui.core.schema import Graph
-from mergeui.utils import filter_none, escaped
+from mergeui.utils import filter_none
 
 
 def _results_as_graph(results) -> Graph:
@@ -33,20 +35,24 @@ class GraphRepository(BaseRepository):
             sort_by: t.Optional[t.Literal['count']] = None,
     ) -> list[str]:
         """Get all possible values for a property including None"""
-        q = (
-            gq.match(connection=self.db_conn.db)
-            .node(labels=label, variable="n", **filter_none(escaped(filters) or {}))
-        )
-        if exclude_none:
-            q = q.add_custom_cypher(f"WHERE n.{key} IS NOT NULL")
-        q = (
-            q.with_(
-                f"n.{key} as v{', count(*) as count' if sort_by == 'count' else ''}"
+        refs, params = param_refs(filters, prefix="f_")
+
+        def build() -> str:
+            q = gq.match().node(labels=label, variable="n", **refs)
+            if exclude_none:
+                q = q.add_custom_cypher(f"WHERE n.{key} IS NOT NULL")
+            q = (
+                q.with_(
+                    f"n.{key} as v{', count(*) as count' if sort_by == 'count' else ''}"
+                )
+                .return_(f"DISTINCT v")
+                .order_by(properties=([("count", Order.DESC)] if sort_by == 'count' else []) + [("v", Order.ASC)])
             )
-            .return_(f"DISTINCT v")
-            .order_by(properties=([("count", Order.DESC)] if sort_by == 'count' else []) + [("v", Order.ASC)])
-        )
-        return list(map(lambda x: x.get("v"), execute_query(q) or []))
+            return q.construct_query()
+
+        query = self.db_conn.templates.get(
+            "list_property_values", (key, label, exclude_none, sort_by, tuple(refs)), build)
+        return self.db_conn.read(lambda db: list(map(lambda x: x.get("v"), execute_template(db, query, params))))
 
     def list_nodes(
             self,
@@ -56,14 +62,18 @@ class GraphRepository(BaseRepository):
             filters: t.Optional[dict[str, t.Any]] = None,
     ) -> list[gq.Node]:
         """Get all nodes with a specific label"""
-        q = (
-            gq.match(connection=self.db_conn.db)
-            .node(labels=label, variable="n", **filter_none(escaped(filters) or {}))
-            .return_("DISTINCT n")
-        )
+        refs, params = param_refs(filters, prefix="f_")
+
+        def build() -> str:
+            q = gq.match().node(labels=label, variable="n", **refs).return_("DISTINCT n")
+            if limit is not None:
+                q = q.limit("$limit")
+            return q.construct_query()
+
+        query = self.db_conn.templates.get("list_nodes", (label, limit is not None, tuple(refs)), build)
         if limit is not None:
-            q = q.limit(limit)
-        result = list(map(lambda x: x.get("n"), execute_query(q) or []))
+            params["limit"] = limit
+        result = self.db_conn.read(lambda db: list(map(lambda x: x.get("n"), execute_template(db, query, params))))
         return t.cast(list[gq.Node], result)
 
     def get_sub_graph(
@@ -78,42 +88,55 @@ class GraphRepository(BaseRepository):
         """Get a sub-graph from a starting node (use this if we want to include siblings)"""
         if not start_id:
             return Graph()
-        start_id = escaped(start_id)
         rel_var = ""
         if relationship_type:
             rel_var = f"{rel_var}:{relationship_type}"
         rel_var = f"{rel_var}*"
         if max_hops is not None:
             rel_var = f"{rel_var}..{max_hops}"
-        # get nodes
-        q = (
-            gq.match(connection=self.db_conn.db)
-            .node(label, variable="n", id=start_id)
-            .to(variable=rel_var, directed=directed)
-            .node(label, variable="m")
-            .with_("COLLECT(n)+COLLECT(m) AS all_nodes")
-            .unwind("all_nodes", variable="node")
-            .with_("COLLECT(DISTINCT node) AS distinct_nodes")
-        )
-        # get relationships
-        q = (
-            q.match()
-            .node(label, variable="a")
-            .to(relationship_type=relationship_type, variable="rel")
-            .node(label, variable="b")
-            .add_custom_cypher("WHERE a IN distinct_nodes AND b IN distinct_nodes")
-            .with_("COLLECT(DISTINCT rel) AS distinct_rels, distinct_nodes")
-            .return_("distinct_nodes AS nodes, distinct_rels as relationships")
-        )
-        gr = _results_as_graph(execute_query(q))
-        if not gr.nodes:  # handle isolated node or empty graph
+        start_id_ref = CypherVariable("$start_id")
+
+        def build() -> str:
+            # get nodes
+            q = (
+                gq.match()
+                .node(label, variable="n", id=start_id_ref)
+                .to(variable=rel_var, directed=directed)
+                .node(label, variable="m")
+                .with_("COLLECT(n)+COLLECT(m) AS all_nodes")
+                .unwind("all_nodes", variable="node")
+                .with_("COLLECT(DISTINCT node) AS distinct_nodes")
+            )
+            # get relationships
             q = (
-                gq.match(connection=self.db_conn.db)
-                .node(label, variable="n", id=start_id)
-                .return_("COLLECT(DISTINCT n) AS nodes, [] AS relationships")
+                q.match()
+                .node(label, variable="a")
+                .to(relationship_type=relationship_type, variable="rel")
+                .node(label, variable="b")
+                .add_custom_cypher("WHERE a IN distinct_nodes AND b IN distinct_nodes")
+                .with_("COLLECT(DISTINCT rel) AS distinct_rels, distinct_nodes")
+                .return_("distinct_nodes AS nodes, distinct_rels as relationships")
             )
-            gr = _results_as_graph(execute_query(q))
-        return gr
+            return q.construct_query()
+
+        query = self.db_conn.templates.get("get_sub_graph", (label, relationship_type, directed, max_hops), build)
+
+        def read(db) -> Graph:
+            gr = _results_as_graph(execute_template(db, query, {"start_id": start_id}))
+            if not gr.nodes:  # handle isolated node or empty graph
+                gr = self._get_isolated_node(db, label=label, start_id=start_id)
+            return gr
+
+        return self.db_conn.read(read)
+
+    def _get_isolated_node(self, db, *, label: str, start_id: str) -> Graph:
+        query = self.db_conn.templates.get("get_isolated_node", label, lambda: (
+            gq.match()
+            .node(label, variable="n", id=CypherVariable("$start_id"))
+            .return_("COLLECT(DISTINCT n) AS nodes, [] AS relationships")
+            .construct_query()
+        ))
+        return _results_as_graph(execute_template(db, query, {"start_id": start_id}))
 
     def set_properties(
             self,
@@ -125,25 +148,24 @@ class GraphRepository(BaseRepository):
             new_labels: t.Union[t.List[str], str] = "",
     ) -> None:
         """Set properties on matching nodes, create node it if it doesn't exist when create=True"""
-        q = (
-            getattr(gq, "merge" if create else "match")(connection=self.db_conn.db)
-            .node(
-                labels=label,
-                variable="n",
-                **filter_none(escaped(filters) or {}),
-            )
-        )
-        if new_values:
-            q = q.set_(
-                item="n",
-                operator=Operator.INCREMENT,
-                literal=filter_none(escaped(new_values)),
-            )
-        if new_labels:
-            new_labels = [new_labels] if isinstance(new_labels, str) else new_labels
-            q = q.add_custom_cypher(f"SET n:{':'.join(new_labels)}")
-        if new_values or new_labels:
-            execute_query(q)
+        new_values = filter_none(new_values or {})
+        new_labels = [new_labels] if isinstance(new_labels, str) and new_labels else (new_labels or [])
+        if not new_values and not new_labels:
+            return
+        refs, params = param_refs(filters, prefix="f_")
+
+        def build() -> str:
+            q = getattr(gq, "merge" if create else "match")().node(labels=label, variable="n", **refs)
+            if new_values:
+                q = q.set_(item="n", operator=Operator.INCREMENT, expression="$new_values")
+            if new_labels:
+                q = q.add_custom_cypher(f" SET n:{':'.join(new_labels)}")
+            return q.construct_query()
+
+        query = self.db_conn.templates.get(
+            "set_properties", (label, create, bool(new_values), tuple(new_labels), tuple(refs)), build)
+        with self.db_conn.acquire() as db:
+            execute_template(db, query, {**params, "new_values": new_values})
 
     def remove_properties(
             self,
@@ -153,17 +175,37 @@ class GraphRepository(BaseRepository):
             keys: t.Iterable[str],
     ) -> None:
         """Remove a list of properties from a node"""
+        keys = tuple(sorted(keys))
         if keys:
-            q = (
-                gq.match(connection=self.db_conn.db)
-                .node(
-                    labels=label,
-                    variable="n",
-                    **filter_none(escaped(filters) or {}),
-                )
+            refs, params = param_refs(filters, prefix="f_")
+            query = self.db_conn.templates.get("remove_properties", (label, keys, tuple(refs)), lambda: (
+                gq.match()
+                .node(labels=label, variable="n", **refs)
                 .remove([f"n.{key}" for key in keys])
-            )
-            execute_query(q)
+                .construct_query()
+            ))
+            with self.db_conn.acquire() as db:
+                execute_template(db, query, params)
+
+    def remove_labels(
+            self,
+            *,
+            label: str = "",
+            filters: t.Optional[dict[str, t.Any]] = None,
+            labels: t.Iterable[str],
+    ) -> None:
+        """Remove a list of labels from a node"""
+        labels = tuple(sorted(labels))
+        if labels:
+            refs, params = param_refs(filters, prefix="f_")
+            query = self.db_conn.templates.get("remove_labels", (label, labels, tuple(refs)), lambda: (
+                gq.match()
+                .node(labels=label, variable="n", **refs)
+                .remove([f"n:{':'.join(labels)}"])
+                .construct_query()
+            ))
+            with self.db_conn.acquire() as db:
+                execute_template(db, query, params)
 
     def merge_nodes(
             self,
@@ -183,67 +225,77 @@ class GraphRepository(BaseRepository):
         - add src id and src.alt_ids to dst.alt_ids
         - then remove src
         """
-        src_id = escaped(src_id)
-        dst_id = escaped(dst_id)
-        # check if dst node exists
-        q = (
-            gq.match(connection=self.db_conn.db)
-            .node(label, variable="n", id=dst_id)
-            .return_("n")
-        )
-        results = execute_query(q)
-        if not results:  # dst node doesn't exist, just update src.id if it exists else do nothing
-            return self.set_properties(
-                label=label,
-                filters=dict(id=src_id),
-                new_values={"id": dst_id, "alt_ids": [src_id]},
-                create=False,
-            )
-        # move all incoming relationships of src to dst
-        q = (
-            gq.match(connection=self.db_conn.db)
-            .node(label)
-            .to(variable="rel", directed=True)
-            .node(label, id=src_id)
-            .match()
-            .node(label, variable="dst", id=dst_id)
-            .call("refactor.to", "rel, dst")
-            .yield_("relationship")
-            .return_("relationship")
-        )
-        execute_query(q)
-        # move all outgoing relationships of src to dst
-        q = (
-            gq.match(connection=self.db_conn.db)
-            .node(label, id=src_id)
-            .to(variable="rel", directed=True)
-            .node(label)
-            .match()
-            .node(label, variable="dst", id=dst_id)
-            .call("refactor.from", "rel, dst")
-            .yield_("relationship")
-            .return_("relationship")
-        )
-        execute_query(q)
-        # copy src.alt_ids to dst.alt_ids and add src.id to dst.alt_ids
-        # merge properties of src into dst if they don't exist in dst
-        # then remove src node
-        q = (
-            gq.match(connection=self.db_conn.db)
-            .node(labels=label, id=src_id, variable="src")
-            .match()
-            .node(labels=label, id=dst_id, variable="dst")
-            .set_("dst.alt_ids", Operator.ASSIGNMENT,
-                  expression=f"coalesce(dst.alt_ids, []) + coalesce(src.alt_ids, []) + '{src_id}'")
-            .set_("src", Operator.INCREMENT, expression="dst")
-        )
-        if exclude_properties:
-            q = q.remove([f"src.{key}" for key in exclude_properties])
-        q = (
-            q.set_("dst", Operator.ASSIGNMENT, expression="src")
-            .delete(variable_expressions="src")
-        )
-        execute_query(q)
+        src_ref, dst_ref = CypherVariable("$src_id"), CypherVariable("$dst_id")
+        exclude_properties = tuple(exclude_properties or [])
+        params = {"src_id": src_id, "dst_id": dst_id}
+        with self.db_conn.acquire() as db:
+            # check if dst node exists
+            query = self.db_conn.templates.get("merge_nodes.exists", label, lambda: (
+                gq.match()
+                .node(label, variable="n", id=dst_ref)
+                .return_("n")
+                .construct_query()
+            ))
+            results = execute_template(db, query, {"dst_id": dst_id})
+            if not results:  # dst node doesn't exist, just update src.id if it exists else do nothing
+                return self.set_properties(
+                    label=label,
+                    filters=dict(id=src_id),
+                    new_values={"id": dst_id, "alt_ids": [src_id]},
+                    create=False,
+                )
+            # move all incoming relationships of src to dst
+            query = self.db_conn.templates.get("merge_nodes.incoming", label, lambda: (
+                gq.match()
+                .node(label)
+                .to(variable="rel", directed=True)
+                .node(label, id=src_ref)
+                .match()
+                .node(label, variable="dst", id=dst_ref)
+                .call("refactor.to", "rel, dst")
+                .yield_("relationship")
+                .return_("relationship")
+                .construct_query()
+            ))
+            execute_template(db, query, params)
+            # move all outgoing relationships of src to dst
+            query = self.db_conn.templates.get("merge_nodes.outgoing", label, lambda: (
+                gq.match()
+                .node(label, id=src_ref)
+                .to(variable="rel", directed=True)
+                .node(label)
+                .match()
+                .node(label, variable="dst", id=dst_ref)
+                .call("refactor.from", "rel, dst")
+                .yield_("relationship")
+                .return_("relationship")
+                .construct_query()
+            ))
+            execute_template(db, query, params)
+
+            # copy src.alt_ids to dst.alt_ids and add src.id to dst.alt_ids
+            # merge properties of src into dst if they don't exist in dst
+            # then remove src node
+            def build() -> str:
+                q = (
+                    gq.match()
+                    .node(labels=label, id=src_ref, variable="src")
+                    .match()
+                    .node(labels=label, id=dst_ref, variable="dst")
+                    .set_("dst.alt_ids", Operator.ASSIGNMENT,
+                          expression="coalesce(dst.alt_ids, []) + coalesce(src.alt_ids, []) + $src_id")
+                    .set_("src", Operator.INCREMENT, expression="dst")
+                )
+                if exclude_properties:
+                    q = q.remove([f"src.{key}" for key in exclude_properties])
+                q = (
+                    q.set_("dst", Operator.ASSIGNMENT, expression="src")
+                    .delete(variable_expressions="src")
+                )
+                return q.construct_query()
+
+            query = self.db_conn.templates.get("merge_nodes.merge", (label, exclude_properties), build)
+            execute_template(db, query, params)
 
     def create_or_update(
             self,
@@ -257,28 +309,23 @@ class GraphRepository(BaseRepository):
         - if exists, properties += {update_values}
         - else, create node with properties = {filters & create_values}
         """
-        q = (
-            gq.merge(connection=self.db_conn.db)
-            .node(
-                label,
-                variable="n",
-                **filter_none(escaped(filters) or {}),
-            )
-            .add_custom_cypher("ON CREATE")
-            .set_(
-                item="n",
-                operator=Operator.INCREMENT,
-                literal=filter_none(escaped(create_values)),
-            )
-            .add_custom_cypher("ON MATCH")
-            .set_(
-                item="n",
-                operator=Operator.INCREMENT,
-                literal=filter_none(escaped(update_values)),
-            )
+        refs, params = param_refs(filters, prefix="f_")
+        query = self.db_conn.templates.get("create_or_update", (label, tuple(refs)), lambda: (
+            gq.merge()
+            .node(label, variable="n", **refs)
+            .add_custom_cypher(" ON CREATE")
+            .set_(item="n", operator=Operator.INCREMENT, expression="$create_values")
+            .add_custom_cypher(" ON MATCH")
+            .set_(item="n", operator=Operator.INCREMENT, expression="$update_values")
             .return_("n")
-        )
-        execute_query(q)
+            .construct_query()
+        ))
+        with self.db_conn.acquire() as db:
+            execute_template(db, query, {
+                **params,
+                "create_values": filter_none(create_values),
+                "update_values": filter_none(update_values),
+            })
 
     def create_relationship(
             self,
@@ -289,21 +336,140 @@ class GraphRepository(BaseRepository):
             relationship_type: str = "",
             properties: t.Optional[dict[str, t.Any]] = None,
     ) -> None:
-        from_id = escaped(from_id)
-        to_id = escaped(to_id)
-        q = (
-            gq.match(connection=self.db_conn.db)
-            .node(label, variable="src", id=from_id)
+        query = self.db_conn.templates.get("create_relationship", (label, relationship_type), lambda: (
+            gq.match()
+            .node(label, variable="src", id=CypherVariable("$from_id"))
             .match()
-            .node(label, variable="dst", id=to_id)
+            .node(label, variable="dst", id=CypherVariable("$to_id"))
             .create()
             .node(variable="src")
             .to(relationship_type, True, variable="rel")
             .node(variable="dst")
-            .set_("rel", Operator.INCREMENT, literal=filter_none(escaped(properties)))
+            .set_("rel", Operator.INCREMENT, expression="$properties")
             .return_("rel")
-        )
-        execute_query(q)
+            .construct_query()
+        ))
+        with self.db_conn.acquire() as db:
+            execute_template(db, query, {
+                "from_id": from_id,
+                "to_id": to_id,
+                "properties": filter_none(properties or {}),
+            })
+
+    def upsert_nodes(
+            self,
+            *,
+            label: str = "",
+            nodes: t.List[dict[str, t.Any]],
+            replace: bool = False,
+    ) -> None:
+        """Create or update nodes by id in batch (one query per set of labels)
+        - properties += {node} (except id and labels)
+        - replace=True: properties = {node} (alt_ids of merged nodes are kept)
+        - labels += node["labels"]
+        """
+        batches: dict[tuple[str, ...], list[dict]] = {}
+        for node in nodes:
+            new_labels = tuple(sorted(set(node.get("labels") or []) - {label}))
+            batches.setdefault(new_labels, []).append({
+                "id": node["id"],
+                "properties": filter_none({k: v for k, v in node.items() if k not in {"id", "labels"}}),
+            })
+
+        def build(new_labels: tuple[str, ...]) -> str:
+            q = (
+                gq.unwind(list_expression="$rows", variable="row")
+                .merge()
+                .node(label, variable="n", id=CypherVariable("row.id"))
+            )
+            if replace:
+                q = q.add_custom_cypher(" WITH row, n, n.alt_ids AS alt_ids"
+                                        " SET n = row.properties, n.id = row.id, n.alt_ids = alt_ids")
+            else:
+                q = q.set_(item="n", operator=Operator.INCREMENT, expression="row.properties")
+            if new_labels:
+                q = q.add_custom_cypher(f" SET n:{':'.join(new_labels)}")
+            return q.construct_query()
+
+        with self.db_conn.acquire() as db:
+            for new_labels, rows in batches.items():
+                query = self.db_conn.templates.get("upsert_nodes", (label, replace, new_labels),
+                                                   fts.partial(build, new_labels))
+                execute_template(db, query, {"rows": rows})
+
+    def create_relationships(
+            self,
+            *,
+            label: str = "",
+            relationship_type: str,
+            relationships: t.List[dict[str, t.Any]],
+            merge_keys: t.Optional[t.List[str]] = None,
+            create_missing_nodes: bool = False,
+    ) -> None:
+        """Create relationships from source id to target id in batch (other keys are relationship properties)
+        - merge_keys: properties identifying a relationship between two nodes (avoid duplicates if set), null keys
+          are left out of the MERGE pattern (one query per set of non-null keys)
+        - create_missing_nodes=True: create the source/target nodes (with only an id) if they don't exist yet
+        """
+        if not relationships:
+            return
+        merge_keys = merge_keys or []
+        batches: dict[tuple[str, ...], list[dict]] = {}
+        for rel in relationships:
+            keys = tuple(key for key in merge_keys if rel.get(key) is not None)
+            batches.setdefault(keys, []).append({
+                "source": rel["source"],
+                "target": rel["target"],
+                **{key: rel[key] for key in keys},
+                "properties": filter_none({k: v for k, v in rel.items() if k not in {"source", "target", "type"}}),
+            })
+
+        def build(keys: tuple[str, ...]) -> str:
+            q = gq.unwind(list_expression="$rows", variable="row")
+            q = (
+                (q.merge() if create_missing_nodes else q.match())
+                .node(label, variable="src", id=CypherVariable("row.source"))
+            )
+            q = (
+                (q.merge() if create_missing_nodes else q.match())
+                .node(label, variable="dst", id=CypherVariable("row.target"))
+            )
+            q = (
+                (q.merge() if merge_keys else q.create())
+                .node(variable="src")
+                .to(relationship_type, True, variable="rel", **{key: CypherVariable(f"row.{key}") for key in keys})
+                .node(variable="dst")
+                .set_("rel", Operator.INCREMENT, expression="row.properties")
+            )
+            return q.construct_query()
+
+        with self.db_conn.acquire() as db:
+            for keys, rows in batches.items():
+                options = (label, relationship_type, bool(merge_keys), keys, create_missing_nodes)
+                query = self.db_conn.templates.get("create_relationships", options, fts.partial(build, keys))
+                execute_template(db, query, {"rows": rows})
+
+    def delete_relationships(
+            self,
+            *,
+            label: str = "",
+            relationship_type: str,
+            source_ids: t.List[str],
+    ) -> None:
+        """Delete the outgoing relationships of a type of nodes by id in batch (the nodes are kept)"""
+        if not source_ids:
+            return
+        query = self.db_conn.templates.get("delete_relationships", (label, relationship_type), lambda: (
+            gq.unwind(list_expression="$source_ids", variable="source_id")
+            .match()
+            .node(label, variable="src", id=CypherVariable("source_id"))
+            .to(relationship_type, True, variable="rel")
+            .node()
+            .delete(variable_expressions="rel")
+            .construct_query()
+        ))
+        with self.db_conn.acquire() as db:
+            execute_template(db, query, {"source_ids": source_ids})
 
     def count_nodes(
             self,
@@ -311,12 +477,14 @@ class GraphRepository(BaseRepository):
             label: str = "",
             filters: t.Optional[dict[str, t.Any]] = None,
     ) -> int:
-        q = (
-            gq.match(connection=self.db_conn.db)
-            .node(label, variable="n", **filter_none(escaped(filters) or {}))
+        refs, params = param_refs(filters, prefix="f_")
+        query = self.db_conn.templates.get("count_nodes", (label, tuple(refs)), lambda: (
+            gq.match()
+            .node(label, variable="n", **refs)
             .return_("COUNT(DISTINCT n) as count")
-        )
-        results = execute_query(q)
+            .construct_query()
+        ))
+        results = self.db_conn.read(lambda db: execute_template(db, query, params))
         if results:
             return results[0].get("count", 0)
         return 0
@@ -333,44 +501,65 @@ class GraphRepository(BaseRepository):
         """Get a Sub-Tree from a starting node (use this if we don't want to include siblings)"""
         if not start_id:
             return Graph()
-        start_id = escaped(start_id)
         rel_var = ""
         if relationship_type:
             rel_var = f"{rel_var}:{relationship_type}"
         rel_var = f"{rel_var}*"
         if max_hops is not None:
             rel_var = f"{rel_var}..{max_hops}"
-        q = (  # outgoing relationships
-            gq.match(optional=True, connection=self.db_conn.db)
-            .add_custom_cypher("path = ")
-            .node(label, id=start_id)
-            .to(variable=rel_var, directed=True)
-            .node(label)
-            .with_("coalesce(nodes(path),[]) as all_nodes, coalesce(relationships(path),[]) as all_rels")
-        )
-        if not directed:  # incoming relationships
-            q = (
-                q.match(optional=True)
-                .add_custom_cypher("path_inv = ")
-                .node(label)
+        start_id_ref = CypherVariable("$start_id")
+
+        def build() -> str:
+            q = (  # outgoing relationships
+                gq.match(optional=True)
+                .add_custom_cypher("path = ")
+                .node(label, id=start_id_ref)
                 .to(variable=rel_var, directed=True)
-                .node(label, id=start_id)
-                .with_(
-                    "(all_nodes + coalesce(nodes(path_inv),[])) as all_nodes, "
-                    "(all_rels + coalesce(relationships(path_inv),[])) as all_rels")
+                .node(label)
+                .with_("coalesce(nodes(path),[]) as all_nodes, coalesce(relationships(path),[]) as all_rels")
             )
-        q = (
-            q.unwind("all_nodes", variable="node")
-            .unwind("all_rels", variable="rel")
-            .with_("COLLECT(DISTINCT node) as distinct_nodes, COLLECT(DISTINCT rel) as distinct_rels")
-            .return_("distinct_nodes as nodes, distinct_rels as relationships")
-        )
-        gr = _results_as_graph(execute_query(q))
-        if not gr.nodes:  # handle isolated node or empty graph
+            if not directed:  # incoming relationships
+                q = (
+                    q.match(optional=True)
+                    .add_custom_cypher("path_inv = ")
+                    .node(label)
+                    .to(variable=rel_var, directed=True)
+                    .node(label, id=start_id_ref)
+                    .with_(
+                        "(all_nodes + coalesce(nodes(path_inv),[])) as all_nodes, "
+                        "(all_rels + coalesce(relationships(path_inv),[])) as all_rels")
+                )
             q = (
-                gq.match(connection=self.db_conn.db)
-                .node(label, variable="n", id=start_id)
-                .return_("COLLECT(DISTINCT n) AS nodes, [] AS relationships")
+                q.unwind("all_nodes", variable="node")
+                .unwind("all_rels", variable="rel")
+                .with_("COLLECT(DISTINCT node) as distinct_nodes, COLLECT(DISTINCT rel) as distinct_rels")
+                .return_("distinct_nodes as nodes, distinct_rels as relationships")
             )
-            gr = _results_as_graph(execute_query(q))
-        return gr
+            return q.construct_query()
+
+        query = self.db_conn.templates.get("get_sub_tree", (label, relationship_type, directed, max_hops), build)
+
+        def read(db) -> Graph:
+            gr = _results_as_graph(execute_template(db, query, {"start_id": start_id}))
+            if not gr.nodes:  # handle isolated node or empty graph
+                gr = self._get_isolated_node(db, label=label, start_id=start_id)
+            return gr
+
+        return self.db_conn.read(read)
+
+    # async variants of the read methods (used by async endpoints)
+
+    async def list_property_values_async(self, **kwargs) -> list[str]:
+        return await self.db_conn.run_async(self.list_property_values, **kwargs)
+
+    async def list_nodes_async(self, **kwargs) -> list[gq.Node]:
+        return await self.db_conn.run_async(self.list_nodes, **kwargs)
+
+    async def get_sub_graph_async(self, **kwargs) -> Graph:
+        return await self.db_conn.run_async(self.get_sub_graph, **kwargs)
+
+    async def count_nodes_async(self, **kwargs) -> int:
+        return await self.db_conn.run_async(self.count_nodes, **kwargs)
+
+    async def get_sub_tree_async(self, **kwargs) -> Graph:
+        return await self.db_conn.run_async(self.get_sub_tree, **kwargs)
@@ -3,15 +3,15 @@ import shutil
 import re
 import gqlalchemy as gq
 from loguru import logger
+from gqlalchemy.utilities import CypherVariable
 from gqlalchemy.query_builders.memgraph_query_builder import Operator
 from gqlalchemy.query_builders.memgraph_query_builder import Order
 import whoosh.fields as whf
 import whoosh.qparser as whq
 import whoosh.index as whi
-from mergeui.core.db import DatabaseConnection, execute_query
+from mergeui.core.db import DatabaseConnection, execute_template, param_refs
 from mergeui.core.base import BaseRepository
 from mergeui.core.schema import Model
-from mergeui.utils import escaped, filter_none
 
 
 def _get_where_clause(q, where_initiated: bool):
@@ -49,55 +49,109 @@ class ModelRepository(BaseRepository):
             limit: t.Optional[int] = None,
             filters: t.Optional[dict[str, t.Any]] = None,
     ) -> list[Model]:
-        """Get all models with optional filters"""
-        base_model = escaped(base_model)
-        where_initiated = False
-        q = gq.match(connection=self.db_conn.db)
-        # label and filters
-        q = q.node(label, variable="n", **filter_none(escaped(filters) or {}))
-        # base_model
-        if base_model is not None:
-            q = (q.to("DERIVED_FROM", variable="r")
-                 .node("Model", variable="m", id=base_model))
-        # not_label
-        if not_label is not None:
-            q = q.where_not("n", Operator.LABEL_FILTER, expression=not_label)
-            where_initiated = True
-        # exclude null on sort_key
-        if sort_exclude_null_on_key and sort_key is not None:
-            q = q.add_custom_cypher(f"{'AND' if where_initiated else 'WHERE'} n.{sort_key} IS NOT NULL")
-            # noinspection PyUnusedLocal
-            where_initiated = True
-        # search query
+        """Get all models with optional filters
+        In ascending order, models without the sort key come last (as in Cypher): the sorted models are read by an
+        index scan of the sort key, then the remaining rows (if any) are filled with models without it.
+        """
+        # search query (whoosh)
         hits: t.Optional[set[str]] = None
-        if query is not None and query.strip() != "":
-            if not self.settings.memgraph_text_search_disabled:
-                # https://quickwit.io/docs/reference/query-language#escaping-special-characters
-                query = escaped(re.sub(r"[^-\w]+", "?", query))
+        if query is not None and query.strip() != "" and self.settings.memgraph_text_search_disabled:
+            hits = self._search_models(query, limit=limit)
+        nulls_last = sort_key is not None and not sort_exclude_null_on_key and (sort_order or Order.ASC) == Order.ASC
+        kwargs = dict(query=query, label=label, not_label=not_label, base_model=base_model, filters=filters)
+        cypher, params = self.get_list_models_query(
+            **kwargs, sort_key=sort_key, sort_order=sort_order,
+            sort_exclude_null_on_key=sort_exclude_null_on_key or nulls_last, limit=limit)
+
+        def read(db) -> list:
+            rows = list(execute_template(db, cypher, params))
+            if nulls_last and (limit is None or len(rows) < limit):
+                null_cypher, null_params = self.get_list_models_query(
+                    **kwargs, sort_key=sort_key, sort_null_on_key=True,
+                    limit=None if limit is None else limit - len(rows))
+                rows.extend(execute_template(db, null_cypher, null_params))
+            return rows
+
+        result = map(lambda x: x.get("n"), self.db_conn.read(read))
+        # filter whoosh hits
+        if hits is not None:
+            result = filter(lambda m: m.id in hits, result)
+        # return result
+        return t.cast(list[Model], list(result))
+
+    def get_list_models_query(
+            self,
+            *,
+            query: t.Optional[str] = None,
+            label: str = "Model",
+            not_label: t.Optional[str] = None,
+            sort_key: t.Optional[str] = None,
+            sort_order: t.Optional[Order] = None,
+            sort_exclude_null_on_key: bool = False,
+            sort_null_on_key: bool = False,
+            base_model: t.Optional[str] = None,
+            limit: t.Optional[int] = None,
+            filters: t.Optional[dict[str, t.Any]] = None,
+    ) -> tuple[str, dict[str, t.Any]]:
+        """Query template and parameters of list_models (without the whoosh search).
+        Without base model and Memgraph text search, rows are unique so DISTINCT is left out: the nodes having the sort
+        key are scanned by its label-property index and top-K rows are kept by ORDER BY ... LIMIT.
+        - sort_null_on_key=True: only the models without the sort key (unordered)
+        """
+        refs, params = param_refs(filters, prefix="f_")
+        # search query
+        text_search = False
+        if query is not None and query.strip() != "" and not self.settings.memgraph_text_search_disabled:
+            # https://quickwit.io/docs/reference/query-language#escaping-special-characters
+            params.update(index_name=self.settings.text_index_name, search_query=re.sub(r"[^-\w]+", "?", query))
+            text_search = True
+        if base_model is not None:
+            params["base_model"] = base_model
+        if limit is not None:
+            params["limit"] = limit
+
+        def build() -> str:
+            where_initiated = False
+            # label and filters
+            q = gq.match().node(label, variable="n", **refs)
+            # base_model
+            if base_model is not None:
+                q = (q.to("DERIVED_FROM", variable="r")
+                     .node("Model", variable="m", id=CypherVariable("$base_model")))
+            # not_label
+            if not_label is not None:
+                q = q.where_not("n", Operator.LABEL_FILTER, expression=not_label)
+                where_initiated = True
+            # exclude null on sort_key (index scan of the sort key) or keep only null
+            if (sort_exclude_null_on_key or sort_null_on_key) and sort_key is not None:
+                q = q.add_custom_cypher(f" {'AND' if where_initiated else 'WHERE'} n.{sort_key} "
+                                        f"{'IS NULL' if sort_null_on_key else 'IS NOT NULL'}")
+            # search query
+            if text_search:
                 q = (
                     q.with_(
                         "n",
-                    ).call("text_search.search_all", f"'{self.settings.text_index_name}', '{query}'")
+                    ).call("text_search.search_all", "$index_name, $search_query")
                     .yield_("node")
                     .with_("n, node")
                     .where("n", Operator.EQUAL, expression="node")
                 )
-            else:
-                hits = self._search_models(query, limit=limit)
-        q = q.return_(f"DISTINCT n")
-        # sort by
-        if sort_key is not None:
-            q = q.order_by(properties=[(f"n.{sort_key}", sort_order or Order.ASC)])
-        # limit
-        if limit is not None:
-            q = q.limit(limit)
-        result = map(lambda x: x.get("n"), execute_query(q) or [])
-        # filter whoosh hits
-        if hits is not None:
-            result = filter(lambda m: m.id in hits, result)
-        # return result
-        result = list(result)
-        return t.cast(list[Model], result)
+            q = q.return_("DISTINCT n" if base_model is not None or text_search else "n")
+            # sort by
+            if sort_key is not None and not sort_null_on_key:
+                q = q.order_by(properties=[(f"n.{sort_key}", sort_order or Order.ASC)])
+            # limit
+            if limit is not None:
+                q = q.limit("$limit")
+            return q.construct_query()
+
+        options = (label, not_label, sort_key, sort_order, sort_exclude_null_on_key, sort_null_on_key,
+                   base_model is not None, limit is not None, text_search, tuple(refs))
+        return self.db_conn.templates.get("list_models", options, build), params
+
+    async def list_models_async(self, **kwargs) -> list[Model]:
+        """Async variant of list_models"""
+        return await self.db_conn.run_async(self.list_models, **kwargs)
 
     def create_text_search_index(self, reset_if_not_empty: bool = True) -> None:
         """Create text-search index for models in the file system"""
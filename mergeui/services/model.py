@@ -1,7 +1,7 @@
 import typing as t
 from gqlalchemy.query_builders.memgraph_query_builder import Order
 from mergeui.core.base import BaseService
-from mergeui.core.schema import ExcludeOptionType, SortByOptionType, Graph, Model
+from mergeui.core.schema import ExcludeOptionType, SortByOptionType, SORT_BY_KEYS, Graph, Model
 from mergeui.repositories import GraphRepository, ModelRepository
 
 
@@ -10,6 +10,16 @@ class ModelService(BaseService):
         self.gr = graph_repository
         self.mr = model_repository
 
+    @staticmethod
+    def _get_model_lineage_params(model_id: str, directed: bool, max_hops: t.Optional[int]) -> dict:
+        return dict(
+            start_id=model_id,
+            label="Model",
+            relationship_type="DERIVED_FROM",
+            directed=directed,
+            max_hops=max_hops,
+        )
+
     def get_model_lineage(
             self,
             *,
@@ -17,13 +27,16 @@ class ModelService(BaseService):
             directed: bool = False,
             max_hops: t.Optional[int] = None,
     ) -> Graph:
-        return self.gr.get_sub_tree(
-            start_id=model_id,
-            label="Model",
-            relationship_type="DERIVED_FROM",
-            directed=directed,
-            max_hops=max_hops,
-        )
+        return self.gr.get_sub_tree(**self._get_model_lineage_params(model_id, directed, max_hops))
+
+    async def get_model_lineage_async(
+            self,
+            *,
+            model_id: str,
+            directed: bool = False,
+            max_hops: t.Optional[int] = None,
+    ) -> Graph:
+        return await self.gr.get_sub_tree_async(**self._get_model_lineage_params(model_id, directed, max_hops))
 
     def list_models(
             self,
@@ -38,6 +51,57 @@ class ModelService(BaseService):
             base_model: t.Optional[str] = None,
             limit: t.Optional[int] = None,
     ) -> list[Model]:
+        return self.mr.list_models(**self._get_list_models_params(
+            query=query,
+            sort_by=sort_by,
+            excludes=excludes,
+            author=author,
+            license_=license_,
+            merge_method=merge_method,
+            architecture=architecture,
+            base_model=base_model,
+            limit=limit,
+        ))
+
+    async def list_models_async(
+            self,
+            *,
+            query: t.Optional[str] = None,
+            sort_by: t.Optional[SortByOptionType] = None,
+            excludes: t.Optional[t.List[ExcludeOptionType]] = None,
+            author: t.Optional[str] = None,
+            license_: t.Optional[str] = None,
+            merge_method: t.Optional[str] = None,
+            architecture: t.Optional[str] = None,
+            base_model: t.Optional[str] = None,
+            limit: t.Optional[int] = None,
+    ) -> list[Model]:
+        return await self.mr.list_models_async(**self._get_list_models_params(
+            query=query,
+            sort_by=sort_by,
+            excludes=excludes,
+            author=author,
+            license_=license_,
+            merge_method=merge_method,
+            architecture=architecture,
+            base_model=base_model,
+            limit=limit,
+        ))
+
+    @staticmethod
+    def _get_list_models_params(
+            *,
+            query: t.Optional[str] = None,
+            sort_by: t.Optional[SortByOptionType] = None,
+            excludes: t.Optional[t.List[ExcludeOptionType]] = None,
+            author: t.Optional[str] = None,
+            license_: t.Optional[str] = None,
+            merge_method: t.Optional[str] = None,
+            architecture: t.Optional[str] = None,
+            base_model: t.Optional[str] = None,
+            limit: t.Optional[int] = None,
+    ) -> dict:
+        """Parameters of ModelRepository.list_models from the user options"""
         # filters
         filters = {
             "author": author,
@@ -57,26 +121,8 @@ class ModelService(BaseService):
         if "merged models" in excludes:
             not_label = "MergedModel"
         # sort feature
-        sort_by_map = {
-            "default": ("created_at", Order.ASC),
-            "most likes": ("likes", Order.DESC),
-            "most downloads": ("downloads", Order.DESC),
-            "recently created": ("created_at", Order.DESC),
-            "recently updated": ("updated_at", Order.DESC),
-            "average score": ("average_score", Order.DESC),
-            "ARC": ("arc_score", Order.DESC),
-            "HellaSwag": ("hella_swag_score", Order.DESC),
-            "MMLU": ("mmlu_score", Order.DESC),
-            "TruthfulQA": ("truthfulqa_score", Order.DESC),
-            "Winogrande": ("winogrande_score", Order.DESC),
-            "GSM8k": ("gsm8k_score", Order.DESC),
-        }
-        if sort_by in sort_by_map:
-            sort_key, sort_order = sort_by_map[sort_by]
-        else:
-            sort_key, sort_order = sort_by_map["default"]
-        # get and return models
-        return self.mr.list_models(
+        sort_key, sort_order = SORT_BY_KEYS.get(sort_by) or SORT_BY_KEYS["default"]
+        return dict(
             query=None if not query else query,
             label=label,
             not_label=not_label,
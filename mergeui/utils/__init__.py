@@ -1,5 +1,6 @@
 import typing as t
 import os
+import random
 import textwrap
 from loguru import logger
 import datetime as dt
@@ -77,6 +78,13 @@ def is_valid_repo_id(repo_id: str) -> bool:
     return bool(re.match(r"^[a-zA-Z0-9-]+/[a-zA-Z0-9-._]+$", repo_id))
 
 
+def normalize_model_id(model_id: str) -> str:
+    """Normalize a model ID found in configs or model cards (hub URL prefix, surrounding spaces, trailing slashes)."""
+    model_id = model_id.strip()
+    model_id = re.sub(r"^(?:https?://)?(?:www\.)?(?:huggingface\.co|hf\.co)/(?:models/)?", "", model_id)
+    return model_id.rstrip("/\\") or model_id
+
+
 def titlify(s: t.Optional[str]) -> t.Optional[str]:
     """Convert snake_case string to title case."""
     if not s:
@@ -105,6 +113,18 @@ def parse_yaml(yaml_str: str) -> list[t.Union[dict, list]]:
         return []
 
 
+def batched(iterable: t.Iterable, size: int) -> t.Iterator[list]:
+    """Lazily split an iterable into lists of `size` items (the last one can be shorter)."""
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
 def custom_serializer(obj):
     """Custom JSON serializer for dt.datetime."""
     if isinstance(obj, dt.datetime):
@@ -117,7 +137,7 @@ def log_progress(count: int, total: int, step: int = 5) -> None:
     count = count + 1  # start from 1
     if total > 100 * step:
         if count % (total // 100 * step) == 0:
-            logger.debug(f"{(count / total) * 100:.2f}%")
+            logger.debug("{:.2f}%", (count / total) * 100)
 
 
 def format_duration(start: float, end: float) -> str:
@@ -131,6 +151,15 @@ def format_duration(start: float, end: float) -> str:
     return f"{hours:02}:{minutes:02}:{seconds:0>6.3f} (hh:mm:ss.sss)"
 
 
+def exponential_backoff_delay(attempt: int, base: float = 1.0, max_delay: float = 60.0, jitter: bool = True) \
+        -> float:
+    """Delay in seconds before retry number `attempt` (starting from 0), doubled each time with full jitter."""
+    delay = min(max_delay, base * (2 ** max(attempt, 0)))
+    if jitter:
+        return random.uniform(0, delay)
+    return delay
+
+
 def escaped(d: t.Optional[t.Union[dict, str]]) -> t.Optional[t.Union[dict, str]]:
     """Escape value for gqlalchemy"""
     replacements = {
@@ -0,0 +1,85 @@
+import typing as t
+import json
+from pathlib import Path
+
+_decoder = json.JSONDecoder()
+_WHITESPACES = " \t\n\r"
+
+
+class _JsonStream:
+    """Buffered reader of a JSON text decoding one value at a time (memory bounded by the largest value)."""
+
+    def __init__(self, fp: t.TextIO, chunk_size: int):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _read_more(self) -> bool:
+        chunk = self.fp.read(self.chunk_size)
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        self.eof = not chunk
+        return bool(chunk)
+
+    def peek(self) -> str:
+        """Next non-whitespace character (empty at the end of the file)."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACES:
+                self.pos += 1
+            if self.pos < len(self.buffer) or not self._read_more():
+                return self.buffer[self.pos:self.pos + 1]
+
+    def expect(self, chars: str) -> str:
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"Invalid graph JSON: expected one of {chars!r}, got {char!r}")
+        self.pos += 1
+        return char
+
+    def decode(self) -> t.Any:
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+                if end < len(self.buffer) or self.eof:  # a number could continue in the next chunk
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._read_more()
+
+    def iter_array(self) -> t.Iterator[t.Any]:
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.decode()
+            if self.expect(",]") == "]":
+                return
+
+
+def iter_graph_json_items(json_path: Path, key: str, chunk_size: int = 1 << 16) -> t.Iterator[dict]:
+    """Items of a top level array of a graph JSON file (`nodes` or `relationships`) parsed incrementally,
+    other arrays are skipped item by item.
+    """
+    with open(json_path, encoding="utf-8") as fp:
+        stream = _JsonStream(fp, chunk_size)
+        stream.expect("{")
+        if stream.peek() == "}":
+            return
+        while True:
+            current_key = stream.decode()
+            stream.expect(":")
+            if stream.peek() == "[":
+                for item in stream.iter_array():
+                    if current_key == key:
+                        yield item
+            else:
+                stream.decode()
+            if stream.expect(",}") == "}":
+                return
+
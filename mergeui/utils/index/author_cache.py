@@ -0,0 +1,86 @@
+import typing as t
+import functools as fts
+import pickle
+import threading
+from loguru import logger
+import redis
+from huggingface_hub import hf_api
+from mergeui.core.dependencies import get_settings, get_redis_connection
+from mergeui.utils.index.data_extraction import list_model_infos
+from mergeui.utils.logging import log_sampled
+
+
+class AuthorListingCache:
+    """Models of an author listed once (full, with card data and config) and shared by all gated models of the author.
+    Listings are stored in Redis (shared by the workers) if available, else in process memory.
+    A lock per author makes concurrent jobs wait for the listing in progress instead of listing again.
+    """
+
+    def __init__(self, connection: t.Optional[redis.Redis], ttl: float, prefix: str = "author_listing"):
+        self.connection = connection
+        self.ttl = ttl
+        self.prefix = prefix
+        self._listings: dict[str, dict[str, hf_api.ModelInfo]] = {}  # in-process fallback
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+
+    def _key(self, author: str) -> str:
+        return f"{self.prefix}:{author}"
+
+    def _get_cached(self, author: str) -> t.Optional[dict[str, hf_api.ModelInfo]]:
+        if self.connection is None:
+            return self._listings.get(author)
+        value = self.connection.get(self._key(author))
+        return pickle.loads(value) if value is not None else None
+
+    def _set_cached(self, author: str, listing: dict[str, hf_api.ModelInfo]) -> None:
+        if self.connection is None:
+            self._listings[author] = listing
+        else:
+            self.connection.set(self._key(author), pickle.dumps(listing), ex=int(self.ttl))
+
+    def _lock(self, author: str) -> t.ContextManager:
+        if self.connection is not None:
+            return self.connection.lock(f"{self._key(author)}:lock", timeout=60 * 10, blocking_timeout=60 * 10)
+        with self._locks_lock:
+            return self._locks.setdefault(author, threading.Lock())
+
+    def get_listing(self, author: str) -> dict[str, hf_api.ModelInfo]:
+        """Models of the author by ID, listed from the hub on the first call."""
+        listing = self._get_cached(author)
+        if listing is not None:
+            return listing
+        with self._lock(author):
+            listing = self._get_cached(author)  # listed by another job while waiting for the lock
+            if listing is None:
+                listing = {m.id: m for m in list_model_infos(author=author, full=True, card_data=True,
+                                                              fetch_config=True)}
+                self._set_cached(author, listing)
+                log_sampled("DEBUG", "Listing of {} cached ({} models)", author, len(listing))
+        return listing
+
+    def get_model_info(self, model_id: str) -> t.Optional[hf_api.ModelInfo]:
+        namespace, _ = model_id.split("/")
+        return self.get_listing(namespace).get(model_id)
+
+    def clear(self) -> None:
+        """Remove all listings (at the start of a run)."""
+        self._listings.clear()
+        if self.connection is not None:
+            keys = list(self.connection.scan_iter(f"{self.prefix}:*"))
+            if keys:
+                self.connection.delete(*keys)
+
+
+@fts.cache
+def get_author_listing_cache() -> AuthorListingCache:
+    """Author listing cache of the indexing jobs, in process memory if Redis is not reachable."""
+    settings = get_settings()
+    connection: t.Optional[redis.Redis] = get_redis_connection()
+    try:
+        connection.ping()
+    except redis.exceptions.ConnectionError:
+        logger.debug(f"Redis not reachable, author listings cached in process memory")
+        connection = None
+    return AuthorListingCache(connection, ttl=settings.index_author_listing_cache_ttl,
+                              prefix=f"{settings.project_name}:author_listing")
@@ -0,0 +1,119 @@
+import typing as t
+import dataclasses as dc
+import math
+import time
+from loguru import logger
+import rq
+from rq.worker_pool import WorkerPool
+from mergeui.core.dependencies import get_settings
+from mergeui.core.settings import Settings
+from mergeui.utils.profiling import get_rss_mb
+
+
+class RecyclingWorker(rq.Worker):
+    """Worker stopping itself (to be respawned by the pool) after max jobs or above a memory threshold."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        settings = get_settings()
+        self.max_jobs: t.Optional[int] = settings.worker_max_jobs
+        self.max_memory_mb: t.Optional[int] = settings.worker_max_memory_mb
+        self.executed_jobs_count = 0
+
+    def execute_job(self, job: rq.job.Job, queue: rq.Queue):
+        super().execute_job(job, queue)
+        self.executed_jobs_count += 1
+        if self.max_jobs and self.executed_jobs_count >= self.max_jobs:
+            logger.info(f"Worker {self.name}: recycling after {self.executed_jobs_count} jobs")
+            self._stop_requested = True
+        elif self.max_memory_mb and (rss_mb := get_rss_mb()) >= self.max_memory_mb:
+            logger.info(f"Worker {self.name}: recycling at {rss_mb:.0f}MB after {self.executed_jobs_count} jobs")
+            self._stop_requested = True
+
+
+@dc.dataclass
+class ScalingPolicy:
+    min_workers: int = 1
+    max_workers: int = 8
+    jobs_per_worker: int = 4  # queued jobs per worker when the job latency is not known yet
+    target_drain_time: float = 60.0  # seconds to drain the queue
+    scale_down_cooldown: float = 60.0  # seconds between removing workers
+
+    @classmethod
+    def from_settings(cls, settings: Settings, min_workers: int, max_workers: int) -> 'ScalingPolicy':
+        return cls(
+            min_workers=min_workers,
+            max_workers=max_workers,
+            jobs_per_worker=settings.index_in_flight_jobs_per_worker,
+            target_drain_time=settings.worker_pool_target_drain_time,
+            scale_down_cooldown=settings.worker_pool_scale_down_cooldown,
+        )
+
+    def get_desired_workers(self, queue_depth: int, busy_workers: int, latency: t.Optional[float]) -> int:
+        """Workers needed to drain the queue in target_drain_time (given the mean job latency), within bounds."""
+        if latency:
+            needed = math.ceil(queue_depth * latency / self.target_drain_time)
+        else:
+            needed = math.ceil(queue_depth / self.jobs_per_worker)
+        return max(self.min_workers, min(self.max_workers, max(needed, busy_workers)))
+
+
+class AutoscalingWorkerPool(WorkerPool):
+    """Worker pool growing and shrinking between min and max workers based on queue depth and job latency.
+    Workers exiting on their own (recycled) are respawned by the pool.
+    """
+
+    def __init__(self, *args, policy: ScalingPolicy, scale_interval: float = 10.0, **kwargs):
+        super().__init__(*args, num_workers=policy.min_workers, worker_class=RecyclingWorker, **kwargs)
+        self.policy = policy
+        self.scale_interval = scale_interval
+        self._last_scaled_at = 0.0
+        self._last_scaled_down_at = 0.0
+        self._stopping: set[str] = set()  # names of workers asked to stop
+        self._working_totals: tuple[float, int] = (0.0, 0)  # (total working time, jobs count) of pool workers
+
+    def get_pool_workers(self) -> list[rq.Worker]:
+        workers = rq.Worker.all(connection=self.connection)
+        return [w for w in workers if w.name in self.worker_dict]
+
+    def get_latency(self, workers: list[rq.Worker]) -> t.Optional[float]:
+        """Mean job latency of the pool workers since the last check (None if no jobs completed)."""
+        total_time = sum(w.total_working_time for w in workers)
+        jobs_count = sum(w.successful_job_count + w.failed_job_count for w in workers)
+        last_time, last_count = self._working_totals
+        self._working_totals = total_time, jobs_count
+        if jobs_count <= last_count or total_time < last_time:  # nothing new or workers recycled
+            return None
+        return (total_time - last_time) / (jobs_count - last_count)
+
+    def scale(self) -> None:
+        """Update num_workers, extra idle workers are stopped (missing ones are spawned by check_workers)."""
+        now = time.time()
+        self._last_scaled_at = now
+        workers = self.get_pool_workers()
+        busy_workers = sum(w.state == rq.worker.WorkerStatus.BUSY for w in workers)
+        queue_depth = sum(q.count for q in self.queues)
+        latency = self.get_latency(workers)
+        desired = self.policy.get_desired_workers(queue_depth, busy_workers, latency)
+        if desired < self.num_workers:
+            if now - self._last_scaled_down_at < self.policy.scale_down_cooldown:
+                return
+            desired = self.num_workers - 1  # scale down gradually
+            self._last_scaled_down_at = now
+        if desired != self.num_workers:
+            logger.info(f"Scaling pool from {self.num_workers} to {desired} workers (queue_depth={queue_depth}, "
+                        f"busy_workers={busy_workers}, latency={latency and round(latency, 2)}s)")
+            self.num_workers = desired
+        self._stopping &= set(self.worker_dict)
+        extra = len(self.worker_dict) - len(self._stopping) - self.num_workers
+        idle_workers = [w.name for w in workers if w.state == rq.worker.WorkerStatus.IDLE and w.name not in
+                        self._stopping]
+        for name in idle_workers[:max(extra, 0)]:
+            self._stopping.add(name)
+            self.stop_worker(self.worker_dict[name])
+
+    def check_workers(self, respawn: bool = True) -> None:
+        self.reap_workers()
+        if respawn and time.time() - self._last_scaled_at >= self.scale_interval:
+            self.scale()
+        super().check_workers(respawn=respawn)
@@ -1,4 +1,5 @@
 import math
+import os
 import typing as t
 import datetime as dt
 from pathlib import Path
@@ -9,8 +10,13 @@ from loguru import logger
 import re
 import huggingface_hub as hf
 from huggingface_hub import hf_api
-from mergeui.utils import parse_yaml, filter_none, parse_iso_dt, aware_to_naive_dt, is_valid_repo_id
+from mergeui.utils import parse_yaml, filter_none, parse_iso_dt, aware_to_naive_dt, is_valid_repo_id, \
+    normalize_model_id
 from mergeui.core.schema import MergeMethodType
+from mergeui.utils.logging import log_sampled
+
+if t.TYPE_CHECKING:
+    from mergeui.utils.index.author_cache import AuthorListingCache
 
 
 # ##### Hub #####
@@ -61,6 +67,39 @@ def get_data_origin(
     return f"https://huggingface.co/api/models?{urllib.parse.urlencode(filter_none(params), doseq=True)}"
 
 
+def iter_model_infos(
+        *,
+        author: t.Optional[str] = None,
+        library: t.Optional[t.Union[str, t.List[str]]] = None,
+        language: t.Optional[t.Union[str, t.List[str]]] = None,
+        model_name: t.Optional[str] = None,
+        tags: t.Optional[t.Union[str, t.List[str]]] = None,
+        search: t.Optional[str] = None,
+        sort: t.Optional[str] = "lastModified",
+        direction: t.Optional[t.Literal[-1]] = None,
+        limit: t.Optional[int] = None,
+        full: t.Optional[bool] = True,
+        card_data: bool = True,
+        fetch_config: bool = True,
+) -> t.Iterator[hf_api.ModelInfo]:
+    """Lazily list models from HF API (paginated results are downloaded while iterating)."""
+    logger.debug(f"Listing models with limit={limit}...")
+    return hf_api.list_models(
+        author=author,
+        library=library,
+        language=language,
+        model_name=model_name,
+        tags=tags,
+        search=search,
+        sort=sort,
+        direction=direction,
+        limit=limit,
+        full=full,
+        cardData=card_data,
+        fetch_config=fetch_config,
+    )
+
+
 def list_model_infos(
         *,
         author: t.Optional[str] = None,
@@ -77,8 +116,7 @@ def list_model_infos(
         fetch_config: bool = True,
 ) -> list[hf_api.ModelInfo]:
     """List models from HF API."""
-    logger.debug(f"Listing models with limit={limit}...")
-    models = list(hf_api.list_models(
+    models = list(iter_model_infos(
         author=author,
         library=library,
         language=language,
@@ -89,24 +127,29 @@ def list_model_infos(
         direction=direction,
         limit=limit,
         full=full,
-        cardData=card_data,
+        card_data=card_data,
         fetch_config=fetch_config,
     ))
     logger.debug(f"Found {len(models)} models")
     return models
 
 
-def get_model_info(model_id: str, include_gated: bool = True, include_moved: bool = True) \
-        -> tuple[t.Optional[hf_api.ModelInfo], t.Optional[str]]:
+def get_model_info(
+        model_id: str,
+        include_gated: bool = True,
+        include_moved: bool = True,
+        author_listing_cache: t.Optional["AuthorListingCache"] = None,
+) -> tuple[t.Optional[hf_api.ModelInfo], t.Optional[str]]:
     """Get model info from HF API by ID.
     include_gated=True => fallback to listing if model is in a gated repository to fetch its model_info
     include_moved=True => get model_info also if the repo has been moved/renamed
+    author_listing_cache => gated models are looked up in the (shared) listing of their author
     """
-    logger.debug(f"Getting model info for {model_id}...")
+    log_sampled("DEBUG", "Getting model info for {}...", model_id)
     # noinspection PyProtectedMember
     try:
         retrieve_model_info = hf_api.model_info(model_id)
-        logger.debug(f"Model info for {model_id} retrieved")
+        log_sampled("DEBUG", "Model info for {} retrieved", model_id)
         return retrieve_model_info, get_data_origin(model_id=model_id)
     except hf_api.GatedRepoError as e:
         if include_gated:  # handle gated repo
@@ -117,6 +160,13 @@ def get_model_info(model_id: str, include_gated: bool = True, include_moved: boo
                     model_id = repo_url.repo_id
                     namespace, repo_name = repo_url.namespace, repo_url.repo_name
             # fallback to listing
+            if author_listing_cache is not None:
+                model_info = author_listing_cache.get_model_info(model_id)
+                if model_info is not None:
+                    return model_info, get_data_origin(author=namespace, full=True, card_data=True,
+                                                       fetch_config=True)
+                log_sampled("DEBUG", "Model {} not found in listing of {}", model_id, namespace)
+                return None, None
             list_params = dict(
                 author=namespace,
                 model_name=repo_name,
@@ -129,12 +179,12 @@ def get_model_info(model_id: str, include_gated: bool = True, include_moved: boo
                 if pm.id == model_id:
                     # pm.gated = True # could be a string "auto", "manual" ...
                     return pm, get_data_origin(**list_params)
-            logger.debug(f"Model {model_id} not found in listing")
-        logger.debug(f"Model {model_id} is in a gated repository")
+            log_sampled("DEBUG", "Model {} not found in listing", model_id)
+        log_sampled("DEBUG", "Model {} is in a gated repository", model_id)
     except hf_api.RepositoryNotFoundError:
-        logger.debug(f"Model {model_id} not found")
+        log_sampled("DEBUG", "Model {} not found", model_id)
     except hf.utils._validators.HFValidationError as e:
-        logger.debug(f"Model {model_id} is invalid\n{e.__repr__()}")
+        log_sampled("DEBUG", "Model {} is invalid\n{!r}", model_id, e)
     return None, None
 
 
@@ -150,14 +200,14 @@ def download_file_from_hf(
     in_siblings=True => check if the file is in the siblings list before downloading
     """
     filenames = [filenames] if isinstance(filenames, str) else filenames
-    logger.debug(f"Getting any {filenames} file for {model_id}...")
+    log_sampled("DEBUG", "Getting any {} file for {}...", filenames, model_id)
     if siblings:
         siblings = [sibling.rfilename for sibling in siblings]
     else:
         in_siblings = False
     for filename in filenames:
         if in_siblings and filename not in siblings:
-            logger.debug(f"'{filename}' file not in siblings, skipping...")
+            log_sampled("DEBUG", "'{}' file not in siblings, skipping...", filename)
             continue
         try:
             file_path = Path(hf.hf_hub_download(
@@ -166,11 +216,11 @@ def download_file_from_hf(
                 filename=filename,
                 local_files_only=local_files_only,
             ))
-            logger.debug(f"'{filename}' file for {model_id} retrieved")
+            log_sampled("DEBUG", "'{}' file for {} retrieved", filename, model_id)
             return file_path, get_data_origin(model_id=model_id, filename_or_path=filename)
         except hf_api.EntryNotFoundError:
             pass
-    logger.debug(f"All {filenames} for {model_id} not found")
+    log_sampled("DEBUG", "All {} for {} not found", filenames, model_id)
     return None, None
 
 
@@ -211,9 +261,9 @@ def load_model_card(path_or_id: t.Union[hf_api.ModelInfo, Path, str]) -> t.Optio
             model_card = hf.ModelCard.load(path_or_id, ignore_metadata_errors=True)
         return model_card
     except hf_api.EntryNotFoundError:
-        logger.debug(f"Model Card for {path_or_id} not found")
+        log_sampled("DEBUG", "Model Card for {} not found", path_or_id)
     except yaml.scanner.ScannerError:
-        logger.debug(f"Model Card for {path_or_id} is invalid")
+        log_sampled("DEBUG", "Model Card for {} is invalid", path_or_id)
 
 
 def hf_whoami() -> None:
@@ -229,6 +279,20 @@ def hf_whoami() -> None:
         logger.warning(f"Not Logged In to HuggingFace, please use `huggingface-cli login` or `huggingface_hub.login`")
 
 
+def download_results_dataset(local_files_only: bool = False) -> str:
+    """Download the open-llm-leaderboard results dataset (json files only), return the local folder."""
+    logger.debug(f"Downloading dataset: HF_HUB_ENABLE_HF_TRANSFER={os.environ.get('HF_HUB_ENABLE_HF_TRANSFER')}"
+                 f" and local_files_only={local_files_only}...")
+    results_dataset_folder: str = hf.snapshot_download(
+        repo_id='open-llm-leaderboard/results',
+        repo_type='dataset',
+        allow_patterns="*.json",
+        local_files_only=local_files_only,
+    )
+    logger.debug(f"Dataset downloaded to: {results_dataset_folder}")
+    return results_dataset_folder
+
+
 # ##### Hub #####
 
 
@@ -479,6 +543,17 @@ def extract_repo_url_from_gated_repo_error(e: hf_api.GatedRepoError) -> t.Option
         return hf_api.RepoUrl(found.group(1))
 
 
+def resolve_model_id(model_id: str, known_ids: dict[str, str]) -> str:
+    """Normalize a discovered model ID and resolve it case-insensitively against known IDs (casefold -> model_id).
+    - unknown valid IDs are registered as known
+    - invalid IDs (local paths, malformed IDs) are returned normalized, they can't be found in HF
+    """
+    model_id = normalize_model_id(model_id)
+    if not is_valid_repo_id(model_id):
+        return model_id
+    return known_ids.setdefault(model_id.casefold(), model_id)
+
+
 def extract_card_data_string_from_readme(readme: str) -> t.Optional[str]:
     # extracting card_data from Model Card
     if readme.startswith('---\n'):
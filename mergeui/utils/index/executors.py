@@ -0,0 +1,295 @@
+import typing as t
+import abc
+import dataclasses as dc
+import concurrent.futures as cf
+import os
+import time
+import traceback
+from loguru import logger
+import rq
+from mergeui.core.settings import Settings
+from mergeui.utils import format_duration
+from mergeui.core.db import create_redis_connection
+from mergeui.utils.index.retry import RetryTracker
+
+ExecutorType = t.Literal["rq", "thread", "process"]
+StageType = t.Literal["index", "fetch", "parse"]
+
+
+def get_task_id(func: t.Callable, model_id: str) -> str:
+    return f"{func.__name__}__{model_id.replace('/', '__')}"
+
+
+def timed_call(func: t.Callable, *args) -> tuple[t.Any, float]:
+    """Call func(*args) and return its result with the elapsed time (module level to be picklable)."""
+    start_time = time.time()
+    return func(*args), time.time() - start_time
+
+
+@dc.dataclass
+class TaskResult:
+    task_id: str
+    stage: StageType
+    args: list  # the first argument is the model ID
+    value: t.Any = None
+
+    @property
+    def model_id(self) -> str:
+        return self.args[0]
+
+
+@dc.dataclass
+class ExecutorMetrics:
+    """Same metrics for all backends, to compare them on a given deployment."""
+    submitted: int = 0
+    completed: int = 0
+    retried: int = 0
+    dead_lettered: int = 0
+    busy_time: float = 0.0  # sum of the tasks durations (in seconds)
+    started_at: float = dc.field(default_factory=time.time)
+
+    def on_completed(self, duration: t.Optional[float]) -> None:
+        self.completed += 1
+        self.busy_time += duration or 0.0
+
+    def report(self, executor_name: str) -> None:
+        elapsed = time.time() - self.started_at
+        throughput = self.completed / elapsed if elapsed > 0 else 0.0
+        mean_duration = self.busy_time / self.completed if self.completed else 0.0
+        logger.info(f"Executor {executor_name}: {self.completed}/{self.submitted} tasks completed in "
+                    f"{format_duration(self.started_at, self.started_at + elapsed)} ({throughput:.2f} tasks/s, "
+                    f"{mean_duration:.2f}s per task), {self.retried} retries, {self.dead_lettered} dead-lettered")
+
+
+class IndexExecutor(abc.ABC):
+    """Run indexing tasks (the first argument of each task is the model ID), retrying transient failures."""
+    name: ExecutorType
+
+    def __init__(self, settings: Settings, retry_tracker: RetryTracker):
+        self.settings = settings
+        self.retry_tracker = retry_tracker
+        self.metrics = ExecutorMetrics()
+
+    @property
+    @abc.abstractmethod
+    def in_flight_count(self) -> int:
+        """Number of tasks queued, running or waiting for a retry."""
+
+    @abc.abstractmethod
+    def get_max_in_flight(self) -> int:
+        """Max number of tasks in flight at once."""
+
+    @abc.abstractmethod
+    def submit(self, func: t.Callable, args_list: t.Iterable[list], stage: StageType = "index") -> None:
+        """Schedule one task per args."""
+
+    @abc.abstractmethod
+    def poll(self) -> tuple[list[TaskResult], list[TaskResult]]:
+        """Return the finished and the dead-lettered tasks (removed from in-flight tasks)."""
+
+    def wait(self, timeout: float) -> None:
+        """Wait for some task to finish (at most timeout seconds)."""
+        time.sleep(timeout)
+
+    def close(self) -> None:
+        self.metrics.retried = self.retry_tracker.retries_count
+        self.metrics.report(self.name)
+
+    def __enter__(self) -> 'IndexExecutor':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class RQExecutor(IndexExecutor):
+    """Tasks are run by rq workers (cli.worker or cli.worker_pool), results are polled from redis."""
+    name = "rq"
+
+    def __init__(self, settings: Settings, retry_tracker: RetryTracker):
+        super().__init__(settings, retry_tracker)
+        self.connection = create_redis_connection(settings)
+        if settings.index_split_stages:  # I/O-bound and CPU-bound stages on different queues
+            fetch_q = rq.Queue(settings.index_fetch_queue, connection=self.connection)
+            parse_q = rq.Queue(settings.index_parse_queue, connection=self.connection)
+            self.queues: dict[StageType, rq.Queue] = {"index": fetch_q, "fetch": fetch_q, "parse": parse_q}
+        else:
+            q = rq.Queue(connection=self.connection)
+            self.queues: dict[StageType, rq.Queue] = {"index": q, "fetch": q, "parse": q}
+        self.in_flight: dict[str, tuple[StageType, rq.job.Job]] = {}  # job_id -> (stage, job)
+
+    @property
+    def in_flight_count(self) -> int:
+        return len(self.in_flight)
+
+    def get_max_in_flight(self) -> int:
+        """A few jobs per running worker if not set."""
+        if self.settings.index_max_in_flight_jobs:
+            return self.settings.index_max_in_flight_jobs
+        workers_count = rq.Worker.count(queue=self.queues["index"])
+        return max(workers_count, 1) * self.settings.index_in_flight_jobs_per_worker
+
+    def submit(self, func: t.Callable, args_list: t.Iterable[list], stage: StageType = "index") -> None:
+        args_list = list(args_list)
+        if not args_list:
+            return
+        q = self.queues[stage]
+        jobs = q.enqueue_many([
+            q.prepare_data(
+                func,
+                args,
+                timeout=60 * 2,  # 2 minutes
+                result_ttl=60 * 60 * 2,  # 2 hours
+                failure_ttl=60 * 60 * 2,  # 2 hours
+                job_id=get_task_id(func, args[0]),
+            ) for args in args_list
+        ])
+        for job in jobs:
+            self.in_flight[job.id] = stage, job
+        self.metrics.submitted += len(jobs)
+
+    def poll(self) -> tuple[list[TaskResult], list[TaskResult]]:
+        """Check in-flight jobs, finished jobs are deleted from redis once collected.
+        - transient failures are requeued with exponential backoff until reaching the max attempts
+        - permanent failures (and exhausted ones) are dead-lettered and removed from the failed registry
+        """
+        job_ids = list(self.in_flight.keys())
+        finished, dead = [], []
+        for job_id, job in zip(job_ids, rq.job.Job.fetch_many(job_ids, connection=self.connection)):
+            stage, in_flight_job = self.in_flight[job_id]
+            if job is None:  # expired or deleted
+                self.retry_tracker.dead_letter(job_id, "job not found")
+                dead.append(TaskResult(job_id, stage, in_flight_job.args))
+                self.in_flight.pop(job_id)
+                continue
+            status = job.get_status(refresh=False)
+            if status == rq.job.JobStatus.FINISHED:
+                finished.append(TaskResult(job_id, stage, job.args, job.return_value()))
+                self.metrics.on_completed((job.ended_at - job.started_at).total_seconds()
+                                          if job.ended_at and job.started_at else None)
+                self.in_flight.pop(job_id)
+                job.delete(remove_from_queue=False)  # results are collected, keep redis memory flat
+            elif status == rq.job.JobStatus.FAILED and not self.retry_tracker.is_scheduled(job_id):
+                latest_result = job.latest_result()
+                exc_string = latest_result.exc_string if latest_result else None
+                if not self.retry_tracker.on_failure(job_id, exc_string):
+                    job.failed_job_registry.remove(job)
+                    dead.append(TaskResult(job_id, stage, job.args))
+                    self.in_flight.pop(job_id)
+        for due_job_id in self.retry_tracker.pop_due():
+            logger.warning(f"Requeuing failed job {due_job_id}...")
+            stage, job = self.in_flight[due_job_id]
+            self.in_flight[due_job_id] = stage, job.requeue()
+        self.metrics.dead_lettered += len(dead)
+        return finished, dead
+
+
+class PoolExecutor(IndexExecutor):
+    """Tasks are run in a local pool (no redis nor workers needed), failures are retried in the same pool."""
+    pool_class: t.Type[cf.Executor]
+
+    def __init__(self, settings: Settings, retry_tracker: RetryTracker):
+        super().__init__(settings, retry_tracker)
+        self.max_workers = settings.index_executor_max_workers or self.get_default_max_workers()
+        self.pool = self.pool_class(max_workers=self.max_workers)
+        # task_id -> (stage, func, args, future), future is None while waiting for a retry
+        self.in_flight: dict[str, tuple[StageType, t.Callable, list, t.Optional[cf.Future]]] = {}
+
+    @staticmethod
+    @abc.abstractmethod
+    def get_default_max_workers() -> int:
+        pass
+
+    @property
+    def in_flight_count(self) -> int:
+        return len(self.in_flight)
+
+    def get_max_in_flight(self) -> int:
+        """A few tasks per pool worker if not set."""
+        if self.settings.index_max_in_flight_jobs:
+            return self.settings.index_max_in_flight_jobs
+        return self.max_workers * self.settings.index_in_flight_jobs_per_worker
+
+    def _submit_one(self, task_id: str, stage: StageType, func: t.Callable, args: list) -> None:
+        self.in_flight[task_id] = stage, func, args, self.pool.submit(timed_call, func, *args)
+
+    def submit(self, func: t.Callable, args_list: t.Iterable[list], stage: StageType = "index") -> None:
+        for args in args_list:
+            self._submit_one(get_task_id(func, args[0]), stage, func, args)
+            self.metrics.submitted += 1
+
+    def poll(self) -> tuple[list[TaskResult], list[TaskResult]]:
+        finished, dead = [], []
+        for task_id, (stage, func, args, future) in list(self.in_flight.items()):
+            if future is None or not future.done():
+                continue
+            exc = future.exception()
+            if exc is None:
+                value, duration = future.result()
+                finished.append(TaskResult(task_id, stage, args, value))
+                self.metrics.on_completed(duration)
+                self.in_flight.pop(task_id)
+                continue
+            exc_string = "".join(traceback.format_exception(type(exc), exc, exc.__traceback__))
+            if self.retry_tracker.on_failure(task_id, exc_string):
+                self.in_flight[task_id] = stage, func, args, None
+            else:
+                dead.append(TaskResult(task_id, stage, args))
+                self.in_flight.pop(task_id)
+        for due_task_id in self.retry_tracker.pop_due():
+            logger.warning(f"Resubmitting failed task {due_task_id}...")
+            stage, func, args, _ = self.in_flight[due_task_id]
+            self._submit_one(due_task_id, stage, func, args)
+        self.metrics.dead_lettered += len(dead)
+        return finished, dead
+
+    def wait(self, timeout: float) -> None:
+        futures = [future for _, _, _, future in self.in_flight.values() if future is not None]
+        if futures:
+            cf.wait(futures, timeout=timeout, return_when=cf.FIRST_COMPLETED)
+        else:  # only retries waiting for their backoff delay
+            time.sleep(timeout)
+
+    def close(self) -> None:
+        self.pool.shutdown(wait=True, cancel_futures=True)
+        super().close()
+
+
+class ThreadExecutor(PoolExecutor):
+    """Local threads, fits the I/O-bound fetch stage."""
+    name = "thread"
+    pool_class = cf.ThreadPoolExecutor
+
+    @staticmethod
+    def get_default_max_workers() -> int:
+        return min(32, (os.cpu_count() or 1) + 4)
+
+
+class ProcessExecutor(PoolExecutor):
+    """Local processes, fits the CPU-bound parse stage (arguments and results are pickled)."""
+    name = "process"
+    pool_class = cf.ProcessPoolExecutor
+
+    @staticmethod
+    def get_default_max_workers() -> int:
+        return os.cpu_count() or 1
+
+
+EXECUTORS: dict[ExecutorType, t.Type[IndexExecutor]] = {
+    "rq": RQExecutor,
+    "thread": ThreadExecutor,
+    "process": ProcessExecutor,
+}
+
+
+def create_index_executor(
+        settings: Settings,
+        retry_tracker: RetryTracker,
+        executor: t.Optional[ExecutorType] = None,
+) -> IndexExecutor:
+    """Create the executor backend by name (defaults to settings.index_executor)."""
+    executor = executor or settings.index_executor
+    if executor not in EXECUTORS:
+        raise ValueError(f"Unknown executor '{executor}', expected one of: {', '.join(EXECUTORS)}")
+    logger.debug(f"Using {executor} executor")
+    return EXECUTORS[executor](settings, retry_tracker)
@@ -0,0 +1,39 @@
+import typing as t
+import functools as fts
+import pickle
+import time
+from loguru import logger
+from mergeui.core.dependencies import get_settings
+from mergeui.utils.index.sqlite_cache import SqliteCache
+
+
+class ExtractionCache(SqliteCache):
+    """Persistent cache of the node and relationships extracted from a model at a given commit SHA."""
+    schema = ("CREATE TABLE IF NOT EXISTS extraction_cache "
+              "(model_id TEXT PRIMARY KEY, sha TEXT, data BLOB, cached_at REAL)")
+
+    def get(self, model_id: str, sha: str) -> t.Optional[tuple[dict, list]]:
+        """Node and relationships extracted at this SHA, None if the repo changed since (or never extracted)."""
+        row = self.connection.execute(
+            "SELECT data FROM extraction_cache WHERE model_id = ? AND sha = ?", (model_id, sha)).fetchone()
+        return pickle.loads(row[0]) if row else None
+
+    def add(self, model_id: str, sha: str, node: dict, rels: list) -> None:
+        self.connection.execute(
+            "INSERT OR REPLACE INTO extraction_cache (model_id, sha, data, cached_at) VALUES (?, ?, ?, ?)",
+            (model_id, sha, pickle.dumps((node, rels)), time.time()),
+        )
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM extraction_cache").fetchone()[0]
+
+
+@fts.cache
+def get_extraction_cache() -> t.Optional[ExtractionCache]:
+    """Extraction cache of the indexing jobs, None if disabled."""
+    settings = get_settings()
+    if not settings.index_skip_unchanged:
+        return None
+    path = settings.index_extraction_cache_path or settings.project_dir / "media" / "extraction_cache.sqlite3"
+    logger.debug(f"Extraction cache: {path}")
+    return ExtractionCache(path)
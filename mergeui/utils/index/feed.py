@@ -0,0 +1,106 @@
+import typing as t
+import abc
+import dataclasses as dc
+import datetime as dt
+import json
+from pathlib import Path
+from loguru import logger
+from mergeui.utils import naive_to_aware_dt, parse_iso_dt, iso_format_dt
+from mergeui.utils.index.data_extraction import iter_model_infos
+
+
+@dc.dataclass(frozen=True)
+class FeedEntry:
+    model_id: str
+    updated_at: dt.datetime  # aware datetime in UTC timezone
+
+
+class ChangeFeed(abc.ABC):
+    """Models sorted by most recent change first."""
+
+    @abc.abstractmethod
+    def iter_changes(self) -> t.Iterator[FeedEntry]:
+        pass
+
+
+class HubChangeFeed(ChangeFeed):
+    """Models from the HF Hub listing sorted by createdAt (new models) or lastModified (new and updated models)."""
+
+    def __init__(self, sort: t.Literal["createdAt", "lastModified"] = "lastModified", tags: str = "merge"):
+        self.sort = sort
+        self.tags = tags
+
+    def iter_changes(self) -> t.Iterator[FeedEntry]:
+        for model_info in iter_model_infos(
+                tags=self.tags, sort=self.sort, direction=-1,
+                full=self.sort == "lastModified",  # last_modified is only listed with full=True
+                fetch_config=False, card_data=False,
+        ):
+            updated_at = model_info.last_modified if self.sort == "lastModified" else model_info.created_at
+            if updated_at is not None:
+                yield FeedEntry(model_info.id, naive_to_aware_dt(updated_at))
+
+
+class LocalChangeFeed(ChangeFeed):
+    """Stand-in feed from a JSON lines file: {"id": "author/model", "updated_at": "2024-01-25T11:44:11.000Z"}"""
+
+    def __init__(self, path: t.Union[str, Path]):
+        self.path = Path(path)
+
+    def iter_changes(self) -> t.Iterator[FeedEntry]:
+        with open(self.path) as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+        entries = [FeedEntry(row["id"], parse_iso_dt(row["updated_at"])) for row in rows]
+        return iter(sorted(entries, key=lambda e: e.updated_at, reverse=True))
+
+
+@dc.dataclass
+class HighWaterMark:
+    """Most recent change already applied, and the models changed at that exact time.
+    Models failing to be reindexed (dead-lettered) are kept to be retried at the next refresh.
+    """
+    updated_at: t.Optional[dt.datetime] = None
+    model_ids: set[str] = dc.field(default_factory=set)
+    retry_model_ids: set[str] = dc.field(default_factory=set)
+
+    @classmethod
+    def load(cls, path: Path) -> 'HighWaterMark':
+        if not path.exists():
+            return cls()
+        with open(path) as f:
+            data = json.load(f)
+        return cls(updated_at=parse_iso_dt(data.get("updated_at")), model_ids=set(data.get("model_ids", [])),
+                   retry_model_ids=set(data.get("retry_model_ids", [])))
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"updated_at": iso_format_dt(self.updated_at), "model_ids": sorted(self.model_ids),
+                       "retry_model_ids": sorted(self.retry_model_ids)}, f)
+
+    def is_seen(self, entry: FeedEntry) -> bool:
+        return self.updated_at is not None and (
+                entry.updated_at < self.updated_at
+                or (entry.updated_at == self.updated_at and entry.model_id in self.model_ids)
+        )
+
+    def advance(self, entries: t.Iterable[FeedEntry], failed_model_ids: t.Iterable[str] = ()) -> None:
+        """Mark the entries as applied, the failed models replace the models to retry."""
+        self.retry_model_ids = set(failed_model_ids)
+        for entry in entries:
+            if self.updated_at is None or entry.updated_at > self.updated_at:
+                self.updated_at, self.model_ids = entry.updated_at, {entry.model_id}
+            elif entry.updated_at == self.updated_at:
+                self.model_ids.add(entry.model_id)
+
+
+def poll_changes(feed: ChangeFeed, hwm: HighWaterMark) -> list[FeedEntry]:
+    """New or updated models since the high-water mark (the feed is read until the first older entry)."""
+    entries: dict[str, FeedEntry] = {}
+    for entry in feed.iter_changes():
+        if hwm.updated_at is not None and entry.updated_at < hwm.updated_at:
+            break
+        if not hwm.is_seen(entry) and entry.model_id not in entries:
+            entries[entry.model_id] = entry
+    logger.debug(f"{len(entries)} changed models since {iso_format_dt(hwm.updated_at)}")
+    return list(entries.values())
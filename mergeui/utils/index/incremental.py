@@ -0,0 +1,138 @@
+import typing as t
+from loguru import logger
+import redis
+import rq
+from mergeui.core.dependencies import get_settings, get_graph_repository
+from mergeui.repositories import GraphRepository
+from mergeui.utils import is_valid_repo_id
+from mergeui.utils.index.data_extraction import download_results_dataset
+from mergeui.utils.index.jobs import index_model_by_id, build_placeholder_node
+from mergeui.utils.index.executors import IndexExecutor, create_index_executor
+from mergeui.utils.index.retry import RetryPolicy, RetryTracker, summarize_failure
+
+
+def is_indexed(repository: GraphRepository, model_id: str) -> bool:
+    """Check if a model exists in the database as an indexed node (not only as a relationship end)."""
+    with repository.db_conn.acquire():  # read on the main instance (replicas may lag behind the indexing writes)
+        nodes = repository.list_nodes(label="Model", filters=dict(id=model_id), limit=1)
+    return bool(nodes) and getattr(nodes[0], "indexed_at", None) is not None
+
+
+def reindex_models(
+        index_executor: IndexExecutor,
+        repository: GraphRepository,
+        model_ids: t.Iterable[str],
+        results_dataset_folder: str,
+        max_hops: int = 0,
+        index_missing_base_models: bool = True,
+) -> dict:
+    """Index models in place in the live database (tasks replace the data of their own nodes and relationships).
+    - base models up to max_hops are reindexed too
+    - base models beyond max_hops are indexed only if missing in the database (index_missing_base_models=True)
+    - moved models are merged into their new ID
+    - the negative cache is bypassed for the reindexed models (requested or up to max_hops)
+    """
+    hops: dict[str, int] = {}  # model_id -> hops from the requested models
+    indexed_ids, dead_letters, merged_count = [], {}, 0
+
+    def submit(_model_ids: list[str], hop: int) -> None:
+        hops.update({model_id: hop for model_id in _model_ids})
+        index_executor.submit(index_model_by_id, [[model_id, results_dataset_folder, True, True, hop <= max_hops]
+                                                  for model_id in _model_ids])
+
+    submit(list(dict.fromkeys(model_ids)), 0)
+    while index_executor.in_flight_count:
+        finished_tasks, dead_tasks = index_executor.poll()
+        for task in dead_tasks:
+            dead_letters[task.model_id] = index_executor.retry_tracker.dead_letters[task.task_id]
+        for task in finished_tasks:
+            _got: tuple[dict, list] = task.value
+            new_node, new_rels = _got
+            if new_node.get("new_id"):
+                logger.warning(f"Model {new_node['id']} has been moved to {new_node['new_id']}")
+                repository.merge_nodes(label="Model", src_id=new_node["id"], dst_id=new_node["new_id"])
+                merged_count += 1
+            indexed_ids.append(new_node.get("new_id") or new_node["id"])
+            hop = hops[task.model_id] + 1
+            next_ids = []
+            for target in dict.fromkeys(rel["target"] for rel in new_rels):
+                if target in hops:
+                    continue
+                if not is_valid_repo_id(target):  # local model
+                    hops[target] = hop
+                    repository.upsert_nodes(label="Model", nodes=[build_placeholder_node(target)])
+                elif hop <= max_hops or (index_missing_base_models and not is_indexed(repository, target)):
+                    next_ids.append(target)
+            submit(next_ids, hop)
+        if not finished_tasks and not dead_tasks:
+            index_executor.wait(1)
+    # technical properties are only needed while indexing
+    for model_id in indexed_ids:
+        repository.remove_properties(label="Model", filters=dict(id=model_id), keys={"indexed", "new_id"})
+    logger.success(f"{len(indexed_ids)} models reindexed ({merged_count} moved), {len(dead_letters)} dead-lettered")
+    return {
+        "indexed": indexed_ids,
+        "merged_count": merged_count,
+        "dead_letters": dead_letters,
+    }
+
+
+def refresh_model_lineage(model_id: str, max_hops: int) -> dict:
+    """Job reindexing a model and its ancestors up to max_hops in place (using a local executor by default)."""
+    settings = get_settings()
+    results_dataset_folder = download_results_dataset()
+    retry_tracker = RetryTracker(RetryPolicy.from_settings(settings))
+    with create_index_executor(settings, retry_tracker, settings.refresh_lineage_executor) as index_executor:
+        return reindex_models(
+            index_executor,
+            get_graph_repository(),
+            [model_id],
+            results_dataset_folder,
+            max_hops=max_hops,
+            index_missing_base_models=False,
+        )
+
+
+LINEAGE_REFRESH_JOB_PREFIX = f"{refresh_model_lineage.__name__}__"
+
+
+def enqueue_lineage_refresh(connection: redis.Redis, model_id: str, max_hops: int) -> rq.job.Job:
+    """Schedule a lineage refresh, an identical refresh already queued or running is returned instead."""
+    settings = get_settings()
+    job_id = f"{LINEAGE_REFRESH_JOB_PREFIX}{model_id.replace('/', '__')}__{max_hops}"
+    try:
+        job = rq.job.Job.fetch(job_id, connection=connection)
+        if job.get_status() in {rq.job.JobStatus.QUEUED, rq.job.JobStatus.STARTED, rq.job.JobStatus.DEFERRED}:
+            return job
+    except rq.exceptions.NoSuchJobError:
+        pass
+    q = rq.Queue(settings.refresh_lineage_queue, connection=connection)
+    return q.enqueue(
+        refresh_model_lineage,
+        model_id,
+        max_hops,
+        job_id=job_id,
+        job_timeout=60 * 30,  # 30 minutes
+        result_ttl=60 * 60 * 24,  # 1 day
+        failure_ttl=60 * 60 * 24,  # 1 day
+    )
+
+
+def get_lineage_refresh_status(connection: redis.Redis, job_id: str) -> t.Optional[dict]:
+    """Status of a lineage refresh job (with its result or error once completed), None if not found.
+    Other jobs (e.g. indexing jobs sharing the same Redis) are not exposed.
+    """
+    if not job_id.startswith(LINEAGE_REFRESH_JOB_PREFIX):
+        return None
+    try:
+        job = rq.job.Job.fetch(job_id, connection=connection)
+    except rq.exceptions.NoSuchJobError:
+        return None
+    status = job.get_status()
+    latest_result = job.latest_result() if status in {rq.job.JobStatus.FINISHED, rq.job.JobStatus.FAILED} else None
+    return {
+        "job_id": job.id,
+        "status": str(status.value if status else None),
+        "result": job.return_value() if status == rq.job.JobStatus.FINISHED else None,
+        "error": summarize_failure(latest_result.exc_string) if latest_result and latest_result.exc_string else None,
+    }
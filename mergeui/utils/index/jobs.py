@@ -1,71 +1,180 @@
 import typing as t
 import datetime as dt
-from loguru import logger
 from pathlib import Path
 import time
-import redis
 import huggingface_hub as hf
 from huggingface_hub import hf_api
-from mergeui.utils import aware_to_naive_dt, filter_none, format_duration
+from loguru import logger
+from mergeui.utils import aware_to_naive_dt, filter_none, format_duration, batched, normalize_model_id, \
+    is_valid_repo_id
 from mergeui.utils.index.data_extraction import get_model_info, load_model_card, download_mergekit_config, \
-    get_data_origin, extract_benchmark_results_from_dataset, extract_model_url_from_model_info, \
+    download_readme, get_data_origin, extract_benchmark_results_from_dataset, extract_model_url_from_model_info, \
     extract_model_name_from_model_card, extract_model_description_from_model_card, extract_license_from_tags, \
     extract_license_from_model_card, extract_model_architecture_from_model_info, \
     extract_merge_method_from_mergekit_config, extract_base_models_from_tags, extract_base_models_from_model_card, \
     extract_base_models_from_mergekit_configs, extract_mergekit_configs_from_model_card, \
     extract_mergekit_configs_from_file, extract_model_name_from_model_id, extract_author_from_model_id
-from mergeui.core.settings import Settings
+from mergeui.core.dependencies import get_settings, get_graph_repository
+from mergeui.utils.profiling import memory_traced
+from mergeui.utils.logging import log_sampled
+from mergeui.utils.index.negative_cache import get_negative_cache
+from mergeui.utils.index.author_cache import get_author_listing_cache
+from mergeui.utils.index.extraction_cache import get_extraction_cache
 
 
-def create_redis_connection(settings: Settings) -> redis.Redis:
-    return redis.Redis(
-        host=settings.redis_dsn.host,
-        port=settings.redis_dsn.port,
-        db=settings.redis_dsn.path.replace("/", ""),
-        username=settings.redis_dsn.username,
-        password=settings.redis_dsn.password,
-        client_name=f"{settings.project_name}",
-    )
+def build_placeholder_node(model_id: str) -> dict:
+    """Node data of a model not available in HF (private, deleted or local model)."""
+    return filter_none({
+        "id": model_id,
+        "url": extract_model_url_from_model_info(model_id),
+        "name": extract_model_name_from_model_id(model_id),
+        "description": None,
+        "license": "unknown",
+        "author": extract_author_from_model_id(model_id),
+        "indexed": True,
+        "indexed_at": aware_to_naive_dt(dt.datetime.utcnow()),
+        "private": True,
+        "labels": ["Model"],
+    })
 
 
-def index_model_by_id(model_id: str, results_dataset_folder: str) -> tuple[dict, list]:
-    """Index one model by its ID. Return the node data and relationships data"""
+@memory_traced
+def fetch_model_artifacts(model_id: str, bypass_negative_cache: bool = False) -> dict:
+    """Fetch stage (I/O-bound) of indexing a model by its ID.
+    Return the model info and the paths of the downloaded files in the local cache.
+    - bypass_negative_cache=True: the hub is queried even if the model is cached as missing (explicit refresh)
+    """
     start_time = time.time()
-    results_dataset_folder = Path(results_dataset_folder)
+    negative_cache = get_negative_cache()
+    if negative_cache is not None and not bypass_negative_cache and (reason := negative_cache.get(model_id)):
+        log_sampled("DEBUG", "Model {} skipped: {} (negative cache)", model_id, reason)
+        return {"model_info": None, "model_info_origin": None}
     _got: tuple[t.Optional[hf_api.ModelInfo], t.Optional[str]] = get_model_info(
         model_id=model_id,
         include_gated=True,
         include_moved=True,
+        author_listing_cache=get_author_listing_cache(),
     )
     model_info, model_info_origin = _got
+    if model_info is None and negative_cache is not None:  # network errors are raised, so the model is missing
+        negative_cache.add(model_id, "not found or private" if is_valid_repo_id(model_id) else "invalid ID")
+    elif model_info is not None and negative_cache is not None and bypass_negative_cache:
+        negative_cache.remove(model_id)  # available again
+    artifacts = {
+        "model_info": model_info,
+        "model_info_origin": model_info_origin,
+    }
+    extraction_cache = get_extraction_cache()
+    if model_info is not None and model_info.sha and extraction_cache is not None:
+        artifacts["cached_extraction"] = extraction_cache.get(model_id, model_info.sha)
+        if artifacts["cached_extraction"] is not None:
+            log_sampled("DEBUG", "Model {} unchanged since sha={}, skipping downloads", model_id, model_info.sha)
+    if model_info is not None and artifacts.get("cached_extraction") is None:
+        _got: tuple[t.Optional[Path], t.Optional[str]] = download_readme(model_info.id, model_info.siblings)
+        model_card_path, _ = _got
+        _got: tuple[t.Optional[Path], t.Optional[str]] = download_mergekit_config(model_info.id, model_info.siblings)
+        mergekit_config_path, mergekit_config_origin = _got
+        artifacts.update({
+            "model_card_path": str(model_card_path) if model_card_path else None,
+            "mergekit_config_path": str(mergekit_config_path) if mergekit_config_path else None,
+            "mergekit_config_origin": mergekit_config_origin,
+        })
+    end_time = time.time()
+    log_sampled("DEBUG", "Fetch job={} completed in {}", model_id, format_duration(start_time, end_time))
+    return artifacts
+
+
+def extract_volatile_fields(
+        model_info: hf_api.ModelInfo,
+        benchmark_results: t.Optional[dict[str, t.Union[float, dt.datetime]]],
+) -> dict:
+    """Node fields changing without a new commit in the repo (refreshed even if the model is unchanged)."""
+    return {
+        "likes": model_info.likes,
+        "downloads": model_info.downloads,
+        "updated_at": aware_to_naive_dt(model_info.last_modified),
+        **(benchmark_results or {}),
+        "private": model_info.private,
+        "disabled": model_info.disabled,
+        "gated": model_info.gated in ["auto", "manual"],
+        "indexed": True,
+        "indexed_at": aware_to_naive_dt(dt.datetime.utcnow()),
+    }
+
+
+def write_model_data(node: dict, rels: list, replace: bool = False) -> dict:
+    """Upsert the node and its relationships into the database (worker-side), missing base models are created.
+    - replace=True: the stale data of a reindexed model is dropped (properties, MergedModel label, base models)
+    Return the slim node data (id and new_id) needed by the coordinator
+    """
+    settings = get_settings()
+    repository = get_graph_repository()
+    if replace:
+        repository.delete_relationships(label="Model", relationship_type="DERIVED_FROM", source_ids=[node["id"]])
+        if "MergedModel" not in node.get("labels", []):
+            repository.remove_labels(label="Model", filters=dict(id=node["id"]), labels=["MergedModel"])
+    repository.upsert_nodes(label="Model", nodes=[node], replace=replace)
+    rels_by_type: dict[str, list] = {}
+    for rel in rels:
+        rels_by_type.setdefault(rel["type"], []).append(rel)
+    for relationship_type, rels_of_type in rels_by_type.items():
+        for rels_batch in batched(rels_of_type, settings.index_db_write_batch_size):
+            repository.create_relationships(
+                label="Model",
+                relationship_type=relationship_type,
+                relationships=rels_batch,
+                merge_keys=["method", "origin"],
+                create_missing_nodes=True,
+            )
+    return filter_none({"id": node["id"], "new_id": node.get("new_id")})
+
+
+@memory_traced
+def extract_model_data(
+        model_id: str,
+        results_dataset_folder: str,
+        artifacts: dict,
+        write_to_db: bool = False,
+        replace: bool = False,
+) -> tuple[dict, list]:
+    """Parse stage (CPU-bound) of indexing a model by its ID, from the artifacts of the fetch stage.
+    Return the node data and relationships data (slim node data if written to the database by the worker)
+    - replace=True: the data written to the database replaces the data of a previous indexing (reindex in place)
+    """
+    start_time = time.time()
+    results_dataset_folder = Path(results_dataset_folder)
+    model_info: t.Optional[hf_api.ModelInfo] = artifacts.get("model_info")
+    model_info_origin: t.Optional[str] = artifacts.get("model_info_origin")
     # private/local model
     if model_info is None:
         logger.warning(f"Model {model_id} not found in HF")
         end_time = time.time()
-        logger.success(f"Job={model_id} completed in {format_duration(start_time, end_time)}")
-        return filter_none({
-            "id": model_id,
-            "url": extract_model_url_from_model_info(model_id),
-            "name": extract_model_name_from_model_id(model_id),
-            "description": None,
-            "license": "unknown",
-            "author": extract_author_from_model_id(model_id),
-            "indexed": True,
-            "indexed_at": aware_to_naive_dt(dt.datetime.utcnow()),
-            "private": True,
-            "labels": ["Model"],
-        }), []
-    # public model
-    model_card: t.Optional[hf.ModelCard] = load_model_card(model_info.id)
-    model_card_origin = get_data_origin(model_id=model_info.id, filename_or_path="README.md")
-    _got: tuple[t.Optional[Path], t.Optional[str]] = download_mergekit_config(model_info.id, model_info.siblings)
-    mergekit_config_path, mergekit_config_origin = _got
-    mergekit_configs_from_model_card = extract_mergekit_configs_from_model_card(model_card)
-    mergekit_configs_from_file = extract_mergekit_configs_from_file(mergekit_config_path)
+        log_sampled("DEBUG", "Job={} completed in {}", model_id, format_duration(start_time, end_time))
+        node_data = build_placeholder_node(model_id)  # the data of a previous indexing (if any) is kept
+        return (write_model_data(node_data, []) if write_to_db else node_data), []
     benchmark_results: t.Optional[dict[str, t.Union[float, dt.datetime]]] = (
             extract_benchmark_results_from_dataset(model_id, dataset_folder=results_dataset_folder)
             or extract_benchmark_results_from_dataset(model_info.id, dataset_folder=results_dataset_folder)
     )
+    # unchanged model (same sha), only volatile fields are refreshed
+    if artifacts.get("cached_extraction") is not None:
+        _got: tuple[dict, list] = artifacts["cached_extraction"]
+        node_data, node_relationships = _got
+        node_data = filter_none({**node_data, **extract_volatile_fields(model_info, benchmark_results)})
+        if write_to_db:
+            node_data = write_model_data(node_data, node_relationships, replace=replace)
+        end_time = time.time()
+        log_sampled("DEBUG", "Job={} (unchanged) completed in {}", model_id, format_duration(start_time, end_time))
+        return node_data, node_relationships
+    # public model
+    model_card_path = artifacts.get("model_card_path")
+    model_card: t.Optional[hf.ModelCard] = load_model_card(Path(model_card_path)) if model_card_path else None
+    model_card_origin = get_data_origin(model_id=model_info.id, filename_or_path="README.md")
+    mergekit_config_path = artifacts.get("mergekit_config_path")
+    mergekit_config_path: t.Optional[Path] = Path(mergekit_config_path) if mergekit_config_path else None
+    mergekit_config_origin: t.Optional[str] = artifacts.get("mergekit_config_origin")
+    mergekit_configs_from_model_card = extract_mergekit_configs_from_model_card(model_card)
+    mergekit_configs_from_file = extract_mergekit_configs_from_file(mergekit_config_path)
     description: t.Optional[str] = extract_model_description_from_model_card(model_card)
     node_data = {
         "id": model_id,
@@ -78,16 +187,9 @@ def index_model_by_id(model_id: str, results_dataset_folder: str) -> tuple[dict,
         "author": model_info.author or extract_author_from_model_id(model_info.id),
         "merge_method": None,
         "architecture": extract_model_architecture_from_model_info(model_info),
-        "likes": model_info.likes,
-        "downloads": model_info.downloads,
         "created_at": aware_to_naive_dt(model_info.created_at),
-        "updated_at": aware_to_naive_dt(model_info.last_modified),
-        **(benchmark_results or {}),
-        "private": model_info.private,
-        "disabled": model_info.disabled,
-        "gated": model_info.gated in ["auto", "manual"],
-        "indexed": True,
-        "indexed_at": aware_to_naive_dt(dt.datetime.utcnow()),
+        **extract_volatile_fields(model_info, benchmark_results),
+        "sha": model_info.sha,
         "labels": ["Model"],
     }
     node_relationships = []
@@ -125,7 +227,7 @@ def index_model_by_id(model_id: str, results_dataset_folder: str) -> tuple[dict,
                         method=extractor_method,
                         origin=_origin,
                         source=model_id,
-                        target=base_model,
+                        target=normalize_model_id(base_model),
                     )
                 )
             )
@@ -138,7 +240,25 @@ def index_model_by_id(model_id: str, results_dataset_folder: str) -> tuple[dict,
     # add extra labels if needed
     if node_relationships or node_data.get("merge_method"):
         node_data["labels"].append("MergedModel")
+    node_data = filter_none(node_data)
+    if model_info.sha and (extraction_cache := get_extraction_cache()) is not None:
+        extraction_cache.add(model_id, model_info.sha, node_data, node_relationships)
+    if write_to_db:
+        node_data = write_model_data(node_data, node_relationships, replace=replace)
     # logging
     end_time = time.time()
-    logger.success(f"Job={model_id} completed in {format_duration(start_time, end_time)}")
-    return filter_none(node_data), node_relationships
+    log_sampled("DEBUG", "Job={} completed in {}", model_id, format_duration(start_time, end_time))
+    return node_data, node_relationships
+
+
+@memory_traced
+def index_model_by_id(
+        model_id: str,
+        results_dataset_folder: str,
+        write_to_db: bool = False,
+        replace: bool = False,
+        bypass_negative_cache: bool = False,
+) -> tuple[dict, list]:
+    """Index one model by its ID (fetch and parse stages in one job). Return the node data and relationships data"""
+    artifacts = fetch_model_artifacts(model_id, bypass_negative_cache=bypass_negative_cache)
+    return extract_model_data(model_id, results_dataset_folder, artifacts, write_to_db=write_to_db, replace=replace)
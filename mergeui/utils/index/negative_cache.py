@@ -0,0 +1,54 @@
+import typing as t
+import functools as fts
+import time
+from pathlib import Path
+from loguru import logger
+from mergeui.core.dependencies import get_settings
+from mergeui.utils.index.sqlite_cache import SqliteCache
+
+
+class NegativeCache(SqliteCache):
+    """Persistent cache of model IDs missing, private or invalid on the hub, entries expire after ttl seconds."""
+    schema = "CREATE TABLE IF NOT EXISTS negative_cache (model_id TEXT PRIMARY KEY, reason TEXT, cached_at REAL)"
+
+    def __init__(self, path: Path, ttl: float):
+        super().__init__(path)
+        self.ttl = ttl
+
+    def get(self, model_id: str) -> t.Optional[str]:
+        """Reason of a cached (not expired) model ID, else None."""
+        row = self.connection.execute(
+            "SELECT reason FROM negative_cache WHERE model_id = ? AND cached_at > ?",
+            (model_id, time.time() - self.ttl),
+        ).fetchone()
+        return row[0] if row else None
+
+    def add(self, model_id: str, reason: str) -> None:
+        self.connection.execute(
+            "INSERT OR REPLACE INTO negative_cache (model_id, reason, cached_at) VALUES (?, ?, ?)",
+            (model_id, reason, time.time()),
+        )
+
+    def remove(self, model_id: str) -> None:
+        self.connection.execute("DELETE FROM negative_cache WHERE model_id = ?", (model_id,))
+
+    def purge_expired(self) -> int:
+        """Remove expired entries, return their count."""
+        cursor = self.connection.execute("DELETE FROM negative_cache WHERE cached_at <= ?", (time.time() - self.ttl,))
+        return cursor.rowcount
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM negative_cache").fetchone()[0]
+
+
+@fts.cache
+def get_negative_cache() -> t.Optional[NegativeCache]:
+    """Negative cache of the indexing jobs, None if disabled (no TTL)."""
+    settings = get_settings()
+    if not settings.index_negative_cache_ttl:
+        return None
+    path = settings.index_negative_cache_path or settings.project_dir / "media" / "negative_cache.sqlite3"
+    negative_cache = NegativeCache(path, ttl=settings.index_negative_cache_ttl)
+    purged_count = negative_cache.purge_expired()
+    logger.debug(f"Negative cache: {path} (ttl={settings.index_negative_cache_ttl}s, {purged_count} expired purged)")
+    return negative_cache
@@ -0,0 +1,138 @@
+import typing as t
+import dataclasses as dc
+import re
+import time
+from loguru import logger
+from mergeui.core.settings import Settings
+from mergeui.utils import exponential_backoff_delay
+
+FailureKindType = t.Literal["transient", "permanent"]
+
+# network hiccups, rate limits and timeouts are worth retrying
+TRANSIENT_EXCEPTIONS = {
+    "ConnectionError", "ConnectTimeout", "ReadTimeout", "Timeout", "TimeoutError", "ChunkedEncodingError",
+    "ProtocolError", "RemoteDisconnected", "ConnectionResetError", "BrokenPipeError", "SSLError", "ProxyError",
+    "JobTimeoutException", "GQLAlchemyWaitForConnectionError",
+}
+# broken repos and invalid data will fail the same way on every attempt
+PERMANENT_EXCEPTIONS = {
+    "HFValidationError", "RepositoryNotFoundError", "RevisionNotFoundError", "EntryNotFoundError", "GatedRepoError",
+    "ValidationError", "ValueError", "TypeError", "KeyError", "IndexError", "AttributeError", "AssertionError",
+    "JSONDecodeError", "UnicodeDecodeError", "YAMLError", "ScannerError", "ParserError", "ComposerError",
+    "ConstructorError", "RecursionError",
+}
+TRANSIENT_HTTP_STATUS_CODES = {408, 425, 429}
+# unindented `module.ExceptionName: message` line of a traceback
+EXC_LINE_PATTERN = re.compile(r"^((?:[A-Za-z_]\w*\.)*([A-Za-z_]\w*))(?::(?!//)[ \t]?|$)", flags=re.MULTILINE)
+
+
+def parse_exc_string(exc_string: t.Optional[str]) -> tuple[t.Optional[str], str]:
+    """Get the exception class name (without module) and message of the last exception in a traceback string."""
+    if not exc_string:
+        return None, ""
+    found = list(EXC_LINE_PATTERN.finditer(exc_string))
+    if not found:
+        return None, exc_string.strip()
+    last = found[-1]
+    return last.group(2), exc_string[last.end():].strip()
+
+
+def classify_failure(exc_string: t.Optional[str]) -> FailureKindType:
+    """Classify a job failure from its exception string, unknown failures are considered transient."""
+    exc_name, message = parse_exc_string(exc_string)
+    if exc_name in TRANSIENT_EXCEPTIONS:
+        return "transient"
+    if exc_name in PERMANENT_EXCEPTIONS:
+        return "permanent"
+    status_code = re.search(r"\b([45]\d\d) (?:Client|Server) Error", message)
+    if status_code:
+        status_code = int(status_code.group(1))
+        if status_code >= 500 or status_code in TRANSIENT_HTTP_STATUS_CODES:
+            return "transient"
+        return "permanent"
+    return "transient"
+
+
+def summarize_failure(exc_string: t.Optional[str], max_length: int = 160) -> str:
+    """One line summary of a failure, used for logging and dead-letter reports."""
+    exc_name, message = parse_exc_string(exc_string)
+    message = " ".join(message.split())
+    summary = f"{exc_name}: {message}" if exc_name else message
+    return summary if len(summary) <= max_length else f"{summary[:max_length - 3]}..."
+
+
+@dc.dataclass
+class RetryPolicy:
+    max_attempts: int = 5
+    base_delay: float = 2.0
+    max_delay: float = 120.0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> 'RetryPolicy':
+        return cls(
+            max_attempts=settings.index_job_max_attempts,
+            base_delay=settings.index_job_retry_base_delay,
+            max_delay=settings.index_job_retry_max_delay,
+        )
+
+    def should_retry(self, kind: FailureKindType, attempt: int) -> bool:
+        """Only transient failures are retried, until reaching max_attempts."""
+        return kind == "transient" and attempt < self.max_attempts
+
+    def get_delay(self, attempt: int) -> float:
+        """Backoff delay in seconds after the failed attempt number `attempt` (starting from 1)."""
+        return exponential_backoff_delay(attempt - 1, base=self.base_delay, max_delay=self.max_delay)
+
+
+class RetryTracker:
+    """Keep track of attempts, scheduled retries and dead-lettered jobs (by job ID)."""
+
+    def __init__(self, policy: RetryPolicy):
+        self.policy = policy
+        self.attempts: dict[str, int] = {}
+        self.retry_at: dict[str, float] = {}
+        self.dead_letters: dict[str, str] = {}
+        self.retries_count = 0
+
+    def on_failure(self, job_id: str, exc_string: t.Optional[str]) -> bool:
+        """Schedule a retry for a failed job, return False if the job has been dead-lettered instead."""
+        attempt = self.attempts.get(job_id, 1)
+        kind = classify_failure(exc_string)
+        if self.policy.should_retry(kind, attempt):
+            delay = self.policy.get_delay(attempt)
+            self.retry_at[job_id] = time.time() + delay
+            logger.warning(f"Job {job_id} failed (attempt {attempt} of {self.policy.max_attempts}), "
+                           f"retrying in {delay:.1f}s: {summarize_failure(exc_string)}")
+            return True
+        self.dead_letter(job_id, f"{kind} failure after {attempt} attempt(s): {summarize_failure(exc_string)}")
+        return False
+
+    def dead_letter(self, job_id: str, reason: str) -> None:
+        self.dead_letters[job_id] = reason
+        logger.error(f"Job {job_id} dead-lettered: {reason}")
+
+    def is_scheduled(self, job_id: str) -> bool:
+        return job_id in self.retry_at
+
+    def pop_due(self, now: t.Optional[float] = None) -> list[str]:
+        """Pop the job IDs whose retry is due, counting their new attempt."""
+        now = time.time() if now is None else now
+        due = [job_id for job_id, at in self.retry_at.items() if at <= now]
+        for job_id in due:
+            self.retry_at.pop(job_id)
+            self.attempts[job_id] = self.attempts.get(job_id, 1) + 1
+            self.retries_count += 1
+        return due
+
+    @property
+    def pending(self) -> int:
+        return len(self.retry_at)
+
+    def report(self) -> None:
+        """Log the dead-letter set, to be called at the end of a run."""
+        if not self.dead_letters:
+            logger.info(f"No dead-lettered jobs ({self.retries_count} retries)")
+            return
+        logger.warning(f"{len(self.dead_letters)} dead-lettered jobs ({self.retries_count} retries):")
+        for job_id, reason in sorted(self.dead_letters.items()):
+            logger.warning(f"- {job_id}: {reason}")
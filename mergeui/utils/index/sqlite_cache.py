@@ -0,0 +1,27 @@
+import typing as t
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+
+class SqliteCache:
+    """Persistent cache in a sqlite file (WAL mode), safe to share between processes and threads
+    (one connection per thread of each process).
+    """
+    schema: str  # CREATE TABLE statement
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._local = threading.local()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        connection: t.Optional[sqlite3.Connection] = getattr(self._local, "connection", None)
+        if connection is None or getattr(self._local, "pid", None) != os.getpid():  # not shared with forks
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(self.schema)
+            self._local.connection, self._local.pid = connection, os.getpid()
+        return connection
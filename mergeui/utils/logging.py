@@ -1,8 +1,83 @@
-from loguru import logger
+import typing as t
+import functools as fts
 import sys
+import threading
+import time
+from pathlib import Path
+from loguru import logger
 
+_config = {
+    "min_level_no": 0,
+    "sample_every": 1,  # default sampling of log_sampled
+    "throttle_interval": 0.0,  # default interval of log_throttled (in seconds)
+}
+_lock = threading.Lock()
+_calls_count: dict[tuple[str, int], int] = {}  # call site -> calls count
+_last_logged_at: dict[tuple[str, int], float] = {}  # call site -> last logged time
+_suppressed_count: dict[tuple[str, int], int] = {}  # call site -> suppressed messages since last logged
 
-def set_logger_level(level: str):
-    """Set logger level."""
+
+def set_logger_level(
+        level: str,
+        json_path: t.Optional[Path] = None,
+        sample_every: int = 1,
+        throttle_interval: float = 0.0,
+):
+    """Set logger level, with an optional JSON lines sink and the defaults of the sampled/throttled logs."""
     logger.remove()
     logger.add(sys.stderr, level=level.upper())
+    if json_path is not None:
+        Path(json_path).parent.mkdir(parents=True, exist_ok=True)
+        logger.add(json_path, level=level.upper(), serialize=True, enqueue=True)
+    _config.update(min_level_no=get_level_no(level), sample_every=max(sample_every, 1),
+                   throttle_interval=max(throttle_interval, 0.0))
+
+
+@fts.cache
+def get_level_no(level: str) -> int:
+    return logger.level(level.upper()).no
+
+
+def is_enabled(level: str) -> bool:
+    """Check the level before building expensive log messages."""
+    return get_level_no(level) >= _config["min_level_no"]
+
+
+def _call_site(depth: int) -> tuple[str, int]:
+    frame = sys._getframe(depth + 1)  # noqa
+    return frame.f_code.co_filename, frame.f_lineno
+
+
+def log_sampled(level: str, message: str, *args, every: t.Optional[int] = None, **kwargs) -> None:
+    """Log 1 out of `every` calls per call site, the message is formatted (`{}` style) only if logged.
+    Only DEBUG and TRACE messages are sampled, higher levels are always logged.
+    """
+    if not is_enabled(level):
+        return
+    every = every or _config["sample_every"]
+    if every > 1 and get_level_no(level) <= get_level_no("DEBUG"):
+        key = _call_site(1)
+        with _lock:
+            count = _calls_count[key] = _calls_count.get(key, 0) + 1
+        if (count - 1) % every:
+            return
+    logger.opt(depth=1).log(level.upper(), message, *args, **kwargs)
+
+
+def log_throttled(level: str, message: str, *args, interval: t.Optional[float] = None, **kwargs) -> None:
+    """Log at most once per `interval` seconds per call site, with the number of suppressed messages."""
+    if not is_enabled(level):
+        return
+    interval = _config["throttle_interval"] if interval is None else interval
+    suppressed = 0
+    if interval > 0:
+        key, now = _call_site(1), time.monotonic()
+        with _lock:
+            if now - _last_logged_at.get(key, float("-inf")) < interval:
+                _suppressed_count[key] = _suppressed_count.get(key, 0) + 1
+                return
+            _last_logged_at[key] = now
+            suppressed = _suppressed_count.pop(key, 0)
+    if suppressed:
+        message = f"{message} ({suppressed} similar messages suppressed)"
+    logger.opt(depth=1).log(level.upper(), message, *args, **kwargs)
@@ -5,6 +5,7 @@ import networkx as nx
 from gqlalchemy.vendors.database_client import DatabaseClient
 from gqlalchemy.transformations.translators.nx_translator import NxTranslator
 from mergeui.utils import log_progress
+from mergeui.utils.logging import is_enabled
 
 
 def preview_nx_graph(graph: nx.Graph) -> None:
@@ -76,8 +77,10 @@ def import_nx_graph_to_db(graph: nx.Graph, db: DatabaseClient) -> None:
     queries = list(translator.to_cypher_queries(graph))
     logger.debug(f"Executing {len(queries)} queries")
     total = len(queries)
+    trace_enabled = is_enabled("TRACE")
     for ind, query in enumerate(queries):
-        logger.trace(f"{query}")
+        if trace_enabled:
+            logger.trace("{}", query)
         db.execute(query)
         log_progress(ind, total, step=5)
     if queries:
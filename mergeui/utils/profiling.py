@@ -0,0 +1,224 @@
+import typing as t
+import collections
+import contextlib
+import datetime as dt
+import functools as fts
+import json
+import os
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from types import FrameType
+from loguru import logger
+from mergeui.core.dependencies import get_settings
+
+
+def get_rss_mb(pid: t.Optional[int] = None) -> float:
+    """Resident memory of a process in MB (peak memory of the current process if /proc is not available)."""
+    try:
+        with open(f"/proc/{pid or os.getpid()}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+    except (OSError, ValueError, IndexError):
+        return get_peak_rss_mb()
+
+
+def get_peak_rss_mb() -> float:
+    """Peak resident memory of the current process in MB."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # in KB on linux
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ",")
+
+
+def _fold_stack(frame: t.Optional[FrameType]) -> tuple[str, ...]:
+    """Stack from the root to the leaf frame."""
+    stack = []
+    while frame is not None:
+        stack.append(_frame_label(frame))
+        frame = frame.f_back
+    return tuple(reversed(stack))
+
+
+class SamplingProfiler:
+    """Sample the call stack of a thread at a fixed interval (low overhead, no instrumentation)."""
+
+    def __init__(self, interval: float = 0.005, thread_id: t.Optional[int] = None):
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.stacks: collections.Counter[tuple[str, ...]] = collections.Counter()
+        self.samples_count = 0
+        self._stop_event = threading.Event()
+        self._sampler: t.Optional[threading.Thread] = None
+
+    def _sample(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)  # noqa
+            if frame is not None:
+                self.stacks[_fold_stack(frame)] += 1
+                self.samples_count += 1
+
+    def start(self) -> None:
+        self._sampler = threading.Thread(target=self._sample, name="sampling-profiler", daemon=True)
+        self._sampler.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._sampler is not None:
+            self._sampler.join()
+
+    def folded_lines(self) -> list[str]:
+        """Stacks in the folded format (`root;...;leaf count`) used by flamegraph.pl and speedscope."""
+        return [f"{';'.join(stack)} {count}" for stack, count in self.stacks.most_common()]
+
+    def summary(self, top_n: int = 30) -> str:
+        """Top-N hot functions by self samples (leaf frames) and total samples (anywhere in the stack)."""
+        self_counts, total_counts = collections.Counter(), collections.Counter()
+        for stack, count in self.stacks.items():
+            self_counts[stack[-1]] += count
+            for label in set(stack):
+                total_counts[label] += count
+        total = max(self.samples_count, 1)
+        lines = [f"{self.samples_count} samples every {self.interval * 1000:.1f}ms", "", f"Top {top_n} by self time:"]
+        lines += [f"{count / total:7.2%} {count:8d}  {label}" for label, count in self_counts.most_common(top_n)]
+        lines += ["", f"Top {top_n} by total time:"]
+        lines += [f"{count / total:7.2%} {count:8d}  {label}" for label, count in total_counts.most_common(top_n)]
+        return "\n".join(lines)
+
+
+@contextlib.contextmanager
+def profiled(
+        name: str,
+        enabled: bool = True,
+        output_dir: t.Optional[Path] = None,
+        interval: float = 0.005,
+        top_n: int = 30,
+) -> t.Iterator[t.Optional[SamplingProfiler]]:
+    """Profile the block and write `profile_<name>_<datetime>.folded` and `.txt` (top-N summary) to media/."""
+    if not enabled:
+        yield None
+        return
+    if output_dir is None:
+        output_dir = get_settings().project_dir / "media"
+    profiler = SamplingProfiler(interval=interval)
+    profiler.start()
+    start_time = time.time()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        output_dir.mkdir(parents=True, exist_ok=True)
+        output_path = output_dir / f"profile_{name}_{dt.datetime.utcnow().isoformat()}"
+        Path(f"{output_path}.folded").write_text("\n".join(profiler.folded_lines()))
+        summary = profiler.summary(top_n=top_n)
+        Path(f"{output_path}.txt").write_text(summary)
+        logger.info(f"Profile of {name} ({time.time() - start_time:.1f}s) saved to {output_path}.folded/.txt\n"
+                    f"{summary}")
+
+
+def profilable(name: str) -> t.Callable:
+    """Decorator adding a `profile` keyword argument to a CLI entry point."""
+
+    def decorator(func: t.Callable) -> t.Callable:
+        @fts.wraps(func)
+        def wrapper(*args, profile: bool = False, **kwargs):
+            with profiled(name, enabled=profile):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class MemoryTracker:
+    """tracemalloc snapshots at checkpoints, logging the top allocation sites (compared to the previous checkpoint)
+    and the RSS of each phase to `memory_<name>_<datetime>.txt` in media/.
+    """
+
+    def __init__(self, name: str, enabled: bool = True, output_dir: t.Optional[Path] = None, top_n: int = 10):
+        self.enabled = enabled
+        self.top_n = top_n
+        self.output_path: t.Optional[Path] = None
+        self._previous: t.Optional[tracemalloc.Snapshot] = None
+        self._start_time = time.time()
+        self._started_tracing = False
+        if enabled:
+            output_dir = output_dir or get_settings().project_dir / "media"
+            output_dir.mkdir(parents=True, exist_ok=True)
+            self.output_path = output_dir / f"memory_{name}_{dt.datetime.utcnow().isoformat()}.txt"
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+
+    def checkpoint(self, phase: str) -> None:
+        if not self.enabled:
+            return
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*"),
+        ])
+        current, peak = tracemalloc.get_traced_memory()
+        if self._previous is None:
+            stats = snapshot.statistics("lineno")
+        else:
+            stats = snapshot.compare_to(self._previous, "lineno")
+        lines = [f"[{time.time() - self._start_time:.1f}s] {phase}: traced={current / 1024 ** 2:.1f}MB "
+                 f"(phase peak={peak / 1024 ** 2:.1f}MB) rss={get_rss_mb():.1f}MB (peak={get_peak_rss_mb():.1f}MB)"]
+        lines += [f"    {stat}" for stat in stats[:self.top_n]]
+        with open(self.output_path, "a") as f:  # written at each checkpoint in case the run crashes
+            f.write("\n".join(lines) + "\n\n")
+        logger.info("\n".join(lines))
+        self._previous = snapshot
+        tracemalloc.reset_peak()
+
+    def close(self) -> None:
+        if not self.enabled:
+            return
+        self._previous = None
+        if self._started_tracing:
+            tracemalloc.stop()
+        logger.info(f"Memory report saved to {self.output_path}")
+
+    def __enter__(self) -> 'MemoryTracker':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def memory_traced(func: t.Callable) -> t.Callable:
+    """Decorator for jobs, appending their peak traced memory, RSS and top allocation sites to
+    media/memory_jobs.jsonl when index_memory_profile is enabled.
+    tracemalloc is process-wide, so only jobs running alone in the main thread of their process are traced (process
+    and rq executors, local runs), jobs of the thread executor or of an already traced caller are skipped.
+    """
+
+    @fts.wraps(func)
+    def wrapper(*args, **kwargs):
+        settings = get_settings()
+        if (not settings.index_memory_profile or tracemalloc.is_tracing()
+                or threading.current_thread() is not threading.main_thread()):
+            return func(*args, **kwargs)
+        tracemalloc.start()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _, peak = tracemalloc.get_traced_memory()
+            top_stats = tracemalloc.take_snapshot().statistics("lineno")[:3]
+            tracemalloc.stop()
+            output_path = settings.project_dir / "media" / "memory_jobs.jsonl"
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(output_path, "a") as f:
+                f.write(json.dumps({
+                    "job": f"{func.__name__}({args[0] if args else ''})",
+                    "pid": os.getpid(),
+                    "peak_traced_mb": round(peak / 1024 ** 2, 2),
+                    "rss_mb": round(get_rss_mb(), 2),
+                    "top_sites": [str(stat) for stat in top_stats],
+                }) + "\n")
+
+    return wrapper
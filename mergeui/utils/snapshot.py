@@ -0,0 +1,173 @@
+import typing as t
+import array
+import datetime as dt
+import json
+import struct
+import sys
+import zlib
+from pathlib import Path
+from mergeui.utils import aware_to_naive_dt
+
+# file: MAGIC, version (uint16), row groups, END
+# row group: kind (1 byte), rows count (uint32), header length (uint32), JSON header [[column, type], ...],
+#   then per column: compressed length (uint32), zlib(null mask (1 byte per row) + non-null values)
+MAGIC = b"MERGEUI\x00"
+VERSION = 1
+END = b"E"
+ColumnType = t.Literal["null", "bool", "int", "float", "datetime", "str", "json"]
+_EPOCH = dt.datetime(1970, 1, 1)
+_ARRAY_TYPECODES = {"int": "q", "float": "d", "datetime": "q"}
+
+
+def _to_le_bytes(values: array.array) -> bytes:
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_le_bytes(typecode: str, data: bytes) -> array.array:
+    values = array.array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def get_column_type(values: list) -> ColumnType:
+    """Type of the non-null values of a column, JSON for mixed or nested values."""
+    types = {type(value) for value in values if value is not None}
+    if not types:
+        return "null"
+    if len(types) == 1:
+        type_ = types.pop()
+        for column_type, class_ in (("bool", bool), ("int", int), ("float", float), ("datetime", dt.datetime),
+                                    ("str", str)):
+            if type_ is class_:
+                return column_type  # noqa
+    return "json"
+
+
+def encode_column(values: list, column_type: ColumnType) -> bytes:
+    mask = bytes(value is not None for value in values)
+    values = [value for value in values if value is not None]
+    if column_type == "null":
+        payload = b""
+    elif column_type == "bool":
+        payload = bytes(values)
+    elif column_type == "datetime":
+        payload = _to_le_bytes(array.array("q", [(aware_to_naive_dt(value) - _EPOCH) // dt.timedelta(microseconds=1)
+                                                 for value in values]))  # naive datetimes in UTC
+    elif column_type in _ARRAY_TYPECODES:
+        payload = _to_le_bytes(array.array(_ARRAY_TYPECODES[column_type], values))
+    else:
+        encoded = [(value if column_type == "str" else json.dumps(value, default=str)).encode() for value in values]
+        payload = _to_le_bytes(array.array("I", map(len, encoded))) + b"".join(encoded)
+    return mask + payload
+
+
+def decode_column(data: bytes, rows_count: int, column_type: ColumnType) -> list:
+    mask, payload = data[:rows_count], data[rows_count:]
+    count = sum(mask)
+    if column_type == "null":
+        values = []
+    elif column_type == "bool":
+        values = [bool(value) for value in payload]
+    elif column_type == "datetime":
+        values = [_EPOCH + dt.timedelta(microseconds=value) for value in _from_le_bytes("q", payload)]
+    elif column_type in _ARRAY_TYPECODES:
+        values = _from_le_bytes(_ARRAY_TYPECODES[column_type], payload).tolist()
+    else:
+        lengths, offset, values = _from_le_bytes("I", payload[:4 * count]), 4 * count, []
+        for length in lengths:
+            value = payload[offset:offset + length].decode()
+            values.append(value if column_type == "str" else json.loads(value))
+            offset += length
+    values_iter = iter(values)
+    return [next(values_iter) if present else None for present in mask]
+
+
+class SnapshotWriter:
+    """Write rows (dicts) to a columnar binary snapshot, one row group per call of write (e.g. a batch of nodes)."""
+
+    def __init__(self, path: Path, compression_level: int = 6):
+        self.path = Path(path)
+        self.compression_level = compression_level
+        self._fp: t.Optional[t.BinaryIO] = None
+
+    def __enter__(self) -> 'SnapshotWriter':
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fp = open(self.path, "wb")
+        self._fp.write(MAGIC + struct.pack("<H", VERSION))
+        return self
+
+    def write(self, kind: bytes, rows: list[dict]) -> None:
+        if not rows:
+            return
+        columns = list(dict.fromkeys(key for row in rows for key in row))
+        columns_values = {column: [row.get(column) for row in rows] for column in columns}
+        header = [[column, get_column_type(values)] for column, values in columns_values.items()]
+        header_bytes = json.dumps(header).encode()
+        self._fp.write(kind + struct.pack("<II", len(rows), len(header_bytes)) + header_bytes)
+        for column, column_type in header:
+            data = zlib.compress(encode_column(columns_values[column], column_type), self.compression_level)
+            self._fp.write(struct.pack("<I", len(data)) + data)
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if exc_type is None:
+            self._fp.write(END)
+        self._fp.close()
+
+
+def _read_exactly(fp: t.BinaryIO, size: int) -> bytes:
+    data = fp.read(size)
+    if len(data) != size:
+        raise ValueError(f"Truncated snapshot file: {fp.name}")
+    return data
+
+
+def _read_file_header(fp: t.BinaryIO) -> None:
+    if fp.read(len(MAGIC)) != MAGIC:
+        raise ValueError(f"Not a snapshot file: {fp.name}")
+    version, = struct.unpack("<H", _read_exactly(fp, 2))
+    if version != VERSION:
+        raise ValueError(f"Unsupported snapshot version: {version}")
+
+
+def _iter_row_group_headers(fp: t.BinaryIO) -> t.Iterator[tuple[bytes, int, list]]:
+    while (kind := fp.read(1)) != END:
+        if not kind:
+            raise ValueError(f"Truncated snapshot file: {fp.name}")
+        rows_count, header_length = struct.unpack("<II", _read_exactly(fp, 8))
+        yield kind, rows_count, json.loads(_read_exactly(fp, header_length))
+
+
+def validate_snapshot(path: Path) -> dict[bytes, int]:
+    """Check the structure of a snapshot through to its end marker without decoding the values (cheap, run before
+    a destructive restore). Return the rows count of each kind, raise ValueError if invalid or truncated.
+    """
+    rows_counts: dict[bytes, int] = {}
+    with open(path, "rb") as fp:
+        _read_file_header(fp)
+        for kind, rows_count, header in _iter_row_group_headers(fp):
+            for _ in header:
+                data_length, = struct.unpack("<I", _read_exactly(fp, 4))
+                fp.seek(data_length, 1)  # past the end if truncated, then no end marker is read
+            rows_counts[kind] = rows_counts.get(kind, 0) + rows_count
+        if fp.read(1):
+            raise ValueError(f"Unexpected data after the end of the snapshot file: {path}")
+    return rows_counts
+
+
+def iter_snapshot(path: Path) -> t.Iterator[tuple[bytes, list[dict]]]:
+    """Row groups (kind, rows) of a snapshot, None values omitted from the rows."""
+    with open(path, "rb") as fp:
+        _read_file_header(fp)
+        for kind, rows_count, header in _iter_row_group_headers(fp):
+            rows = [{} for _ in range(rows_count)]
+            for column, column_type in header:
+                data_length, = struct.unpack("<I", _read_exactly(fp, 4))
+                values = decode_column(zlib.decompress(_read_exactly(fp, data_length)), rows_count, column_type)
+                for row, value in zip(rows, values):
+                    if value is not None:
+                        row[column] = value
+            yield kind, rows
@@ -1,10 +1,14 @@
 import typing as t
 import fastapi as fa
-from mergeui.core.dependencies import get_model_service
+import redis
+from mergeui.core.dependencies import get_model_service, get_redis_connection, get_db_connection
+from mergeui.core.db import DatabaseConnection
 from mergeui.services import ModelService
 from mergeui.core.schema import SortByOptionType, DisplayColumnType, ExcludeOptionType
-from mergeui.web.schema import ListModelsInputDTO, GetModelLineageInputDTO, GenericRO, PartialModel, DataGraph
+from mergeui.web.schema import ListModelsInputDTO, GetModelLineageInputDTO, GenericRO, PartialModel, DataGraph, \
+    RefreshModelLineageInputDTO, RefreshJob
 from mergeui.utils.web import api_error, models_as_partials, graph_as_data_graph
+from mergeui.utils.index.incremental import enqueue_lineage_refresh, get_lineage_refresh_status
 
 router = fa.APIRouter()
 
@@ -13,7 +17,7 @@ MaxHopsField = GetModelLineageInputDTO.model_fields['max_hops']
 
 
 @router.get('/model_lineage')
-def model_lineage(
+async def model_lineage(
         id_: str = fa.Query(alias='id'),
         directed: bool = DirectedField.default,
         max_hops: int = fa.Query(MaxHopsField.default, ge=1),
@@ -22,7 +26,7 @@ def model_lineage(
     try:
         inp = GetModelLineageInputDTO(id=id_, directed=directed, max_hops=max_hops,
                                       label_field=None, color_field=None)  # validate input
-        graph = model_service.get_model_lineage(
+        graph = await model_service.get_model_lineage_async(
             model_id=inp.id,
             directed=inp.directed,
             max_hops=inp.max_hops,
@@ -33,8 +37,33 @@ def model_lineage(
         raise api_error(e)
 
 
+@router.post('/model_lineage/refresh')
+def refresh_model_lineage(
+        id_: str = fa.Query(alias='id'),
+        max_hops: int = fa.Query(RefreshModelLineageInputDTO.model_fields['max_hops'].default, ge=0),
+        connection: redis.Redis = fa.Depends(get_redis_connection),
+) -> GenericRO[RefreshJob]:
+    try:
+        inp = RefreshModelLineageInputDTO(id=id_, max_hops=max_hops)  # validate input
+        job = enqueue_lineage_refresh(connection, model_id=inp.id, max_hops=inp.max_hops)
+        return GenericRO[RefreshJob](data=RefreshJob(**get_lineage_refresh_status(connection, job.id)))
+    except (ValueError, AssertionError) as e:
+        raise api_error(e)
+
+
+@router.get('/model_lineage/refresh/{job_id}')
+def get_model_lineage_refresh(
+        job_id: str,
+        connection: redis.Redis = fa.Depends(get_redis_connection),
+) -> GenericRO[RefreshJob]:
+    status = get_lineage_refresh_status(connection, job_id)
+    if status is None:
+        raise fa.HTTPException(status_code=404, detail=f"Refresh job {job_id} not found")
+    return GenericRO[RefreshJob](data=RefreshJob(**status))
+
+
 @router.get('/models')
-def list_models(
+async def list_models(
         query: t.Optional[str] = None,
         sort_by: t.Optional[SortByOptionType] = None,
         display_columns: t.List[DisplayColumnType] = fa.Query([]),
@@ -52,7 +81,7 @@ def list_models(
             query=query, sort_by=sort_by, display_columns=display_columns, excludes=excludes,
             author=author, license=license_, merge_method=merge_method,
             architecture=architecture, base_model=base_model)
-        models = model_service.list_models(
+        models = await model_service.list_models_async(
             query=inp.query,
             sort_by=inp.sort_by,
             excludes=inp.excludes,
@@ -67,3 +96,9 @@ def list_models(
         return GenericRO(data=data)  # return response
     except (ValueError, AssertionError) as e:
         raise api_error(e)
+
+
+@router.get('/stats')
+def get_stats(db_conn: DatabaseConnection = fa.Depends(get_db_connection)) -> GenericRO[dict]:
+    """Database connection pool usage and query templates text reuse rates."""
+    return GenericRO[dict](data=db_conn.stats())
@@ -2,6 +2,7 @@ import typing as t
 import pydantic as pd
 from mergeui.core.schema import Model, ExcludeOptionType, SortByOptionType, DisplayColumnType
 from mergeui.core.dependencies import get_settings
+from mergeui.utils import is_valid_repo_id
 from mergeui.utils.types import create_partial_type_from_class
 
 settings = get_settings()
@@ -23,6 +24,18 @@ class GetModelLineageInputDTO(pd.BaseModel):
                                                        description="Field to use for generating colors")
 
 
+class RefreshModelLineageInputDTO(pd.BaseModel):
+    id: str = pd.Field(description="Model ID", min_length=1)
+    max_hops: int = pd.Field(2, description="Max distance of the ancestors to reindex", ge=0, le=settings.max_hops)
+
+    @pd.field_validator("id")
+    @classmethod
+    def check_repo_id(cls, value: str) -> str:
+        if not is_valid_repo_id(value):
+            raise ValueError(f"Invalid model ID (expected author/model): {value}")
+        return value
+
+
 class ListModelsInputDTO(pd.BaseModel):
     query: t.Optional[str] = pd.Field(None, description="Search query")
     sort_by: t.Optional[SortByOptionType] = pd.Field(None, description="Sort by")
@@ -54,3 +67,10 @@ DataFrameDataType = tuple[list[list], list[str], list[str]]
 class DataGraph(pd.BaseModel):
     nodes: list[dict] = pd.Field(default_factory=list)
     relationships: list[dict] = pd.Field(default_factory=list)
+
+
+class RefreshJob(pd.BaseModel):
+    job_id: str
+    status: t.Optional[str] = None
+    result: t.Optional[dict] = None
+    error: t.Optional[str] = None
@@ -0,0 +1,18 @@
+from mergeui.cli.index import _register_hub_id, _resolve_merge_map
+from mergeui.utils.index.data_extraction import resolve_model_id
+
+
+def test_register_hub_id():
+    known_ids, merge_map = {}, {}
+    # a card references a misspelled base model before its Hub ID is known
+    assert resolve_model_id("mistralai/mistral-7b-v0.1", known_ids) == "mistralai/mistral-7b-v0.1"
+    _register_hub_id(known_ids, merge_map, "mistralai/Mistral-7B-v0.1")  # returned by its job
+    assert merge_map == {"mistralai/mistral-7b-v0.1": "mistralai/Mistral-7B-v0.1"}
+    assert resolve_model_id("MistralAI/MISTRAL-7B-v0.1", known_ids) == "mistralai/Mistral-7B-v0.1"
+    _register_hub_id(known_ids, merge_map, "mistralai/Mistral-7B-v0.1")
+    assert len(merge_map) == 1
+
+
+def test_resolve_merge_map():
+    assert _resolve_merge_map({"a": "b", "b": "c", "d": "e"}) == {"a": "c", "b": "c", "d": "e"}
+    assert _resolve_merge_map({"a": "b", "b": "a"}) == {}  # no merge on cycles
@@ -0,0 +1,105 @@
+import threading
+import pytest
+from mergeui.core.db import DatabaseClientPool, DatabaseConnection, ReplicaRouter, QueryTemplates, param_refs, \
+    execute_template
+from mergeui.core.retry import QueryRetrier, CircuitBreaker, query_retrier
+
+
+class FakeClient:
+    def __init__(self):
+        self.healthy = True
+
+    def execute_and_fetch(self, query: str, parameters: dict = None):
+        if not self.healthy:
+            raise ConnectionError("failed to receive chunk size")
+        return iter([{"ok": 1}])
+
+
+def test_database_client_pool():
+    pool = DatabaseClientPool(FakeClient, size=2, timeout=0.1, health_check_interval=0)
+    with pool.acquire() as client:
+        with pool.acquire() as nested_client:  # same thread => same client
+            assert nested_client is client
+        assert pool.in_use_count == 1
+    assert pool.in_use_count == 0
+    with pool.acquire() as reused_client:
+        assert reused_client is client
+    # bounded
+    clients, release = [], threading.Event()
+
+    def hold():
+        with pool.acquire() as _client:
+            clients.append(_client)
+            release.wait()
+
+    threads = [threading.Thread(target=hold) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    while len(clients) < 2:
+        pass
+    with pytest.raises(TimeoutError):
+        with pool.acquire():
+            pass
+    release.set()
+    for thread in threads:
+        thread.join()
+    # broken clients are replaced
+    for _client in clients:
+        _client.healthy = False
+    with pool.acquire() as new_client:
+        assert new_client not in clients and new_client.healthy
+
+
+def test_query_templates():
+    templates = QueryTemplates()
+    for model_id in ["a/b", "c/d", "e'f"]:
+        refs, params = param_refs(dict(id=model_id, license=None), prefix="f_")
+        query = templates.get("get_model", tuple(refs), lambda: f"MATCH (n {{id: {refs['id']}}}) RETURN n")
+        assert query == "MATCH (n {id: $f_id}) RETURN n"
+        assert params == {"f_id": model_id}
+    assert templates.stats() == {"get_model": {"executions": 3, "query_texts": 1, "text_reuse_rate": 0.6667}}
+
+
+class BrokenReplicaClient(FakeClient):
+    def execute_and_fetch(self, query: str, parameters: dict = None):
+        if query != "RETURN 1 AS ok":  # health checks pass, the connection breaks on queries
+            raise ConnectionError("failed to receive chunk size")
+        return super().execute_and_fetch(query, parameters)
+
+
+def test_read_routing():
+    clients = {"r1": [], "r2": []}
+
+    def create_replica_client(name: str, client_class: type):
+        def create_client():
+            client = client_class()
+            client.query_retrier = QueryRetrier(max_attempts=2, base_delay=0.001,
+                                                breaker=CircuitBreaker(failure_threshold=1, reset_timeout=60))
+            clients[name].append(client)
+            return client
+
+        return create_client
+
+    db_conn = DatabaseConnection.__new__(DatabaseConnection)  # no database
+    db_conn.pool = DatabaseClientPool(FakeClient, size=2)
+    replica_pools = [DatabaseClientPool(create_replica_client("r1", FakeClient), size=2, check_new_clients=True),
+                     DatabaseClientPool(create_replica_client("r2", BrokenReplicaClient), size=2,
+                                        check_new_clients=True)]
+    db_conn.replicas = ReplicaRouter(replica_pools, names=["r1", "r2"], cooldown=60)
+
+    def read(db):
+        assert execute_template(db, "MATCH (n) RETURN n") == [{"ok": 1}]
+        return db
+
+    # failing replica: the read is rerun on main, the breaker of main is not affected
+    client = db_conn.read(read)
+    assert clients["r2"] and client not in clients["r1"] + clients["r2"]
+    assert clients["r2"][0].query_retrier.breaker.state == "open"
+    assert query_retrier.breaker.state == "closed"
+    # reads balanced between healthy replicas (r2 skipped during cooldown)
+    assert db_conn.read(read) in clients["r1"] and db_conn.read(read) in clients["r1"]
+    assert db_conn.read(lambda db: db_conn.read(lambda nested_db: nested_db is db))  # nested reads
+    # reads in a unit of work on main
+    with db_conn.acquire() as client:
+        assert db_conn.read(lambda db: db) is client
+    assert [(r["name"], r["healthy"]) for r in db_conn.replicas.stats()["replicas"]] == [("r1", True), ("r2", False)]
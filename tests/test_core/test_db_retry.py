@@ -0,0 +1,38 @@
+import time
+import pytest
+from mergeui.core.retry import QueryRetrier, CircuitBreaker, DatabaseUnavailableError
+
+
+def test_query_retrier():
+    retrier = QueryRetrier(max_attempts=3, base_delay=0.001, breaker=CircuitBreaker(failure_threshold=10))
+    calls, reconnects = [], []
+
+    def flaky_query():
+        calls.append(1)
+        if len(calls) < 3:
+            raise ConnectionError("failed to receive chunk size")
+        return "ok"
+
+    assert retrier.call(flaky_query, reconnect=lambda: reconnects.append(1)) == "ok"
+    assert len(calls) == 3 and len(reconnects) == 2
+    with pytest.raises(ValueError):  # not retried
+        retrier.call(lambda: (calls.append(1), int("x")))
+    assert len(calls) == 4
+    assert retrier.stats()["retries"] == 2 and retrier.stats()["breaker"]["state"] == "closed"
+
+
+def test_circuit_breaker():
+    retrier = QueryRetrier(max_attempts=5, base_delay=0.001,
+                           breaker=CircuitBreaker(failure_threshold=2, reset_timeout=0.05))
+
+    def down():
+        raise ConnectionError("Connection refused")
+
+    with pytest.raises(ConnectionError):
+        retrier.call(down)
+    assert retrier.breaker.state == "open"
+    with pytest.raises(DatabaseUnavailableError):  # fail fast
+        retrier.call(lambda: "ok")
+    time.sleep(0.06)
+    assert retrier.call(lambda: "ok") == "ok"  # trial call closes the breaker
+    assert retrier.stats()["breaker"] == {"state": "closed", "consecutive_failures": 0, "opened": 1, "rejected": 1}
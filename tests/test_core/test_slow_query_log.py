@@ -0,0 +1,44 @@
+import json
+from loguru import logger
+from mergeui.core.slow_query_log import SlowQueryLog, get_query_shape
+
+
+class PlanClient:
+    def __init__(self):
+        self.queries = []
+
+    def execute_and_fetch(self, query, parameters=None):
+        self.queries.append(query)
+        return iter([{"OPERATOR": "* ScanAll (n)", "ACTUAL HITS": 3}])
+
+
+def test_get_query_shape():
+    assert get_query_shape("MATCH (n:Model {id: 'a/b'})\n  RETURN n LIMIT 10") == \
+           get_query_shape("MATCH (n:Model {id: \"c/d\"}) RETURN n LIMIT 20") == \
+           "MATCH (n:Model {id: ?}) RETURN n LIMIT ?"
+    assert get_query_shape("MATCH (n) WHERE n.gsm8k_score > $min RETURN n") == \
+           "MATCH (n) WHERE n.gsm8k_score > $min RETURN n"
+
+
+def test_slow_query_log(tmp_path):
+    path = tmp_path / "slow_queries.jsonl"
+    slow_query_log, db = SlowQueryLog(), PlanClient()
+    slow_query_log.configure(threshold=0.5, path=path)
+    try:
+        slow_query_log.record(db, "MATCH (n) RETURN n LIMIT 5", None, 0.1, rows_count=5)  # fast
+        slow_query_log.record(db, "MATCH (n) RETURN n LIMIT 5", None, 0.8, rows_count=5)
+        slow_query_log.record(db, "MATCH (n) RETURN n LIMIT 10", {"x": 1}, 1.2, rows_count=10)
+        slow_query_log.record(db, "MATCH (n) SET n.x = $x", {"x": 1}, 0.6, rows_count=0)
+        logger.complete()
+    finally:
+        slow_query_log.configure(threshold=None, path=path)
+    assert db.queries == ["PROFILE MATCH (n) RETURN n LIMIT 5", "PROFILE MATCH (n) RETURN n LIMIT 10",
+                          "EXPLAIN MATCH (n) SET n.x = $x"]  # write queries are not executed again
+    stats = slow_query_log.stats()
+    assert [(s["shape"], s["count"]) for s in stats] == [("MATCH (n) RETURN n LIMIT ?", 2),
+                                                         ("MATCH (n) SET n.x = $x", 1)]
+    assert stats[0]["max_time"] == 1.2 and stats[0]["mean_time"] == 1.0
+    records = [json.loads(line)["record"]["extra"] for line in path.read_text().splitlines()]
+    assert len(records) == 3
+    assert records[1]["parameters"] == "{'x': 1}" and records[1]["rows_count"] == 10
+    assert records[1]["plan"] == ["PROFILE:", "* ScanAll (n) | 3"]
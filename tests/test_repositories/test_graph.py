@@ -43,6 +43,9 @@ def test_list_nodes(graph_repository):
 def test_list_nodes__limit(graph_repository):
     result = graph_repository.list_nodes(limit=2)
     assert len(result) == 2
+    query_texts = graph_repository.db_conn.templates.stats()["list_nodes"]["query_texts"]
+    assert len(graph_repository.list_nodes(limit=3)) == 3
+    assert graph_repository.db_conn.templates.stats()["list_nodes"]["query_texts"] == query_texts  # limit is bound
 
 
 def test_list_nodes__filters(graph_repository):
@@ -148,6 +151,34 @@ def test_create_relationship(graph_repository):
     assert sub_graph.relationships[0]._type == 'DUMMY_TYPE'
 
 
+@pytest.mark.run(order=-5)
+def test_upsert_nodes_and_create_relationships(graph_repository):
+    graph_repository.upsert_nodes(
+        label='DummyLabel',
+        nodes=[{'id': 'c', 'name': "C", 'labels': ['DummyLabel', 'OtherLabel']}, {'id': 'd', 'name': "D"}],
+    )
+    relationships = [{'source': 'c', 'target': 'd', 'method': 'x', 'origin': 'o'},
+                     {'source': 'c', 'target': 'e', 'method': 'x'}]  # null origin
+    texts_before = graph_repository.db_conn.templates.stats().get("create_relationships", {}).get("query_texts", 0)
+    for _ in range(2):  # merged on method and origin, no duplicates
+        graph_repository.create_relationships(
+            label='DummyLabel',
+            relationship_type='DUMMY_TYPE',
+            relationships=relationships,
+            merge_keys=['method', 'origin'],
+            create_missing_nodes=True,
+        )
+    sub_graph = graph_repository.get_sub_graph(
+        label='DummyLabel',
+        start_id='c',
+    )
+    assert len(sub_graph.nodes) == 3
+    assert len(sub_graph.relationships) == 2
+    stats = graph_repository.db_conn.templates.stats()
+    assert stats["create_relationships"]["query_texts"] <= texts_before + 2  # one text per set of non-null keys
+    assert "upsert_nodes" in stats
+
+
 @pytest.mark.run(order=-4)
 def test_set_properties(graph_repository):
     filters = dict(id='Q-bert/MetaMath-Cybertron-Starling')
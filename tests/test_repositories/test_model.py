@@ -1,3 +1,7 @@
+import datetime as dt
+import pytest
+from gqlalchemy.query_builders.memgraph_query_builder import Order
+from mergeui.core.db import execute_template
 from mergeui.core.schema import Model
 
 
@@ -47,3 +51,32 @@ def test_list_models(model_repository):
     # merge_method
     result = model_repository.list_models(filters=dict(merge_method='slerp'))
     assert len(result) == 2
+
+
+def test_list_models_sort_index_scan(model_repository):
+    # most likes, then default (models without created_at are read by a second query, see list_models)
+    for sort_key, sort_order in [("likes", Order.DESC), ("created_at", Order.ASC)]:
+        cypher, params = model_repository.get_list_models_query(
+            sort_key=sort_key, sort_order=sort_order, sort_exclude_null_on_key=True, limit=3)
+        assert "DISTINCT" not in cypher and params == {"limit": 3}
+        with model_repository.db_conn.acquire() as db:
+            plan = [row["QUERY PLAN"] for row in execute_template(db, f"EXPLAIN {cypher}", params)]
+        assert any("ScanAllByLabelProperty" in operator for operator in plan)
+    result = model_repository.list_models(sort_key="likes", sort_order=Order.DESC, sort_exclude_null_on_key=True,
+                                          limit=3)
+    assert [m.likes for m in result] == sorted([m.likes for m in result], reverse=True)
+
+
+@pytest.mark.run(order=-6)
+def test_list_models_nulls_last(model_repository, graph_repository):
+    graph_repository.upsert_nodes(label="DummyModel", nodes=[
+        {"id": "a", "created_at": dt.datetime(2024, 2, 1)},
+        {"id": "b", "created_at": dt.datetime(2024, 1, 1)},
+        {"id": "c"},
+    ])
+    for limit, expected_ids in [(1, ["b"]), (2, ["b", "a"]), (3, ["b", "a", "c"]), (None, ["b", "a", "c"])]:
+        result = model_repository.list_models(label="DummyModel", sort_key="created_at", limit=limit)
+        assert [m.id for m in result] == expected_ids
+    result = model_repository.list_models(label="DummyModel", sort_key="created_at", sort_order=Order.DESC,
+                                          sort_exclude_null_on_key=True)
+    assert [m.id for m in result] == ["a", "b"]
@@ -1,3 +1,6 @@
+import asyncio
+
+
 def test_get_model_id_choices(model_service):
     result = model_service.get_model_id_choices()
     assert 'fblgit/una-cybertron-7b-v2-bf16' in result
@@ -83,3 +86,15 @@ def test_list_models__sort_by(model_service):
 def test_get_default_model_id(model_service):
     result = model_service.get_default_model_id()
     assert result == "Q-bert/MetaMath-Cybertron-Starling"
+
+
+def test_async_read_path(model_service):
+    async def concurrent_reads():
+        return await asyncio.gather(
+            model_service.get_model_lineage_async(model_id='Q-bert/MetaMath-Cybertron', directed=True),
+            *[model_service.list_models_async(license_='apache-2.0') for _ in range(20)],
+        )
+
+    lineage, *models_lists = asyncio.run(concurrent_reads())
+    assert len(lineage.nodes) == 3
+    assert all(len(models) == 5 for models in models_lists)
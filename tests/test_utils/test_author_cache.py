@@ -0,0 +1,28 @@
+import threading
+from huggingface_hub import hf_api
+from mergeui.utils.index import author_cache
+from mergeui.utils.index.author_cache import AuthorListingCache
+
+
+def test_author_listing_cache(monkeypatch):
+    calls = []
+
+    def list_model_infos(*, author: str, **kwargs) -> list[hf_api.ModelInfo]:
+        calls.append(author)
+        return [hf_api.ModelInfo(id=f"{author}/model-{i}", private=False, downloads=0, likes=0, tags=[])
+                for i in range(3)]
+
+    monkeypatch.setattr(author_cache, "list_model_infos", list_model_infos)
+    cache = AuthorListingCache(connection=None, ttl=60)
+    threads = [threading.Thread(target=cache.get_model_info, args=(f"org/model-{i}",)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert calls == ["org"]
+    assert cache.get_model_info("org/model-1").id == "org/model-1"
+    assert cache.get_model_info("org/missing") is None
+    assert calls == ["org"]
+    cache.clear()
+    cache.get_model_info("org/model-1")
+    assert calls == ["org", "org"]
@@ -0,0 +1,10 @@
+from mergeui.utils.index.autoscaling import ScalingPolicy
+
+
+def test_get_desired_workers():
+    policy = ScalingPolicy(min_workers=2, max_workers=10, jobs_per_worker=4, target_drain_time=60)
+    assert policy.get_desired_workers(queue_depth=0, busy_workers=0, latency=None) == 2  # min bound
+    assert policy.get_desired_workers(queue_depth=20, busy_workers=0, latency=None) == 5  # latency not known yet
+    assert policy.get_desired_workers(queue_depth=100, busy_workers=0, latency=3.0) == 5
+    assert policy.get_desired_workers(queue_depth=1000, busy_workers=0, latency=3.0) == 10  # max bound
+    assert policy.get_desired_workers(queue_depth=0, busy_workers=4, latency=3.0) == 4  # keep busy workers
@@ -1,12 +1,12 @@
 import pytest
 from huggingface_hub import hf_api
-from mergeui.utils import parse_yaml, is_valid_repo_id
+from mergeui.utils import parse_yaml, is_valid_repo_id, normalize_model_id
 from mergeui.utils.index.data_extraction import get_data_origin, list_model_infos, get_model_info, \
     download_file_from_hf, download_mergekit_config, download_readme, load_model_card, \
     extract_base_models_from_mergekit_config, extract_merge_method_from_mergekit_config, \
     extract_base_models_from_card_data, extract_license_from_card_data, extract_base_models_from_tags, \
     extract_card_data_string_from_readme, extract_mergekit_configs_string_from_readme, \
-    extract_repo_url_from_gated_repo_error
+    extract_repo_url_from_gated_repo_error, resolve_model_id
 
 
 # ##### Hub #####
@@ -48,6 +48,25 @@ def test_is_valid_repo_id(invalid_repo_ids, valid_repo_ids):
         assert is_valid_repo_id(repo_id)
 
 
+def test_normalize_model_id():
+    assert normalize_model_id(" mlabonne/Zebrafish-7B/ ") == "mlabonne/Zebrafish-7B"
+    assert normalize_model_id("https://huggingface.co/mlabonne/Zebrafish-7B") == "mlabonne/Zebrafish-7B"
+    assert normalize_model_id("hf.co/mlabonne/Zebrafish-7B") == "mlabonne/Zebrafish-7B"
+    assert normalize_model_id("/content/drive/MyDrive/WestLake/") == "/content/drive/MyDrive/WestLake"
+    assert normalize_model_id("./primordial_slop_c") == "./primordial_slop_c"
+
+
+def test_resolve_model_id(invalid_repo_ids):
+    known_ids = {"mlabonne/zebrafish-7b": "mlabonne/Zebrafish-7B"}
+    assert resolve_model_id("MLabonne/zebrafish-7B/", known_ids) == "mlabonne/Zebrafish-7B"
+    assert resolve_model_id("x/Y", known_ids) == "x/Y"
+    assert known_ids["x/y"] == "x/Y"
+    assert resolve_model_id("X/y", known_ids) == "x/Y"
+    for repo_id in invalid_repo_ids:
+        assert not is_valid_repo_id(resolve_model_id(repo_id, known_ids))
+    assert len(known_ids) == 2
+
+
 def test_get_data_origin(settings):
     # listing
     expected = ("https://huggingface.co/api/models?author=mlabonne&model_name=Zebrafish-7B"
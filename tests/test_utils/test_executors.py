@@ -0,0 +1,36 @@
+import pytest
+from mergeui.utils.index.executors import create_index_executor, ThreadExecutor, ProcessExecutor
+from mergeui.utils.index.retry import RetryPolicy, RetryTracker
+
+
+def drain(executor) -> tuple[list, list]:
+    finished, dead = [], []
+    while executor.in_flight_count:
+        _finished, _dead = executor.poll()
+        finished.extend(_finished)
+        dead.extend(_dead)
+        if not _finished and not _dead:
+            executor.wait(0.1)
+    return finished, dead
+
+
+@pytest.mark.parametrize("executor_name,executor_class", [("thread", ThreadExecutor), ("process", ProcessExecutor)])
+def test_local_executors(settings, executor_name, executor_class):
+    retry_tracker = RetryTracker(RetryPolicy(max_attempts=2, base_delay=0.0))
+    with create_index_executor(settings, retry_tracker, executor_name) as executor:
+        assert isinstance(executor, executor_class)
+        assert executor.get_max_in_flight() > 0
+        executor.submit(str.upper, [["a/b"], ["c/d"]])
+        executor.submit(int, [["not-a-number"]])  # permanent failure
+        finished, dead = drain(executor)
+    assert sorted(task.value for task in finished) == ["A/B", "C/D"]
+    assert {task.stage for task in finished} == {"index"}
+    assert [task.model_id for task in dead] == ["not-a-number"]
+    assert "int__not-a-number" in retry_tracker.dead_letters
+    assert executor.metrics.completed == 2
+    assert executor.metrics.dead_lettered == 1
+
+
+def test_unknown_executor(settings):
+    with pytest.raises(ValueError):
+        create_index_executor(settings, RetryTracker(RetryPolicy()), "unknown")
@@ -0,0 +1,25 @@
+from huggingface_hub import hf_api
+from mergeui.utils.index.extraction_cache import ExtractionCache
+from mergeui.utils.index.jobs import extract_model_data
+
+
+def test_extraction_cache(tmp_path):
+    extraction_cache = ExtractionCache(tmp_path / "extraction_cache.sqlite3")
+    node = {"id": "org/model", "name": "Model", "likes": 1, "sha": "abc", "labels": ["Model", "MergedModel"]}
+    rels = [{"type": "DERIVED_FROM", "source": "org/model", "target": "org/base", "method": "tags"}]
+    extraction_cache.add("org/model", "abc", node, rels)
+    assert extraction_cache.get("org/model", "abc") == (node, rels)
+    assert extraction_cache.get("org/model", "def") is None  # repo changed
+    assert len(extraction_cache) == 1
+
+
+def test_extract_model_data_unchanged(tmp_path):
+    node = {"id": "org/model", "name": "Model", "likes": 1, "sha": "abc", "labels": ["Model", "MergedModel"]}
+    rels = [{"type": "DERIVED_FROM", "source": "org/model", "target": "org/base", "method": "tags"}]
+    model_info = hf_api.ModelInfo(id="org/model", sha="abc", private=False, downloads=10, likes=5, tags=[],
+                                  lastModified="2024-05-01T00:00:00.000Z")
+    artifacts = {"model_info": model_info, "model_info_origin": None, "cached_extraction": (node, rels)}
+    new_node, new_rels = extract_model_data("org/model", str(tmp_path), artifacts)
+    assert new_rels == rels
+    assert new_node["name"] == "Model" and new_node["labels"] == ["Model", "MergedModel"]
+    assert new_node["likes"] == 5 and new_node["downloads"] == 10  # volatile fields refreshed
@@ -0,0 +1,35 @@
+import json
+from mergeui.utils import parse_iso_dt
+from mergeui.utils.index.feed import LocalChangeFeed, HighWaterMark, poll_changes
+
+
+def test_poll_changes(tmp_path):
+    feed_path = tmp_path / "feed.jsonl"
+    rows = [
+        {"id": "a/old", "updated_at": "2024-01-01T00:00:00.000Z"},
+        {"id": "a/b", "updated_at": "2024-01-02T00:00:00.000Z"},
+        {"id": "a/c", "updated_at": "2024-01-03T00:00:00.000Z"},
+        {"id": "a/d", "updated_at": "2024-01-03T00:00:00.000Z"},
+    ]
+    feed_path.write_text("\n".join(json.dumps(row) for row in rows))
+    feed = LocalChangeFeed(feed_path)
+    hwm = HighWaterMark()
+    assert {e.model_id for e in poll_changes(feed, hwm)} == {"a/old", "a/b", "a/c", "a/d"}
+    # only the newest changes
+    hwm = HighWaterMark(updated_at=parse_iso_dt(rows[1]["updated_at"]), model_ids={"a/x"})
+    entries = poll_changes(feed, hwm)
+    assert {e.model_id for e in entries} == {"a/c", "a/d", "a/b"}
+    hwm.advance(entries)
+    assert hwm.model_ids == {"a/c", "a/d"}
+    assert poll_changes(feed, hwm) == []
+    # new change at the same time as the high-water mark
+    rows.append({"id": "a/e", "updated_at": "2024-01-03T00:00:00.000Z"})
+    feed_path.write_text("\n".join(json.dumps(row) for row in rows))
+    assert [e.model_id for e in poll_changes(feed, hwm)] == ["a/e"]
+    # failed models are kept to be retried
+    hwm.advance([], failed_model_ids=["a/c"])
+    assert hwm.retry_model_ids == {"a/c"} and hwm.model_ids == {"a/c", "a/d"}
+    # persisted state
+    hwm.save(tmp_path / "state.json")
+    assert HighWaterMark.load(tmp_path / "state.json") == hwm
+    assert HighWaterMark.load(tmp_path / "missing.json") == HighWaterMark()
@@ -0,0 +1,23 @@
+import json
+import pytest
+from mergeui.utils.graph_json import iter_graph_json_items
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+def test_iter_graph_json_items(graph_json_path, chunk_size):
+    json_graph = json.loads(graph_json_path.read_text())
+    assert list(iter_graph_json_items(graph_json_path, "nodes", chunk_size=chunk_size)) == json_graph["nodes"]
+    assert list(iter_graph_json_items(graph_json_path, "relationships", chunk_size=chunk_size)) == \
+           json_graph["relationships"]
+
+
+def test_iter_graph_json_items_order(tmp_path):
+    json_path = tmp_path / "graph.json"
+    json_path.write_text('{"relationships": [{"source": "a", "target": "b", "weight": 12.5}], "nodes_count": 1234,'
+                         ' "nodes": [], "meta": {"nodes": [1]}}')
+    assert list(iter_graph_json_items(json_path, "relationships", chunk_size=3)) == \
+           [{"source": "a", "target": "b", "weight": 12.5}]
+    assert list(iter_graph_json_items(json_path, "nodes", chunk_size=3)) == []
+    json_path.write_text('{"nodes": [{"id": "a"}')
+    with pytest.raises(ValueError):
+        list(iter_graph_json_items(json_path, "nodes"))
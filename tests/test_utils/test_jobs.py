@@ -0,0 +1,52 @@
+import pytest
+from huggingface_hub import hf_api
+from mergeui.utils.index import jobs
+from mergeui.utils.index.jobs import write_model_data, fetch_model_artifacts
+from mergeui.utils.index.negative_cache import NegativeCache
+
+
+def test_fetch_model_artifacts_bypass_negative_cache(tmp_path, monkeypatch):
+    negative_cache = NegativeCache(tmp_path / "negative_cache.sqlite3", ttl=60)
+    negative_cache.add("org/model", "not found or private")
+    calls = []
+
+    def get_model_info(model_id: str, **kwargs) -> tuple[hf_api.ModelInfo, str]:
+        calls.append(model_id)
+        return hf_api.ModelInfo(id=model_id, private=False, downloads=0, likes=0, tags=[]), "origin"
+
+    monkeypatch.setattr(jobs, "get_negative_cache", lambda: negative_cache)
+    monkeypatch.setattr(jobs, "get_model_info", get_model_info)
+    monkeypatch.setattr(jobs, "download_readme", lambda *args: (None, None))
+    monkeypatch.setattr(jobs, "download_mergekit_config", lambda *args: (None, None))
+    assert fetch_model_artifacts("org/model")["model_info"] is None
+    assert calls == []
+    assert fetch_model_artifacts("org/model", bypass_negative_cache=True)["model_info"].id == "org/model"
+    assert calls == ["org/model"]
+    assert negative_cache.get("org/model") is None  # available again
+
+
+@pytest.mark.run(order=-6)
+def test_write_model_data_replace(graph_repository):
+    model_id = "org/refreshed-merge"
+    node = {"id": model_id, "name": "Merge", "description": "old card", "merge_method": "slerp",
+            "labels": ["Model", "MergedModel"]}
+    rels = [
+        {"type": "DERIVED_FROM", "source": model_id, "target": "org/base-a", "method": "tags"},
+        {"type": "DERIVED_FROM", "source": model_id, "target": "org/base-b", "method": "cardData.base_model"},
+    ]
+    write_model_data(node, rels)
+    sub_graph = graph_repository.get_sub_graph(label="Model", start_id=model_id)
+    assert len(sub_graph.relationships) == 2
+    # base model removed from the card
+    write_model_data({"id": model_id, "name": "Merge", "labels": ["Model", "MergedModel"]}, rels[:1], replace=True)
+    sub_graph = graph_repository.get_sub_graph(label="Model", start_id=model_id)
+    assert len(sub_graph.relationships) == 1
+    assert {node.id for node in sub_graph.nodes} == {model_id, "org/base-a"}
+    node = next(node for node in sub_graph.nodes if node.id == model_id)
+    assert getattr(node, "description", None) is None and getattr(node, "merge_method", None) is None
+    # no base models left
+    write_model_data({"id": model_id, "name": "Merge", "labels": ["Model"]}, [], replace=True)
+    nodes = graph_repository.list_nodes(label="MergedModel", filters=dict(id=model_id))
+    assert not nodes
+    assert len(graph_repository.get_sub_graph(label="Model", start_id=model_id).relationships) == 0
+    assert len(graph_repository.list_nodes(label="Model", filters=dict(id="org/base-b"))) == 1  # base models are kept
@@ -0,0 +1,22 @@
+from loguru import logger
+from mergeui.utils import logging
+from mergeui.utils.logging import log_sampled, log_throttled, is_enabled
+
+
+def test_log_sampled_and_throttled(monkeypatch):
+    assert is_enabled("INFO") and not is_enabled("DEBUG")
+    messages = []
+    handler_id = logger.add(messages.append, level="TRACE", format="{message}")
+    try:
+        for i in range(10):
+            log_sampled("INFO", "not sampled {}", i, every=5)  # only DEBUG and TRACE are sampled
+        for i in range(3):
+            log_throttled("WARNING", "throttled {}", i, interval=3600)
+        log_sampled("DEBUG", "filtered {}", object())  # below the level of the settings
+        monkeypatch.setitem(logging._config, "min_level_no", 0)
+        for i in range(10):
+            log_sampled("DEBUG", "sampled {}", i, every=5)
+    finally:
+        logger.remove(handler_id)
+    assert [m.strip() for m in messages] == [f"not sampled {i}" for i in range(10)] + \
+           ["throttled 0", "sampled 0", "sampled 5"]
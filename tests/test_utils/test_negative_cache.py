@@ -0,0 +1,24 @@
+from concurrent.futures import ThreadPoolExecutor
+import time
+from mergeui.utils.index.negative_cache import NegativeCache
+
+
+def test_negative_cache(tmp_path):
+    negative_cache = NegativeCache(tmp_path / "negative_cache.sqlite3", ttl=0.2)
+    assert negative_cache.get("org/model") is None
+    negative_cache.add("org/model", "not found or private")
+    assert negative_cache.get("org/model") == "not found or private"
+    assert len(NegativeCache(tmp_path / "negative_cache.sqlite3", ttl=0.2)) == 1  # persisted
+    time.sleep(0.3)
+    assert negative_cache.get("org/model") is None
+    assert negative_cache.purge_expired() == 1
+    assert len(negative_cache) == 0
+
+
+def test_negative_cache_threads(tmp_path):
+    negative_cache = NegativeCache(tmp_path / "negative_cache.sqlite3", ttl=60)
+    negative_cache.add("org/main", "invalid ID")  # connection of the main thread
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda i: negative_cache.add(f"org/model-{i}", "not found or private"), range(16)))
+        assert all(executor.map(lambda i: negative_cache.get(f"org/model-{i}"), range(16)))
+    assert len(negative_cache) == 17
@@ -0,0 +1,56 @@
+import json
+import threading
+import tracemalloc
+from mergeui.utils import profiling
+from mergeui.utils.profiling import profiled, profilable, get_rss_mb, MemoryTracker, memory_traced
+
+
+def busy_loop(n: int) -> int:
+    return sum(i * i for i in range(n))
+
+
+def test_profiled(tmp_path):
+    with profiled("test", output_dir=tmp_path, interval=0.001, top_n=5) as profiler:
+        busy_loop(2_000_000)
+    assert profiler.samples_count > 0
+    folded_files = list(tmp_path.glob("profile_test_*.folded"))
+    summary_files = list(tmp_path.glob("profile_test_*.txt"))
+    assert len(folded_files) == 1 and len(summary_files) == 1
+    stack, count = folded_files[0].read_text().splitlines()[0].rsplit(" ", 1)
+    assert int(count) > 0
+    assert "test_profiled" in stack
+    assert "Top 5 by self time:" in summary_files[0].read_text()
+
+
+def test_profilable():
+    assert profilable("test")(busy_loop)(10) == busy_loop(10)
+    with profiled("test", enabled=False) as profiler:
+        assert profiler is None
+
+
+def test_memory_tracker(tmp_path):
+    assert get_rss_mb() > 0
+    with MemoryTracker("test", output_dir=tmp_path, top_n=3) as tracker:
+        tracker.checkpoint("start")
+        data = [str(i) * 10 for i in range(100_000)]
+        tracker.checkpoint("allocated")
+        del data
+    report = tracker.output_path.read_text()
+    assert "start: traced=" in report
+    assert "allocated: traced=" in report
+    assert "test_profiling.py" in report
+
+
+def test_memory_traced(tmp_path, settings, monkeypatch):
+    monkeypatch.setattr(profiling, "get_settings",
+                        lambda: settings.model_copy(update={"index_memory_profile": True, "project_dir": tmp_path}))
+    traced = memory_traced(lambda n: (tracemalloc.is_tracing(), busy_loop(n)))
+    assert traced(10) == (True, busy_loop(10))
+    assert not tracemalloc.is_tracing()
+    results = []
+    thread = threading.Thread(target=lambda: results.append(traced(10)))  # e.g. thread executor
+    thread.start()
+    thread.join()
+    assert results == [(False, busy_loop(10))]
+    records = [json.loads(line) for line in (tmp_path / "media" / "memory_jobs.jsonl").read_text().splitlines()]
+    assert len(records) == 1 and records[0]["peak_traced_mb"] >= 0
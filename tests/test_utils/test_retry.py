@@ -0,0 +1,87 @@
+import pytest
+from mergeui.utils.index.retry import parse_exc_string, classify_failure, summarize_failure, RetryPolicy, \
+    RetryTracker
+
+
+@pytest.fixture
+def timeout_exc_string() -> str:
+    return ("Traceback (most recent call last):\n"
+            "  File \"/rq/worker.py\", line 1428, in perform_job\n"
+            "    rv = job.perform()\n"
+            "rq.timeouts.JobTimeoutException: Task exceeded maximum timeout value (120 seconds)\n")
+
+
+@pytest.fixture
+def not_found_exc_string() -> str:
+    return ("Traceback (most recent call last):\n"
+            "  File \"/huggingface_hub/utils/_errors.py\", line 304, in hf_raise_for_status\n"
+            "    response.raise_for_status()\n"
+            "requests.exceptions.HTTPError: 404 Client Error: Not Found for url: https://huggingface.co/api/x/y\n"
+            "\n"
+            "The above exception was the direct cause of the following exception:\n"
+            "\n"
+            "Traceback (most recent call last):\n"
+            "  File \"/mergeui/utils/index/jobs.py\", line 34, in index_model_by_id\n"
+            "huggingface_hub.utils._errors.RepositoryNotFoundError: 404 Client Error. (Request ID: Root=1-abc)\n"
+            "\n"
+            "Repository Not Found for url: https://huggingface.co/api/models/x/y.\n"
+            "https://huggingface.co/docs/hub/security-tokens\n")
+
+
+def test_parse_exc_string(timeout_exc_string, not_found_exc_string):
+    assert parse_exc_string(None) == (None, "")
+    exc_name, message = parse_exc_string(timeout_exc_string)
+    assert exc_name == "JobTimeoutException"
+    assert message == "Task exceeded maximum timeout value (120 seconds)"
+    exc_name, message = parse_exc_string(not_found_exc_string)
+    assert exc_name == "RepositoryNotFoundError"
+    assert message.startswith("404 Client Error.")
+    assert parse_exc_string("KeyError") == ("KeyError", "")
+
+
+def test_classify_failure(timeout_exc_string, not_found_exc_string):
+    assert classify_failure(timeout_exc_string) == "transient"
+    assert classify_failure(not_found_exc_string) == "permanent"
+    assert classify_failure("yaml.scanner.ScannerError: mapping values are not allowed here") == "permanent"
+    assert classify_failure("requests.exceptions.ReadTimeout: timed out") == "transient"
+    assert classify_failure("HfHubHTTPError: 429 Client Error: Too Many Requests for url") == "transient"
+    assert classify_failure("HfHubHTTPError: 502 Server Error: Bad Gateway for url") == "transient"
+    assert classify_failure("HfHubHTTPError: 403 Client Error: Forbidden for url") == "permanent"
+    assert classify_failure("Work-horse terminated unexpectedly; waitpid returned 9") == "transient"
+    assert classify_failure(None) == "transient"
+
+
+def test_summarize_failure(not_found_exc_string):
+    summary = summarize_failure(not_found_exc_string, max_length=40)
+    assert summary.startswith("RepositoryNotFoundError: 404")
+    assert summary.endswith("...")
+    assert len(summary) == 40
+    assert "\n" not in summarize_failure(not_found_exc_string)
+
+
+def test_retry_policy():
+    policy = RetryPolicy(max_attempts=3, base_delay=1.0, max_delay=3.0)
+    assert policy.should_retry("transient", 1)
+    assert policy.should_retry("transient", 2)
+    assert not policy.should_retry("transient", 3)
+    assert not policy.should_retry("permanent", 1)
+    for attempt in range(1, 10):
+        assert 0 <= policy.get_delay(attempt) <= 3.0
+
+
+def test_retry_tracker(timeout_exc_string, not_found_exc_string):
+    tracker = RetryTracker(RetryPolicy(max_attempts=2, base_delay=0.0, max_delay=0.0))
+    # permanent failure
+    assert tracker.on_failure("a", not_found_exc_string) is False
+    assert "a" in tracker.dead_letters
+    # transient failure
+    assert tracker.on_failure("b", timeout_exc_string) is True
+    assert tracker.is_scheduled("b")
+    assert tracker.pending == 1
+    assert tracker.pop_due() == ["b"]
+    assert tracker.pending == 0
+    assert tracker.attempts["b"] == 2
+    # max attempts reached
+    assert tracker.on_failure("b", timeout_exc_string) is False
+    assert tracker.dead_letters["b"].startswith("transient failure after 2 attempt(s)")
+    assert tracker.retries_count == 1
@@ -0,0 +1,47 @@
+import datetime as dt
+import pytest
+from mergeui.utils.snapshot import SnapshotWriter, iter_snapshot, validate_snapshot, get_column_type, MAGIC
+
+
+def test_get_column_type():
+    assert get_column_type([None, None]) == "null"
+    assert get_column_type([True, None, False]) == "bool"
+    assert get_column_type([1, 2]) == "int"
+    assert get_column_type([1, 2.5]) == "json"  # mixed
+    assert get_column_type([dt.datetime(2024, 1, 1)]) == "datetime"
+    assert get_column_type([["a"], None]) == "json"
+
+
+def test_snapshot(tmp_path):
+    snapshot_path = tmp_path / "graph.snapshot"
+    nodes = [
+        {"id": "a/b", "labels": "Model:MergedModel", "likes": 3, "average_score": 0.5, "private": False,
+         "created_at": dt.datetime(2024, 1, 25, 11, 43, 57, 123)},
+        {"id": "c/d", "labels": "Model", "likes": None, "description": "é 🤗", "tags": ["merge", "slerp"],
+         "created_at": dt.datetime(2023, 12, 5, tzinfo=dt.timezone(dt.timedelta(hours=2)))},
+    ]
+    relationships = [{"source": "a/b", "target": "c/d", "method": "tags"}]
+    with SnapshotWriter(snapshot_path) as writer:
+        writer.write(b"N", nodes)
+        writer.write(b"R", relationships)
+        writer.write(b"R", [])
+    assert list(iter_snapshot(snapshot_path)) == [
+        (b"N", [nodes[0], {"id": "c/d", "labels": "Model", "description": "é 🤗", "tags": ["merge", "slerp"],
+                           "created_at": dt.datetime(2023, 12, 4, 22)}]),  # naive datetimes in UTC
+        (b"R", relationships),
+    ]
+    assert validate_snapshot(snapshot_path) == {b"N": 2, b"R": 1}
+    data = snapshot_path.read_bytes()
+    for invalid_data in (
+            data[:-1],  # no end marker
+            data[:-20],  # truncated column
+            data + b"N",  # data after the end marker
+            b"NOTSNAPS" + data[len(MAGIC):],
+            MAGIC + b"\x02\x00" + data[len(MAGIC) + 2:],  # unsupported version
+    ):
+        snapshot_path.write_bytes(invalid_data)
+        with pytest.raises(ValueError):
+            validate_snapshot(snapshot_path)
+    snapshot_path.write_bytes(data[:-1])
+    with pytest.raises(ValueError):
+        list(iter_snapshot(snapshot_path))
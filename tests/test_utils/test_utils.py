@@ -2,7 +2,8 @@ import pytest
 import datetime as dt
 from pathlib import Path
 from mergeui.utils import parse_yaml, filter_none, pretty_format_int, naive_to_aware_dt, aware_to_naive_dt, \
-    pretty_format_dt, pretty_format_float, parse_iso_dt, iso_format_dt
+    pretty_format_dt, pretty_format_float, parse_iso_dt, iso_format_dt, exponential_backoff_delay, \
+    batched
 
 
 @pytest.fixture
@@ -122,3 +123,17 @@ def test_iso_format_dt(utc_dt, iso_dt, naive_dt):
     assert iso_format_dt(None) is None
     assert iso_format_dt(naive_dt) == iso_dt
     assert iso_format_dt(utc_dt) == iso_dt
+
+
+def test_exponential_backoff_delay():
+    assert exponential_backoff_delay(0, base=1.0, jitter=False) == 1.0
+    assert exponential_backoff_delay(3, base=1.0, jitter=False) == 8.0
+    assert exponential_backoff_delay(10, base=1.0, max_delay=60.0, jitter=False) == 60.0
+    for attempt in range(10):
+        assert 0 <= exponential_backoff_delay(attempt, base=0.5, max_delay=4.0) <= 4.0
+
+
+def test_batched():
+    assert list(batched([1, 2, 3, 4, 5], 2)) == [[1, 2], [3, 4], [5]]
+    assert list(batched(iter(range(4)), 2)) == [[0, 1], [2, 3]]
+    assert list(batched([], 3)) == []
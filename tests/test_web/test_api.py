@@ -61,3 +61,22 @@ def test_model_lineage(api_client):
     rel = data.get("data").get("relationships")[0]
     assert "source" in rel
     assert "method" in rel
+
+
+def test_refresh_model_lineage__invalid(api_client):
+    for model_id in ["", "not-a-repo-id", "a/b/c", "../../etc"]:
+        response = api_client.post("/api/model_lineage/refresh", params={"id": model_id, "max_hops": 1})
+        assert response.status_code == 422
+    response = api_client.get("/api/model_lineage/refresh/unknown-job-id")
+    assert response.status_code == 404
+    response = api_client.get("/api/model_lineage/refresh/refresh_model_lineage__unknown__model__1")
+    assert response.status_code == 404
+
+
+def test_get_stats(api_client):
+    api_client.get("/api/models", params={"author": "Q-bert"})
+    api_client.get("/api/models", params={"author": "fblgit"})
+    response = api_client.get("/api/stats")
+    assert response.status_code == 200
+    list_models_stats = response.json()["data"]["query_templates"]["list_models"]
+    assert list_models_stats["executions"] > list_models_stats["query_texts"]